@@ -0,0 +1,10 @@
+from .ttl_cache import TTLCache
+from .sqlite_cache import SqliteCache
+from .response_cache import ResponseCache, normalize_query
+
+__all__ = [
+    'TTLCache',
+    'SqliteCache',
+    'ResponseCache',
+    'normalize_query',
+]
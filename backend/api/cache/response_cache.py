@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from api.config import ServerConfig
+from .sqlite_cache import SqliteCache
+from .ttl_cache import TTLCache
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class ResponseCache:
+    """
+        Exact-match cache of final /process answers keyed on the normalized query text, the model
+        and a version of the prompt and tools, so changing either of them never serves stale answers.
+
+        Entries live in an in-process LRU and, when shared_path is set, in a sqlite file shared by
+        all server processes; a shared hit is copied into the in-process LRU.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        version: str,
+        max_size: int,
+        ttl: float = 0,
+        shared_path: Optional[str] = None,
+    ) -> None:
+        self.model: str = model
+        self.version: str = version
+        self.memory: TTLCache = TTLCache(max_size=max_size, ttl=ttl)
+        self.shared: Optional[SqliteCache] = (
+            SqliteCache(shared_path, max_size=max_size, ttl=ttl) if shared_path and max_size > 0 else None
+        )
+
+    @classmethod
+    def from_config(cls, server_config: ServerConfig, version: str) -> "ResponseCache":
+        return cls(
+            model=server_config.MODEL,
+            version=version,
+            max_size=server_config.RESPONSE_CACHE_SIZE,
+            ttl=server_config.RESPONSE_CACHE_TTL,
+            shared_path=server_config.RESPONSE_CACHE_PATH,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.enabled
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{self.version}\0{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        key: str = self.key(text)
+        answer: Optional[Any] = self.memory.get(key)
+        if answer is None and self.shared is not None:
+            answer = self.shared.get(key)
+            if answer is not None:
+                self.memory.set(key, answer)
+        return answer
+
+    def set(self, text: str, answer: Any) -> None:
+        if not self.enabled:
+            return
+
+        key: str = self.key(text)
+        self.memory.set(key, answer)
+        if self.shared is not None:
+            self.shared.set(key, answer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
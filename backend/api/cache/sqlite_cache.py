@@ -0,0 +1,104 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class SqliteCache:
+    """
+        LRU cache with optional time to live kept in a sqlite file, so several server processes
+        can share entries. Values must be JSON serializable, max_size <= 0 disables caching.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: str = path
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self._clock: Callable[[], float] = clock
+        self._local = threading.local()
+        self.hits: int = 0
+        self.misses: int = 0
+
+        directory: str = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections can not be shared between threads, every thread opens its own
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        now: float = self._clock()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value FROM entries WHERE key = ? AND (expires_at = 0 OR expires_at > ?)", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        now: float = self._clock()
+        expires_at: float = now + self.ttl if self.ttl > 0 else 0
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            connection.execute("DELETE FROM entries WHERE expires_at != 0 AND expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        requests: int = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
@@ -0,0 +1,155 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+        Thread-safe LRU cache with optional per-entry time to live and pickle persistence.
+        max_size <= 0 disables caching, ttl <= 0 keeps entries until they are evicted.
+
+        A persisted cache is saved every autosave_interval seconds by a background thread
+        and by close(), never on the thread that calls set().
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float = 0,
+        persist_path: Optional[str] = None,
+        autosave_interval: float = 60,
+        clock: Callable[[], float] = time.time,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.persist_path: Optional[str] = persist_path or None
+        self.autosave_interval: float = autosave_interval
+        self._clock: Callable[[], float] = clock
+        self.logger: logging.Logger = logger or logging.getLogger("TTLCache")
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._stop_autosave = threading.Event()
+        self._autosave_thread: Optional[threading.Thread] = None
+        if self.persist_path is not None:
+            self.load()
+            if self.enabled and self.autosave_interval > 0:
+                self._autosave_thread = threading.Thread(target=self._autosave, name="TTLCacheAutosave", daemon=True)
+                self._autosave_thread.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[0]):
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            expires_at: float = self._clock() + self.ttl if self.ttl > 0 else 0
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        requests: int = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def _autosave(self) -> None:
+        while not self._stop_autosave.wait(self.autosave_interval):
+            self.save()
+
+    def close(self) -> None:
+        self._stop_autosave.set()
+        if self._autosave_thread is not None:
+            self._autosave_thread.join()
+            self._autosave_thread = None
+        self.save()
+
+    def save(self) -> None:
+        if self.persist_path is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self._entries.items())
+            self._dirty = False
+
+        try:
+            directory: str = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path: str = f"{self.persist_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.persist_path)
+        except Exception as e:
+            self.logger.warning(f"Could not save cache to {self.persist_path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def load(self) -> None:
+        if self.persist_path is None or not os.path.exists(self.persist_path):
+            return
+
+        try:
+            with open(self.persist_path, 'rb') as f:
+                entries = pickle.load(f)
+            loaded: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+            for key, (expires_at, value) in entries[-self.max_size:] if self.max_size > 0 else []:
+                if not self._is_expired(expires_at):
+                    loaded[key] = (expires_at, value)
+        except Exception as e:
+            self.logger.warning(f"Could not load cache from {self.persist_path}, starting empty: {e}")
+            return
+
+        with self._lock:
+            self._entries.update(loaded)
+
+    def _is_expired(self, expires_at: float) -> bool:
+        return expires_at > 0 and expires_at <= self._clock()
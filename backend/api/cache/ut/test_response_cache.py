@@ -0,0 +1,44 @@
+from api.cache import ResponseCache, SqliteCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_text_hits_and_version_changes_miss(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(model="model-a", version="v1", max_size=10, shared_path=path)
+    cache.set("Посоветуй sci-fi RPG  с открытым миром", "Mass Effect, Starfield")
+
+    assert cache.get("  посоветуй SCI-FI rpg с открытым   миром ") == "Mass Effect, Starfield"
+    assert ResponseCache(model="model-a", version="v2", max_size=10, shared_path=path).get(
+        "Посоветуй sci-fi RPG с открытым миром"
+    ) is None
+    assert ResponseCache(model="model-b", version="v1", max_size=10).get("Посоветуй sci-fi RPG с открытым миром") is None
+
+    other_process = ResponseCache(model="model-a", version="v1", max_size=10, shared_path=path)
+    assert other_process.get("посоветуй sci-fi rpg с открытым миром") == "Mass Effect, Starfield"
+    assert len(other_process.memory) == 1
+
+
+def test_sqlite_cache_evicts_least_recently_used_and_expired(tmp_path):
+    clock = FakeClock()
+    cache = SqliteCache(str(tmp_path / "cache.sqlite"), max_size=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1
+
+    clock.now += 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock.now += 61
+    assert cache.get("c") is None
+    assert cache.stats()["hits"] == 2
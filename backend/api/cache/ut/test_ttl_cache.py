@@ -0,0 +1,82 @@
+import pickle
+import time
+
+from api.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = TTLCache(max_size=10, ttl=60, persist_path=path)
+    cache.set("a", [1.0, 2.0])
+    cache.close()
+
+    assert TTLCache(max_size=10, ttl=60, persist_path=path).get("a") == [1.0, 2.0]
+
+
+def test_autosave_runs_in_background(tmp_path):
+    path = tmp_path / "cache.pkl"
+    cache = TTLCache(max_size=10, persist_path=str(path), autosave_interval=0.01)
+    cache.set("a", 1)
+    deadline = time.time() + 5
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    cache.close()
+    assert TTLCache(max_size=10, persist_path=str(path)).get("a") == 1
+
+
+def test_save_errors_are_logged(tmp_path, caplog):
+    cache = TTLCache(max_size=10, persist_path=str(tmp_path / "missing" / "cache.pkl"), autosave_interval=0)
+    (tmp_path / "missing").write_text("not a directory")
+    cache.set("a", 1)
+    cache.save()
+    assert "Could not save cache" in caplog.text
+    assert cache.get("a") == 1
+
+
+def test_corrupt_file_starts_empty(tmp_path, caplog):
+    path = tmp_path / "cache.pkl"
+    for payload in (b"not a pickle", pickle.dumps([("a", 1)]), pickle.dumps({"a": 1})):
+        path.write_bytes(payload)
+        cache = TTLCache(max_size=10, persist_path=str(path), autosave_interval=0)
+        assert len(cache) == 0
+    assert "starting empty" in caplog.text
+
+
+def test_disabled_cache():
+    cache = TTLCache(max_size=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -27,9 +27,78 @@ class ServerConfigOptions:
         "REQUEST_TIMEOUT": float,
     }
 
+    OPTIONAL_VARS: Dict[str, Tuple[type, Any]] = {
+        "EMBED_BATCH_SIZE": (int, 64),
+        "EMBED_WORKERS": (int, 4),
+        "EMBED_MAX_RETRIES": (int, 3),
+        "EMBED_CHECKPOINT_ROWS": (int, 1024),
+        "CLEAN_WORKERS": (int, 0),
+        "CLEAN_CHUNK_SIZE": (int, 256),
+        "CLEAN_QUEUE_SIZE": (int, 16),
+        "EMBEDDINGS_STORE_PATH": (str, ""),
+        "CATALOG_PATH": (str, ""),
+        "FILTER_MIN_OWNERS": (int, 35000),
+        "FILTER_REQUIRE_DESCRIPTION": (bool, True),
+        "FILTER_REQUIRE_NAME": (bool, False),
+        "INDEX_PATH": (str, ""),
+        "INDEX_TYPE": (str, "flat"),
+        "INDEX_NLIST": (int, 0),
+        "INDEX_NPROBE": (int, 16),
+        "INDEX_PQ_M": (int, 64),
+        "INDEX_HNSW_M": (int, 32),
+        "INDEX_EF_SEARCH": (int, 128),
+        "INDEX_TRAIN_SAMPLE": (int, 50000),
+        "INDEX_RECALL_QUERIES": (int, 0),
+        "INDEX_STORAGE": (str, "float32"),
+        "INDEX_KEEP_EMBEDDINGS": (bool, True),
+        "QUERY_CACHE_SIZE": (int, 10000),
+        "QUERY_CACHE_TTL": (float, 86400.0),
+        "QUERY_CACHE_PATH": (str, ""),
+        "RESPONSE_CACHE_SIZE": (int, 1000),
+        "RESPONSE_CACHE_TTL": (float, 3600.0),
+        "RESPONSE_CACHE_PATH": (str, ""),
+        "SEARCH_MAX_QUERIES": (int, 512),
+        "SEARCH_MAX_K": (int, 100),
+        "SEARCH_COALESCE_MAX_BATCH": (int, 32),
+        "SEARCH_COALESCE_WAIT_MS": (float, 5.0),
+        "SEARCH_EXECUTOR_WORKERS": (int, 2),
+        "SEARCH_HYBRID": (bool, True),
+        "SEARCH_HYBRID_CANDIDATES": (int, 100),
+        "SEARCH_RRF_K": (int, 60),
+        "LEXICAL_INDEX_PATH": (str, ""),
+        "LEXICAL_NAME_BOOST": (int, 3),
+        "TITLE_INDEX_PATH": (str, ""),
+        "TITLE_MIN_SIMILARITY": (float, 0.6),
+        "STEAM_STORE_FALLBACK": (bool, False),
+        "STEAM_STORE_TIMEOUT": (float, 2.0),
+        "STEAM_STORE_CACHE_SIZE": (int, 1000),
+        "STEAM_STORE_CACHE_TTL": (float, 86400.0),
+        "NEIGHBOURS_PATH": (str, ""),
+        "NEIGHBOURS_N": (int, 50),
+        "NEIGHBOURS_BATCH_SIZE": (int, 1024),
+        "SUMMARIES_PATH": (str, ""),
+        "SUMMARY_DESC_CHARS": (int, 300),
+        "SUMMARY_MAX_TAGS": (int, 12),
+        "TOOL_TOKEN_BUDGET": (int, 3000),
+        "LLM_CONNECT_TIMEOUT": (float, 5.0),
+        "LLM_READ_TIMEOUT": (float, 120.0),
+        "LLM_MAX_RETRIES": (int, 3),
+        "LLM_RETRY_BACKOFF": (float, 0.5),
+        "LLM_POOL_SIZE": (int, 0),
+        "LLM_TOKEN_BUDGET": (int, 8000),
+        "LLM_MODE": (str, "prompt"),
+        "SERVER_MODE": (str, "threaded"),
+    }
+
 
 class ServerConfig:
-    __annotations__ = ServerConfigOptions.REQUIRED_VARS
+    __annotations__ = {
+        **ServerConfigOptions.REQUIRED_VARS,
+        **{
+            var_name: var_type
+            for var_name, (var_type, _) in ServerConfigOptions.OPTIONAL_VARS.items()
+        },
+    }
 
     def __init__(self, env_file: Optional[str] = None) -> None:
         if env_file:
@@ -38,6 +107,7 @@ class ServerConfig:
             load_dotenv()
 
         self._load_required_vars()
+        self._load_optional_vars()
 
         self.logger_config = LoggerConfig(self.LOG_FILE, self.LOG_LEVEL)
         self.logger = self.logger_config.get_logger("ServerConfig")
@@ -70,6 +140,34 @@ class ServerConfig:
                     f"using converter {type_converter.__name__}: {e}"
                 ) from e
 
+    def _load_optional_vars(self) -> None:
+        for var_name, (type_converter, default) in ServerConfigOptions.OPTIONAL_VARS.items():
+            value = os.getenv(var_name)
+            if value is None or value == "":
+                setattr(self, var_name, default)
+                continue
+
+            try:
+                typed_value = self._convert(value, type_converter)
+                setattr(self, var_name, typed_value)
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f"Failed to convert environment variable {var_name} = {value} "
+                    f"using converter {type_converter.__name__}: {e}"
+                ) from e
+
+    @staticmethod
+    def _convert(value: str, type_converter: type) -> Any:
+        if type_converter is bool:
+            normalized = value.strip().lower()
+            if normalized in ("1", "true", "yes", "on"):
+                return True
+            if normalized in ("0", "false", "no", "off"):
+                return False
+            raise ValueError(f"'{value}' is not a boolean")
+
+        return type_converter(value)
+
     def _setup_logs_directory(self) -> None:
         log_path = Path(self.LOG_FILE)
         log_dir = log_path.parent
@@ -84,4 +182,7 @@ class ServerConfig:
         for var_name in ServerConfigOptions.REQUIRED_VARS:
             config_dict[var_name] = getattr(self, var_name)
 
+        for var_name in ServerConfigOptions.OPTIONAL_VARS:
+            config_dict[var_name] = getattr(self, var_name)
+
         return config_dict
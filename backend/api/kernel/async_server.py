@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, NoReturn
+
+from aiohttp import web
+from api.config import ServerConfig
+from api.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS
+from api.kernel.server import Server
+from api.steamdb_manager import SteamDBManager
+from model.async_http_session import AsyncLLMHttpClient
+from tools import ToolsDispatcher
+
+
+class AsyncServer:
+    """
+        asyncio alternative to the Waitress server (SERVER_MODE=async) serving the same endpoints.
+
+        Requests waiting on the LLM or Ollama hold no thread, blocking tools and FAISS
+        searches run on small executors.
+    """
+
+    def __init__(self, server_config: ServerConfig):
+        self.config = server_config
+        self.logger = server_config.logger_config.get_logger("server")
+        self.tools_dispatcher = ToolsDispatcher(server_config)
+        if getattr(Server, "steamdb_manager", None) is not None:
+            # a restart after a crash replaces the manager, its worker threads must not pile up
+            Server.steamdb_manager.close()
+        Server.steamdb_manager = SteamDBManager(server_config)
+        self.http_client = AsyncLLMHttpClient.from_config(server_config)
+        self.tools_executor = ThreadPoolExecutor(max_workers=server_config.THREADS, thread_name_prefix="Tools")
+        self.app = self._create_app()
+
+    def _create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._metrics_middleware, self._error_middleware])
+
+        self._register_handlers(app)
+        app.on_cleanup.append(self._close)
+
+        return app
+
+    @web.middleware
+    async def _metrics_middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        started_at = time.perf_counter()
+        resource = request.match_info.route.resource
+        endpoint = resource.canonical if resource is not None else "unmatched"
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as error:
+            status = error.status
+            raise
+        finally:
+            HTTP_REQUESTS.inc(endpoint=endpoint, status=str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started_at, endpoint=endpoint)
+
+    @web.middleware
+    async def _error_middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        try:
+            return await handler(request)
+        except web.HTTPNotFound as error:
+            self.logger.warning(f"404 error: {error}")
+            return web.json_response({"error": "Not found"}, status=404)
+        except web.HTTPException:
+            raise
+        except Exception as error:
+            self.logger.error(f"500 error: {error}")
+            return web.json_response({"error": "Internal server error"}, status=500)
+
+    async def _close(self, app: web.Application) -> None:
+        await self.http_client.close()
+        self.tools_executor.shutdown(wait=False)
+
+    def run(self) -> NoReturn:
+        self.logger.info(f"Starting asyncio server on {self.config.HOST}:{self.config.PORT}")
+        self.logger.info(f"Tool threads number: {self.config.THREADS}")
+
+        web.run_app(
+            self.app,
+            host=self.config.HOST,
+            port=self.config.PORT,
+            keepalive_timeout=self.config.REQUEST_TIMEOUT,
+            print=None,
+        )
+        # run_app swallows SIGINT/SIGTERM and returns, main() would rebuild the server
+        raise KeyboardInterrupt("asyncio server stopped by a shutdown signal")
+
+    def get_app(self) -> web.Application:
+        return self.app
+
+    def _register_handlers(self, app: web.Application) -> None:
+        from api.kernel.endpoints.ping.async_handler import register_async_ping_handler
+        register_async_ping_handler(app, self.config)
+        self.logger.info("Ping handler has been registered")
+
+        from api.kernel.endpoints.metrics.async_handler import register_async_metrics_handler
+        register_async_metrics_handler(app, self.config)
+        self.logger.info("Metrics handler has been registered")
+
+        from api.kernel.endpoints.process.async_handler import register_async_process_handler
+        register_async_process_handler(app, self.config, self.tools_dispatcher, self.http_client, self.tools_executor)
+        self.logger.info("Process handler has been registered")
+
+        from api.kernel.endpoints.search.async_handler import register_async_search_handler
+        register_async_search_handler(app, self.config, Server.steamdb_manager)
+        self.logger.info("Search handler has been registered")
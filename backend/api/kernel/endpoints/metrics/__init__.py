@@ -0,0 +1,18 @@
+from flask import Blueprint
+from api.config import ServerConfig
+from .handler import metrics
+
+__all__ = [
+    'metrics_bp',
+    'register_metrics_handler'
+]
+
+
+metrics_bp: Blueprint = Blueprint('metrics', __name__)
+
+
+def register_metrics_handler(config: ServerConfig):
+    def metrics_with_config():
+        return metrics(config)
+
+    metrics_bp.route('/metrics')(metrics_with_config)
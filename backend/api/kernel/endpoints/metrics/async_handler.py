@@ -0,0 +1,21 @@
+from aiohttp import web
+from api.config import ServerConfig
+from api.metrics import REGISTRY
+from api.response_status import ResponseCode
+
+
+async def metrics_async(config: ServerConfig) -> web.Response:
+    config.logger_config.get_logger("/metrics").debug("Get request")
+
+    return web.Response(
+        body=REGISTRY.render().encode("utf-8"),
+        status=ResponseCode.SUCCESS.http_code,
+        headers={"Content-Type": REGISTRY.CONTENT_TYPE},
+    )
+
+
+def register_async_metrics_handler(app: web.Application, config: ServerConfig) -> None:
+    async def metrics_with_config(request: web.Request) -> web.Response:
+        return await metrics_async(config)
+
+    app.router.add_get('/metrics', metrics_with_config)
@@ -0,0 +1,16 @@
+from flask import Response
+from api.config import ServerConfig
+from api.metrics import REGISTRY
+from api.response_status import ResponseCode
+
+
+def metrics(config: ServerConfig) -> Response:
+    """
+        Expected usage:
+            curl http://<host_name>/metrics
+    """
+    config.logger_config.get_logger("/metrics").debug("Get request")
+
+    return Response(
+        REGISTRY.render(), status=ResponseCode.SUCCESS.http_code, content_type=REGISTRY.CONTENT_TYPE
+    )
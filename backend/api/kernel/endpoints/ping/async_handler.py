@@ -0,0 +1,18 @@
+from aiohttp import web
+from api.config import ServerConfig
+from api.response_status import ResponseCode
+
+
+async def ping_async(config: ServerConfig) -> web.Response:
+    config.logger_config.get_logger("/ping").debug("Get request")
+
+    return web.json_response(
+        {"status": ResponseCode.SUCCESS.text}, status=ResponseCode.SUCCESS.http_code
+    )
+
+
+def register_async_ping_handler(app: web.Application, config: ServerConfig) -> None:
+    async def ping_with_config(request: web.Request) -> web.Response:
+        return await ping_async(config)
+
+    app.router.add_get('/ping', ping_with_config)
@@ -1,4 +1,5 @@
 from flask import Blueprint
+from api.cache import ResponseCache
 from api.config import ServerConfig
 from .handler import process
 from tools.tool_dispatcher import ToolsDispatcher
@@ -14,7 +15,9 @@ process_bp: Blueprint = Blueprint('process', __name__)
 
 
 def register_process_handler(config: ServerConfig, tools_dispatcher: ToolsDispatcher):
+    response_cache = ResponseCache.from_config(config, ModelRequester(tools_dispatcher, config).prompt_version())
+
     def process_with_config():
-        return process(config, tools_dispatcher)
+        return process(config, tools_dispatcher, response_cache)
 
     process_bp.route('/process', methods=['POST'])(process_with_config)
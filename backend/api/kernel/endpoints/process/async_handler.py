@@ -0,0 +1,113 @@
+from aiohttp import web
+from api.cache import ResponseCache
+from api.config import ServerConfig
+from api.metrics import STAGE_SECONDS
+from api.response_status import ResponseCode
+from tools.tool_dispatcher import ToolsDispatcher
+from model.async_http_session import AsyncLLMHttpClient
+from model.async_model_requester import AsyncModelRequester
+from model.model_requester import ModelLoopError, ModelRequester
+from .handler import _model_error_code, cached_answer_events, format_sse_event, lookup_cached_answer, validate_process_request
+
+from concurrent.futures import Executor
+from functools import partial
+import asyncio
+import json
+import uuid
+
+json_dumps = partial(json.dumps, ensure_ascii=False)
+
+
+async def process_async(
+    request: web.Request,
+    config: ServerConfig,
+    tools_dispatcher: ToolsDispatcher,
+    http_client: AsyncLLMHttpClient,
+    tools_executor: Executor,
+    response_cache: ResponseCache,
+) -> web.StreamResponse:
+    """
+        asyncio version of /process with the same request and response format.
+    """
+    logger = config.logger_config.get_logger("/process")
+
+    model_requester = AsyncModelRequester(tools_dispatcher, config, http_client, tools_executor)
+    request_id = str(uuid.uuid4())
+    logger.info(f"Get request {request_id}")
+
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        data = {}
+
+    with STAGE_SECONDS.time(stage="validation"):
+        text, error = validate_process_request(data, logger, request_id)
+    if error is not None:
+        return web.json_response(error, status=ResponseCode.VALIDATION_ERROR.http_code, dumps=json_dumps)
+
+    # with RESPONSE_CACHE_PATH set the cache is sqlite, whose lock waits must not block the event loop
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(tools_executor, lookup_cached_answer, response_cache, text, logger, request_id)
+    cache_status = "MISS" if cached is None else "HIT"
+
+    if data.get('stream') is True:
+        response = web.StreamResponse(
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Cache": cache_status}
+        )
+        response.content_type = "text/event-stream"
+        await response.prepare(request)
+        if cached is not None:
+            for event in cached_answer_events(cached):
+                await response.write(format_sse_event(event).encode("utf-8"))
+        else:
+            logger.info(f'Stream request {request_id} to model with text {text}')
+            async for event in model_requester.model_stream_async(text=text):
+                if event["event"] == "done":
+                    await loop.run_in_executor(tools_executor, response_cache.set, text, event["data"]["text"])
+                await response.write(format_sse_event(event).encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    if cached is not None:
+        result = cached
+    else:
+        logger.info(f'Send request to model with text {text}')
+        try:
+            result = await model_requester.model_async(text=text)
+        except ModelLoopError as e:
+            logger.error(f"Request {request_id} failed: {e}")
+            code = _model_error_code(e)
+            return web.json_response(
+                {"status": code.text, "message": str(e)},
+                status=code.http_code,
+                dumps=json_dumps,
+            )
+        await loop.run_in_executor(tools_executor, response_cache.set, text, result)
+
+    return web.json_response(
+        {
+            "status": ResponseCode.SUCCESS.text,
+            "message": "Text processed successfully",
+            "data": result,
+        },
+        status=ResponseCode.SUCCESS.http_code,
+        headers={"X-Cache": cache_status},
+        dumps=json_dumps,
+    )
+
+
+def register_async_process_handler(
+    app: web.Application,
+    config: ServerConfig,
+    tools_dispatcher: ToolsDispatcher,
+    http_client: AsyncLLMHttpClient,
+    tools_executor: Executor,
+) -> None:
+    response_cache = ResponseCache.from_config(config, ModelRequester(tools_dispatcher, config).prompt_version())
+
+    async def process_with_config(request: web.Request) -> web.StreamResponse:
+        return await process_async(request, config, tools_dispatcher, http_client, tools_executor, response_cache)
+
+    app.router.add_post('/process', process_with_config)
@@ -1,18 +1,82 @@
-from flask import jsonify, request, Response
+from flask import jsonify, request, Response, stream_with_context
+from api.cache import ResponseCache
 from api.config import ServerConfig
+from api.metrics import RESPONSE_CACHE_LOOKUPS, STAGE_SECONDS
 from api.response_status import ResponseCode
 from tools.tool_dispatcher import ToolsDispatcher
-from model.model_requester import ModelRequester
+from model.model_requester import ModelLoopError, ModelRequester, ModelUpstreamError
 
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
 import uuid
 
 
-def process(config: ServerConfig, tools_dispatcher: ToolsDispatcher) -> Response:
+def validate_process_request(data: Dict[str, Any], logger, request_id: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    text = data.get('text')
+
+    if text is None:
+        logger.debug(f"Miss 'text' field for request {request_id}")
+
+        return None, {
+            "status": ResponseCode.VALIDATION_ERROR.text,
+            "message": "Field 'text' is required",
+            "details": {"missing_field": "text"},
+        }
+    text = text.strip()
+
+    if not text:
+        logger.debug(f"Request {request_id} has empty text")
+
+        return None, {
+            "status": ResponseCode.VALIDATION_ERROR.text,
+            "message": "'text' field can not be empty",
+            "details": {"field": "text"},
+        }
+    return text, None
+
+
+def _model_error_code(error: ModelLoopError) -> ResponseCode:
+    # the upstream itself failed -> 503, the model never produced a final answer -> 502
+    if isinstance(error, ModelUpstreamError):
+        return ResponseCode.SERVICE_UNAVAILABLE
+    return ResponseCode.BAD_GATEWAY
+
+
+def lookup_cached_answer(response_cache: ResponseCache, text: str, logger, request_id: str) -> Optional[Any]:
+    if not response_cache.enabled:
+        return None
+
+    with STAGE_SECONDS.time(stage="response_cache"):
+        answer = response_cache.get(text)
+    RESPONSE_CACHE_LOOKUPS.inc(result="miss" if answer is None else "hit")
+    if answer is not None:
+        logger.info(f"Request {request_id} answered from response cache")
+    return answer
+
+
+def cached_answer_events(answer: Any) -> List[Dict[str, Any]]:
+    return [
+        {"event": "token", "data": {"text": answer}},
+        {"event": "done", "data": {"text": answer, "rounds": 0, "cached": True}},
+    ]
+
+
+def format_sse_event(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+
+
+def process(config: ServerConfig, tools_dispatcher: ToolsDispatcher, response_cache: ResponseCache) -> Response:
     """
         Expected usage:
             curl http://<host_name>/process \
             -H "Content-Type: application/json" \
             -d '{"text": "user_text"}'
+
+        Add "stream": true to receive Server-Sent Events instead: "token" events carry pieces of
+        the answer text, "tool_call" and "tool_result" report tool usage, "done" carries the final
+        answer and "error" ends a failed stream.
+
+        Repeated queries are answered from the response cache, the X-Cache header tells HIT or MISS.
     """
     logger = config.logger_config.get_logger("/process")
 
@@ -21,35 +85,39 @@ def process(config: ServerConfig, tools_dispatcher: ToolsDispatcher) -> Response
     logger.info(f"Get request {request_id}")
 
     data = request.get_json() or {}
-    text = data.get('text')
-
-    if text is None:
-        logger.debug(f"Miss 'text' field for request {request_id}")
-
-        return jsonify(
-            {
-                "status": ResponseCode.VALIDATION_ERROR.text,
-                "message": "Field 'text' is required",
-                "details": {"missing_field": "text"},
-            }
-        ), ResponseCode.VALIDATION_ERROR.http_code
-    text = text.strip()
-
-    if not text:
-        logger.debug(f"Request {request_id} has empty text")
-
-        return jsonify(
-            {
-                "status": ResponseCode.VALIDATION_ERROR.text,
-                "message": "'text' field can not be empty",
-                "details": {"field": "text"},
-            }
-        ), ResponseCode.VALIDATION_ERROR.http_code
+    with STAGE_SECONDS.time(stage="validation"):
+        text, error = validate_process_request(data, logger, request_id)
+    if error is not None:
+        return jsonify(error), ResponseCode.VALIDATION_ERROR.http_code
     # result = model(text, tools_dispatcher) <- sending response to model
     # TODO: here expected to send request and get response from model and pass it to 'data' field
 
-    logger.info(f'Send request to model with text {text}')
-    result = model_requester.model(text=text)
+    cached = lookup_cached_answer(response_cache, text, logger, request_id)
+    cache_status = "MISS" if cached is None else "HIT"
+
+    if data.get('stream') is True:
+        if cached is not None:
+            events = cached_answer_events(cached)
+        else:
+            logger.info(f'Stream request {request_id} to model with text {text}')
+            events = _caching_events(model_requester.model_stream(text=text), response_cache, text)
+        return Response(
+            stream_with_context(_sse_events(events)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Cache": cache_status},
+        )
+
+    if cached is not None:
+        result = cached
+    else:
+        logger.info(f'Send request to model with text {text}')
+        try:
+            result = model_requester.model(text=text)
+        except ModelLoopError as e:
+            logger.error(f"Request {request_id} failed: {e}")
+            code = _model_error_code(e)
+            return jsonify({"status": code.text, "message": str(e)}), code.http_code
+        response_cache.set(text, result)
 
     return jsonify(
         {
@@ -57,4 +125,20 @@ def process(config: ServerConfig, tools_dispatcher: ToolsDispatcher) -> Response
             "message": "Text processed successfully",
             "data": result,
         }
-    ), ResponseCode.SUCCESS.http_code
+    ), ResponseCode.SUCCESS.http_code, {"X-Cache": cache_status}
+
+
+def _caching_events(
+    events: Iterable[Dict[str, Any]],
+    response_cache: ResponseCache,
+    text: str,
+) -> Iterator[Dict[str, Any]]:
+    for event in events:
+        if event["event"] == "done":
+            response_cache.set(text, event["data"]["text"])
+        yield event
+
+
+def _sse_events(events: Iterable[Dict[str, Any]]):
+    for event in events:
+        yield format_sse_event(event)
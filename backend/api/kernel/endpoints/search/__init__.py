@@ -0,0 +1,19 @@
+from flask import Blueprint
+from api.config import ServerConfig
+from api.steamdb_manager import SteamDBManager
+from .handler import search
+
+__all__ = [
+    'search_bp',
+    'register_search_handler'
+]
+
+
+search_bp: Blueprint = Blueprint('search', __name__)
+
+
+def register_search_handler(config: ServerConfig, steamdb_manager: SteamDBManager):
+    def search_with_config():
+        return search(config, steamdb_manager)
+
+    search_bp.route('/search', methods=['POST'])(search_with_config)
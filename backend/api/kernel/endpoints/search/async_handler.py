@@ -0,0 +1,60 @@
+from aiohttp import web
+from api.config import ServerConfig
+from api.metrics import STAGE_SECONDS
+from api.response_status import ResponseCode
+from api.steamdb_manager import SteamDBManager
+from .handler import validation_error, validate_search_request
+
+from functools import partial
+import json
+import uuid
+
+json_dumps = partial(json.dumps, ensure_ascii=False)
+
+
+async def search_async(request: web.Request, config: ServerConfig, steamdb_manager: SteamDBManager) -> web.Response:
+    """
+        asyncio version of /search with the same request and response format.
+    """
+    logger = config.logger_config.get_logger("/search")
+
+    request_id = str(uuid.uuid4())
+    logger.info(f"Get request {request_id}")
+
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        data = {}
+
+    with STAGE_SECONDS.time(stage="validation"):
+        search_request, error = validate_search_request(config, data, logger, request_id)
+    if error is not None:
+        return web.json_response(error, status=ResponseCode.VALIDATION_ERROR.http_code, dumps=json_dumps)
+
+    logger.info(f"Search {len(search_request['queries'])} queries for request {request_id}")
+    try:
+        result = await steamdb_manager.find_similar_games_batch_async(**search_request)
+    except ValueError as e:
+        logger.debug(f"Request {request_id} has invalid filters: {e}")
+        return web.json_response(
+            validation_error(str(e), "filters"), status=ResponseCode.VALIDATION_ERROR.http_code, dumps=json_dumps
+        )
+
+    return web.json_response(
+        {
+            "status": ResponseCode.SUCCESS.text,
+            "message": "Queries processed successfully",
+            "data": result,
+        },
+        status=ResponseCode.SUCCESS.http_code,
+        dumps=json_dumps,
+    )
+
+
+def register_async_search_handler(app: web.Application, config: ServerConfig, steamdb_manager: SteamDBManager) -> None:
+    async def search_with_config(request: web.Request) -> web.Response:
+        return await search_async(request, config, steamdb_manager)
+
+    app.router.add_post('/search', search_with_config)
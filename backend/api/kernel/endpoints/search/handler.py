@@ -0,0 +1,81 @@
+from flask import jsonify, request, Response
+from api.config import ServerConfig
+from api.metrics import STAGE_SECONDS
+from api.response_status import ResponseCode
+from api.steamdb_manager import SteamDBManager
+
+from typing import Any, Dict, Optional, Tuple
+import uuid
+
+
+def validation_error(message: str, field: str) -> Dict[str, Any]:
+    return {
+        "status": ResponseCode.VALIDATION_ERROR.text,
+        "message": message,
+        "details": {"field": field},
+    }
+
+
+def validate_search_request(
+    config: ServerConfig,
+    data: Dict[str, Any],
+    logger,
+    request_id: str,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    queries = data.get('queries')
+    k = data.get('k', 50)
+    filters = data.get('filters')
+
+    if not isinstance(queries, list) or not queries:
+        logger.debug(f"Request {request_id} has no queries")
+        return None, validation_error("Field 'queries' must be a non-empty list of strings", "queries")
+
+    if len(queries) > config.SEARCH_MAX_QUERIES or not all(isinstance(q, str) and q.strip() for q in queries):
+        logger.debug(f"Request {request_id} has invalid queries")
+        return None, validation_error(
+            f"Field 'queries' must contain up to {config.SEARCH_MAX_QUERIES} non-empty strings", "queries"
+        )
+
+    if not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= config.SEARCH_MAX_K:
+        logger.debug(f"Request {request_id} has invalid k {k}")
+        return None, validation_error(f"Field 'k' must be an integer from 1 to {config.SEARCH_MAX_K}", "k")
+
+    if filters is not None and not isinstance(filters, dict):
+        logger.debug(f"Request {request_id} has invalid filters {filters}")
+        return None, validation_error("Field 'filters' must be an object", "filters")
+
+    return {"queries": [q.strip() for q in queries], "k": k, "filters": filters}, None
+
+
+def search(config: ServerConfig, steamdb_manager: SteamDBManager) -> Response:
+    """
+        Expected usage:
+            curl http://<host_name>/search \
+            -H "Content-Type: application/json" \
+            -d '{"queries": ["query1", "query2"], "k": 50, "filters": {"genres": ["RPG"], "max_price": 1999}}'
+    """
+    logger = config.logger_config.get_logger("/search")
+
+    request_id = str(uuid.uuid4())
+    logger.info(f"Get request {request_id}")
+
+    data = request.get_json(silent=True) or {}
+    with STAGE_SECONDS.time(stage="validation"):
+        search_request, error = validate_search_request(config, data, logger, request_id)
+    if error is not None:
+        return jsonify(error), ResponseCode.VALIDATION_ERROR.http_code
+
+    logger.info(f"Search {len(search_request['queries'])} queries for request {request_id}")
+    try:
+        result = steamdb_manager.find_similar_games_batch(**search_request)
+    except ValueError as e:
+        logger.debug(f"Request {request_id} has invalid filters: {e}")
+        return jsonify(validation_error(str(e), "filters")), ResponseCode.VALIDATION_ERROR.http_code
+
+    return jsonify(
+        {
+            "status": ResponseCode.SUCCESS.text,
+            "message": "Queries processed successfully",
+            "data": result,
+        }
+    ), ResponseCode.SUCCESS.http_code
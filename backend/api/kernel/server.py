@@ -1,5 +1,7 @@
+import time
 from typing import NoReturn
-from flask import Flask, Response, jsonify
+from flask import Flask, Response, g, jsonify, request
+from api.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS
 from api.config import ServerConfig
 from tools import ToolsDispatcher
 from model.model_requester import ModelRequester
@@ -13,6 +15,9 @@ class Server:
         self.config = server_config
         self.logger = server_config.logger_config.get_logger("server")
         self.tools_dispatcher = ToolsDispatcher(server_config)
+        if getattr(Server, "steamdb_manager", None) is not None:
+            # a restart after a crash replaces the manager, its worker threads must not pile up
+            Server.steamdb_manager.close()
         Server.steamdb_manager = SteamDBManager(server_config)
         self.app = self._create_app()
 
@@ -25,6 +30,7 @@ class Server:
 
         self._register_blueprints(app)
         self._register_error_handlers(app)
+        self._register_metrics_hooks(app)
         app.config['JSON_AS_ASCII'] = False
 
         return app
@@ -42,6 +48,18 @@ class Server:
             self.logger.error(f"500 error: {error}")
             return jsonify({"error": "Internal server error"}), 500
 
+    def _register_metrics_hooks(self, app: Flask) -> None:
+        @app.before_request
+        def start_timer() -> None:
+            g.request_started_at = time.perf_counter()
+
+        @app.after_request
+        def record_request(response: Response) -> Response:
+            endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            HTTP_REQUESTS.inc(endpoint=endpoint, status=str(response.status_code))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_started_at, endpoint=endpoint)
+            return response
+
     def run(self) -> NoReturn:
         try:
             self.logger.info(f"Starting Waitress server on {self.config.HOST}:{self.config.PORT}")
@@ -75,7 +93,17 @@ class Server:
         app.register_blueprint(ping_bp)
         self.logger.info("Ping handler has been registered")
 
+        from api.kernel.endpoints.metrics import metrics_bp, register_metrics_handler
+        register_metrics_handler(self.config)
+        app.register_blueprint(metrics_bp)
+        self.logger.info("Metrics handler has been registered")
+
         from api.kernel.endpoints.process import process_bp, register_process_handler
         register_process_handler(self.config, self.tools_dispatcher)
         app.register_blueprint(process_bp)
         self.logger.info("Process handler has been registered")
+
+        from api.kernel.endpoints.search import search_bp, register_search_handler
+        register_search_handler(self.config, Server.steamdb_manager)
+        app.register_blueprint(search_bp)
+        self.logger.info("Search handler has been registered")
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from api.kernel.async_server import AsyncServer
+from api.kernel.server import Server
+from api.metrics import HTTP_REQUESTS
+from model.ut.test_async_model_requester import EXAMPLE_CALL, FakeHttpClient, make_config
+from tools.tool_dispatcher import ToolsDispatcher
+
+
+@pytest.fixture(autouse=True)
+def no_catalog(monkeypatch):
+    monkeypatch.setattr(Server, "steamdb_manager", None, raising=False)
+
+
+def _server(config, http_client):
+    # skips SteamDBManager, the endpoints under test never search the catalog
+    server = AsyncServer.__new__(AsyncServer)
+    server.config = config
+    server.logger = logging.getLogger("server")
+    server.tools_dispatcher = ToolsDispatcher(config)
+    server.http_client = http_client
+    server.tools_executor = ThreadPoolExecutor(max_workers=2)
+    server.app = server._create_app()
+    return server
+
+
+def _run(server, scenario):
+    async def main():
+        async with TestClient(TestServer(server.get_app())) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_middlewares_count_requests_and_map_errors():
+    server = _server(make_config(), FakeHttpClient([]))
+    ping_count = HTTP_REQUESTS.value(endpoint="/ping", status="200")
+
+    async def scenario(client):
+        ping = await client.get("/ping")
+        missing = await client.get("/missing")
+        return ping.status, missing.status, await missing.json()
+
+    assert _run(server, scenario) == (200, 404, {"error": "Not found"})
+    assert HTTP_REQUESTS.value(endpoint="/ping", status="200") == ping_count + 1
+
+
+def test_process_answers_and_caches(tmp_path):
+    answer = {"role": "assistant", "content": json.dumps({"text": "Celeste"})}
+    config = make_config(RESPONSE_CACHE_PATH=str(tmp_path / "responses.sqlite"))
+    server = _server(config, FakeHttpClient([answer]))
+
+    async def scenario(client):
+        results = []
+        for _ in range(2):
+            response = await client.post("/process", json={"text": "games like Hollow Knight"})
+            results.append((response.status, response.headers["X-Cache"], (await response.json())["data"]))
+        return results
+
+    assert _run(server, scenario) == [(200, "MISS", "Celeste"), (200, "HIT", "Celeste")]
+
+
+def test_process_upstream_failure_is_service_unavailable():
+    server = _server(make_config(), FakeHttpClient([]))
+
+    async def scenario(client):
+        response = await client.post("/process", json={"text": "games like Hollow Knight"})
+        return response.status, await response.json()
+
+    status, body = _run(server, scenario)
+    assert status == 503
+    assert body == {"status": "service_unavailable", "message": "Model upstream returned no answer for 2 rounds"}
+
+
+def test_process_round_limit_is_bad_gateway():
+    tool_call = {"role": "assistant", "content": json.dumps(EXAMPLE_CALL)}
+    server = _server(make_config(), FakeHttpClient([tool_call] * 10))
+
+    async def scenario(client):
+        response = await client.post("/process", json={"text": "games like Hollow Knight"})
+        return response.status, await response.json()
+
+    status, body = _run(server, scenario)
+    assert status == 502
+    assert body == {"status": "bad_gateway", "message": "No final answer after 10 model rounds"}
+
+
+def test_run_ends_on_a_shutdown_signal():
+    server = _server(make_config(HOST="127.0.0.1", PORT=0, REQUEST_TIMEOUT=5.0), FakeHttpClient([]))
+
+    async def send_sigterm(app):
+        # signal handlers are installed before startup hooks run
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    server.app.on_startup.append(send_sigterm)
+    with pytest.raises(KeyboardInterrupt):
+        server.run()
@@ -0,0 +1,37 @@
+from .registry import Counter, Gauge, Histogram, MetricsRegistry
+from .metrics import (
+    REGISTRY,
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SECONDS,
+    STAGE_SECONDS,
+    LLM_ROUNDS_PER_REQUEST,
+    TOOL_CALLS_PER_REQUEST,
+    SEARCH_COALESCE_WAIT_SECONDS,
+    TOOL_CALLS,
+    UPSTREAM_REQUESTS,
+    LLM_HTTP_SECONDS,
+    RESPONSE_CACHE_LOOKUPS,
+    LLM_PROMPT_TOKENS,
+    LLM_MALFORMED_OUTPUTS,
+)
+
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'REGISTRY',
+    'HTTP_REQUESTS',
+    'HTTP_REQUEST_SECONDS',
+    'STAGE_SECONDS',
+    'LLM_ROUNDS_PER_REQUEST',
+    'TOOL_CALLS_PER_REQUEST',
+    'SEARCH_COALESCE_WAIT_SECONDS',
+    'TOOL_CALLS',
+    'UPSTREAM_REQUESTS',
+    'LLM_HTTP_SECONDS',
+    'RESPONSE_CACHE_LOOKUPS',
+    'LLM_PROMPT_TOKENS',
+    'LLM_MALFORMED_OUTPUTS',
+]
@@ -0,0 +1,66 @@
+from .registry import MetricsRegistry
+
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "steam_rag_http_requests_total",
+    "Handled HTTP requests by endpoint and status code",
+    ("endpoint", "status"),
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "steam_rag_http_request_duration_seconds",
+    "Time to produce an HTTP response by endpoint",
+    ("endpoint",),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "steam_rag_stage_duration_seconds",
+    "Time spent per request stage: validation, response_cache, llm_round, tool_dispatch, query_embedding, title_resolution, faiss_search, lexical_search",
+    ("stage",),
+)
+LLM_ROUNDS_PER_REQUEST = REGISTRY.histogram(
+    "steam_rag_llm_rounds_per_request",
+    "LLM round trips needed to answer one /process request by LLM_MODE (prompt, tools, json_schema)",
+    ("mode",),
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10),
+)
+TOOL_CALLS_PER_REQUEST = REGISTRY.histogram(
+    "steam_rag_tool_calls_per_request",
+    "Tool calls made while answering one /process request by LLM_MODE",
+    ("mode",),
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10),
+)
+SEARCH_COALESCE_WAIT_SECONDS = REGISTRY.histogram(
+    "steam_rag_search_coalesce_wait_seconds",
+    "Time a search waited in the coalescer queue before its batch started",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5),
+)
+TOOL_CALLS = REGISTRY.counter(
+    "steam_rag_tool_calls_total",
+    "Tool calls by tool and outcome (ok, error, unknown)",
+    ("tool", "outcome"),
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "steam_rag_upstream_requests_total",
+    "Requests to upstream services (llm, ollama) by outcome (ok, error)",
+    ("upstream", "outcome"),
+)
+LLM_HTTP_SECONDS = REGISTRY.histogram(
+    "steam_rag_llm_http_seconds",
+    "LLM HTTP call latency by phase: connect (new connections only), ttfb, total",
+    ("phase",),
+)
+RESPONSE_CACHE_LOOKUPS = REGISTRY.counter(
+    "steam_rag_response_cache_lookups_total",
+    "/process response cache lookups by result (hit, miss)",
+    ("result",),
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    "steam_rag_llm_prompt_tokens",
+    "Estimated tokens of the messages sent in one LLM round",
+    buckets=(500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000, 32000),
+)
+LLM_MALFORMED_OUTPUTS = REGISTRY.counter(
+    "steam_rag_llm_malformed_outputs_total",
+    "Model rounds whose output was neither a final answer nor a tool call, by LLM_MODE",
+    ("mode",),
+)
@@ -0,0 +1,34 @@
+import pytest
+
+from api.metrics.registry import MetricsRegistry
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Handled requests", ("endpoint", "status"))
+    registry.gauge("queue_depth", "Queued searches", lambda: 3)
+
+    requests.inc(endpoint="/search", status="200")
+    requests.inc(2, endpoint="/search", status="200")
+    rendered = registry.render()
+
+    assert "# TYPE requests_total counter" in rendered
+    assert 'requests_total{endpoint="/search",status="200"} 3' in rendered
+    assert "queue_depth 3" in rendered
+    with pytest.raises(ValueError):
+        requests.inc(endpoint="/search")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    stage = registry.histogram("stage_seconds", "Stage time", ("stage",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 2.0):
+        stage.observe(value, stage="faiss_search")
+    lines = registry.render().splitlines()
+
+    assert 'stage_seconds_bucket{stage="faiss_search",le="0.1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="faiss_search",le="1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="faiss_search",le="+Inf"} 4' in lines
+    assert 'stage_seconds_count{stage="faiss_search"} 4' in lines
+    assert stage.count(stage="faiss_search") == 4
@@ -14,6 +14,7 @@ class ResponseCode(Enum):
 
     INTERNAL_ERROR = ("internal_error", 500)
     NOT_IMPLEMENTED = ("not_implemented", 501)
+    BAD_GATEWAY = ("bad_gateway", 502)
     SERVICE_UNAVAILABLE = ("service_unavailable", 503)
 
     @property
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class GameCatalog:
+    TEXT_FIELDS: Tuple[str, ...] = ("name", "description", "tags", "genres")
+    NUMERIC_FIELDS: Tuple[str, ...] = ("sid", "stsp_owners", "full_price")
+    MANIFEST_NAME: str = "manifest.json"
+
+    def __init__(self, catalog_dir: str) -> None:
+        self.catalog_dir = Path(catalog_dir)
+        self.manifest: Dict[str, Any] = self.read_manifest(catalog_dir) or {}
+        if not self.manifest:
+            raise FileNotFoundError(f"Catalog manifest not found in {catalog_dir}")
+
+        self.rows: int = self.manifest["rows"]
+        self.fingerprint: str = self.manifest["fingerprint"]
+        self._offsets: Dict[str, np.ndarray] = {}
+        self._blobs: Dict[str, Optional[mmap.mmap]] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+
+        for field in self.TEXT_FIELDS:
+            self._offsets[field] = np.load(self.catalog_dir / f"{field}.offsets.npy", mmap_mode="r")
+            self._blobs[field] = self._map_blob(self.catalog_dir / f"{field}.blob")
+
+        for field in self.NUMERIC_FIELDS:
+            self._numeric[field] = np.load(self.catalog_dir / f"{field}.npy", mmap_mode="r")
+
+    @classmethod
+    def read_manifest(cls, catalog_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(catalog_dir) / cls.MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _map_blob(path: Path) -> Optional[mmap.mmap]:
+        if path.stat().st_size == 0:
+            return None
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        if idx < 0 or idx >= self.rows:
+            raise IndexError(f"Catalog row {idx} is out of range")
+
+        game: Dict[str, Any] = {field: self.get(idx, field) for field in self.TEXT_FIELDS}
+        for field in self.NUMERIC_FIELDS:
+            game[field] = self.get(idx, field)
+        return game
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for idx in range(self.rows):
+            yield self[idx]
+
+    def get(self, idx: int, field: str) -> Any:
+        if field in self._numeric:
+            value = float(self._numeric[field][idx])
+            if np.isnan(value):
+                return None
+            return int(value) if value.is_integer() else value
+
+        offsets: np.ndarray = self._offsets[field]
+        blob: Optional[mmap.mmap] = self._blobs[field]
+        start, end = int(offsets[idx]), int(offsets[idx + 1])
+        if blob is None or start == end:
+            return ""
+        return blob[start:end].decode("utf-8")
+
+    def column(self, field: str) -> np.ndarray:
+        return self._numeric[field]
+
+
+class GameCatalogWriter:
+    def __init__(self, catalog_dir: str, source: Dict[str, Any]) -> None:
+        self.catalog_dir = Path(catalog_dir)
+        self.tmp_dir = Path(f"{catalog_dir}.tmp")
+        self.source: Dict[str, Any] = source
+
+        if self.tmp_dir.exists():
+            shutil.rmtree(self.tmp_dir)
+        self.tmp_dir.mkdir(parents=True)
+
+        self._digest = hashlib.sha256()
+        self._blob_files: Dict[str, BinaryIO] = {
+            field: open(self.tmp_dir / f"{field}.blob", 'wb') for field in GameCatalog.TEXT_FIELDS
+        }
+        self._offsets: Dict[str, List[int]] = {field: [0] for field in GameCatalog.TEXT_FIELDS}
+        self._numeric: Dict[str, List[float]] = {field: [] for field in GameCatalog.NUMERIC_FIELDS}
+        self.rows: int = 0
+
+    def add(self, game: Dict[str, Any]) -> None:
+        for field in GameCatalog.TEXT_FIELDS:
+            value: str = str(game.get(field) or "")
+            encoded: bytes = value.encode("utf-8")
+            self._blob_files[field].write(encoded)
+            self._offsets[field].append(self._offsets[field][-1] + len(encoded))
+            self._digest.update(encoded)
+            self._digest.update(b"\0")
+
+        for field in GameCatalog.NUMERIC_FIELDS:
+            value = game.get(field)
+            try:
+                self._numeric[field].append(float(value) if value is not None and value != "" else np.nan)
+            except (TypeError, ValueError):
+                self._numeric[field].append(np.nan)
+
+        self.rows += 1
+
+    def close(self) -> GameCatalog:
+        for blob_file in self._blob_files.values():
+            blob_file.close()
+
+        for field, offsets in self._offsets.items():
+            np.save(self.tmp_dir / f"{field}.offsets.npy", np.array(offsets, dtype=np.int64))
+        for field, values in self._numeric.items():
+            np.save(self.tmp_dir / f"{field}.npy", np.array(values, dtype=np.float64))
+
+        manifest: Dict[str, Any] = {
+            "rows": self.rows,
+            "fingerprint": self._digest.hexdigest(),
+            "source": self.source,
+            "text_fields": list(GameCatalog.TEXT_FIELDS),
+            "numeric_fields": list(GameCatalog.NUMERIC_FIELDS),
+        }
+        with open(self.tmp_dir / GameCatalog.MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        if self.catalog_dir.exists():
+            shutil.rmtree(self.catalog_dir)
+        os.replace(self.tmp_dir, self.catalog_dir)
+        return GameCatalog(str(self.catalog_dir))
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingStore:
+    CHUNK_PREFIX: str = "chunk_"
+    KEY_DTYPE: str = "S64"
+
+    def __init__(self, store_dir: str, logger: logging.Logger, checkpoint_rows: int = 1024) -> None:
+        self.logger = logger
+        self.store_dir = Path(store_dir)
+        self.checkpoint_rows: int = max(1, checkpoint_rows)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        self._chunks: List[np.ndarray] = []
+        self._positions: Dict[bytes, Tuple[int, int]] = {}
+        self._buffer_keys: List[bytes] = []
+        self._buffer_vectors: List[np.ndarray] = []
+        self._next_chunk_id: int = 0
+        self._load_chunks()
+
+    @staticmethod
+    def make_key(text: str, model_name: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: str) -> bool:
+        return key.encode("ascii") in self._positions
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        position = self._positions.get(key.encode("ascii"))
+        if position is None:
+            return None
+        chunk_idx, row = position
+        return self._chunks[chunk_idx][row]
+
+    def append(self, keys: List[str], vectors: np.ndarray) -> None:
+        for key, vector in zip(keys, vectors):
+            encoded_key = key.encode("ascii")
+            if encoded_key in self._positions:
+                continue
+            self._buffer_keys.append(encoded_key)
+            self._buffer_vectors.append(vector)
+
+        if len(self._buffer_keys) >= self.checkpoint_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer_keys:
+            return
+
+        keys = np.array(self._buffer_keys, dtype=self.KEY_DTYPE)
+        vectors = np.stack(self._buffer_vectors).astype(np.float32)
+        chunk_path = self._write_chunk(keys, vectors)
+        self._buffer_keys = []
+        self._buffer_vectors = []
+        self.logger.info(f"Checkpointed {len(keys)} embeddings to {chunk_path}, store has {len(self)} embeddings")
+
+    def compact(self, live_keys: Iterable[str], min_stale_ratio: float = 0.1) -> int:
+        """
+            Rewrites the store as a single chunk of live_keys once at least min_stale_ratio of its
+            rows are stale (texts no longer in the catalog or stored twice). Returns the dropped rows.
+        """
+        self.flush()
+        live = sorted({key.encode("ascii") for key in live_keys} & self._positions.keys())
+        total_rows = sum(len(chunk) for chunk in self._chunks)
+        stale_rows = total_rows - len(live)
+        if stale_rows <= 0 or stale_rows < min_stale_ratio * total_rows:
+            return 0
+
+        old_paths = self._chunk_paths()
+        vectors = [self._chunks[chunk_idx][row] for chunk_idx, row in (self._positions[key] for key in live)]
+        self._chunks = []
+        self._positions = {}
+        # the new chunk is in place before the old ones are removed, a crash in between only leaves duplicates
+        if live:
+            self._write_chunk(np.array(live, dtype=self.KEY_DTYPE), np.stack(vectors).astype(np.float32))
+        for chunk_path in old_paths:
+            chunk_path.unlink()
+
+        self.logger.info(
+            f"Compacted embeddings store {self.store_dir}: dropped {stale_rows} stale rows, "
+            f"{len(self)} embeddings in {len(self._chunks)} chunk"
+        )
+        return stale_rows
+
+    def _write_chunk(self, keys: np.ndarray, vectors: np.ndarray) -> Path:
+        chunk_path = self.store_dir / f"{self.CHUNK_PREFIX}{self._next_chunk_id:06d}.npz"
+        tmp_path = chunk_path.with_suffix(".tmp.npz")
+
+        np.savez(tmp_path, keys=keys, vectors=vectors)
+        os.replace(tmp_path, chunk_path)
+
+        self._register_chunk(keys, vectors)
+        self._next_chunk_id += 1
+        return chunk_path
+
+    def _chunk_paths(self) -> List[Path]:
+        return sorted(self.store_dir.glob(f"{self.CHUNK_PREFIX}*.npz"))
+
+    def _load_chunks(self) -> None:
+        chunk_paths = self._chunk_paths()
+        for chunk_path in chunk_paths:
+            if chunk_path.name.endswith(".tmp.npz"):
+                chunk_path.unlink()
+                continue
+
+            chunk_id = chunk_path.name[len(self.CHUNK_PREFIX):-len(".npz")]
+            if chunk_id.isdigit():
+                self._next_chunk_id = max(self._next_chunk_id, int(chunk_id) + 1)
+            try:
+                with np.load(chunk_path) as chunk:
+                    self._register_chunk(chunk["keys"], chunk["vectors"])
+            except Exception as e:
+                self.logger.warning(f"Skipped unreadable embeddings chunk {chunk_path}: {e}")
+
+        if chunk_paths:
+            self.logger.info(f"Loaded {len(self)} embeddings from {len(self._chunks)} chunks in {self.store_dir}")
+
+    def _register_chunk(self, keys: np.ndarray, vectors: np.ndarray) -> None:
+        chunk_idx = len(self._chunks)
+        self._chunks.append(vectors)
+        for row, key in enumerate(keys):
+            self._positions.setdefault(bytes(key), (chunk_idx, row))
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .catalog import GameCatalog
+
+
+class GameFilterIndex:
+    """
+        Packed bitmaps (one bit per catalog row, little bit order as faiss.IDSelectorBitmap
+        expects) for every genre and tag, plus the numeric columns for range filters.
+    """
+
+    LIST_FIELDS = ("genres", "tags")
+    RANGE_FILTERS: Dict[str, tuple] = {
+        "min_owners": ("stsp_owners", np.greater_equal),
+        "max_owners": ("stsp_owners", np.less_equal),
+        "min_price": ("full_price", np.greater_equal),
+        "max_price": ("full_price", np.less_equal),
+    }
+
+    def __init__(self, catalog: GameCatalog) -> None:
+        self.rows: int = len(catalog)
+        self._catalog: GameCatalog = catalog
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+
+        for field in self.LIST_FIELDS:
+            ids_by_value: Dict[str, List[int]] = {}
+            for idx in range(self.rows):
+                for value in self._split(catalog.get(idx, field)):
+                    ids_by_value.setdefault(value, []).append(idx)
+
+            self._bitmaps[field] = {}
+            for value, ids in ids_by_value.items():
+                mask = np.zeros(self.rows, dtype=bool)
+                mask[ids] = True
+                self._bitmaps[field][value] = np.packbits(mask, bitorder="little")
+
+    @staticmethod
+    def _split(value: str) -> List[str]:
+        return [item.strip().lower() for item in (value or "").split(",") if item.strip()]
+
+    def values(self, field: str) -> List[str]:
+        return sorted(self._bitmaps[field])
+
+    def build_bitmap(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        unknown: List[str] = [name for name in filters if name not in self.LIST_FIELDS and name not in self.RANGE_FILTERS]
+        if unknown:
+            raise ValueError(f"Unknown search filters {unknown}")
+
+        bitmap: Optional[np.ndarray] = None
+
+        range_mask: Optional[np.ndarray] = None
+        for name, (column, compare) in self.RANGE_FILTERS.items():
+            bound = filters.get(name)
+            if bound is None:
+                continue
+            if not isinstance(bound, (int, float)) or isinstance(bound, bool):
+                raise ValueError(f"Search filter {name} must be a number, got {bound!r}")
+
+            with np.errstate(invalid="ignore"):
+                mask = compare(self._catalog.column(column), bound)
+            range_mask = mask if range_mask is None else range_mask & mask
+
+        if range_mask is not None:
+            bitmap = np.packbits(range_mask, bitorder="little")
+
+        for field in self.LIST_FIELDS:
+            values = filters.get(field)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"Search filter {field} must be a list of strings, got {values!r}")
+
+            for value in values:
+                value_bitmap: Optional[np.ndarray] = self._bitmaps[field].get(value.strip().lower())
+                if value_bitmap is None:
+                    return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+                bitmap = value_bitmap.copy() if bitmap is None else bitmap & value_bitmap
+
+        return bitmap
+
+    def count(self, bitmap: np.ndarray) -> int:
+        return int(np.unpackbits(bitmap, count=self.rows, bitorder="little").sum())
@@ -0,0 +1,129 @@
+import json
+import math
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .description_cleaner import extract_tags_from_description, strip_html
+
+CHARS_PER_TOKEN: int = 4
+
+
+def summarize_game(game: Dict[str, Any], desc_chars: int = 300, max_tags: int = 12) -> Dict[str, Any]:
+    description: str = strip_html(game.get("description", "") or "")
+    tags: List[str] = [tag.strip() for tag in (game.get("tags", "") or "").split(",") if tag.strip()]
+    tags += extract_tags_from_description(description)
+
+    if len(description) > desc_chars:
+        cut: str = description[:desc_chars]
+        description = (cut.rsplit(" ", 1)[0] if " " in cut else cut).rstrip(" ,.;:") + "…"
+
+    unique_tags: Dict[str, str] = {}
+    for tag in tags:
+        unique_tags.setdefault(tag.lower(), tag)
+
+    return {
+        "name": (game.get("name") or "").strip(),
+        "tags": list(unique_tags.values())[:max_tags],
+        "description": description,
+    }
+
+
+def summarize_games(games: List[Dict[str, Any]], desc_chars: int = 300, max_tags: int = 12) -> List[Dict[str, Any]]:
+    # runs inside worker processes, so a broken game must not fail the whole chunk
+    summaries: List[Dict[str, Any]] = []
+    for game in games:
+        try:
+            summaries.append(summarize_game(game, desc_chars, max_tags))
+        except Exception:
+            summaries.append({"name": game.get("name") or "", "tags": [], "description": ""})
+    return summaries
+
+
+def estimate_tokens(payload: Any) -> int:
+    return math.ceil(len(json.dumps(payload, ensure_ascii=False)) / CHARS_PER_TOKEN)
+
+
+def fit_token_budget(items: List[Dict[str, Any]], token_budget: int) -> List[Dict[str, Any]]:
+    """
+        Keeps the leading items (results are ranked) whose serialized size fits into token_budget.
+        A non-positive budget disables the limit.
+    """
+    if token_budget <= 0:
+        return items
+
+    fitted: List[Dict[str, Any]] = []
+    used: int = 1
+    for item in items:
+        used += estimate_tokens(item) + 1
+        if used > token_budget:
+            break
+        fitted.append(item)
+    return fitted
+
+
+class GameSummaries:
+    """
+        Compact per-game summaries (name, tags, truncated clean description) precomputed
+        for tool payloads, stored as one JSON document per catalog row in a memory-mapped blob.
+    """
+
+    META_NAME: str = "meta.json"
+
+    def __init__(self, summaries_dir: str) -> None:
+        self.summaries_dir = Path(summaries_dir)
+        self.meta: Optional[Dict[str, Any]] = self.read_meta(summaries_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"Summaries meta not found in {summaries_dir}")
+
+        self.rows: int = self.meta["rows"]
+        self._offsets: np.ndarray = np.load(self.summaries_dir / "offsets.npy", mmap_mode="r")
+        blob_path: Path = self.summaries_dir / "summaries.blob"
+        self._blob: Optional[mmap.mmap] = None
+        if blob_path.stat().st_size > 0:
+            with open(blob_path, 'rb') as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def read_meta(cls, summaries_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(summaries_dir) / cls.META_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @classmethod
+    def write(cls, summaries_dir: str, summaries: Iterable[Dict[str, Any]], meta: Dict[str, Any]) -> "GameSummaries":
+        tmp_dir = Path(f"{summaries_dir}.tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        offsets: List[int] = [0]
+        with open(tmp_dir / "summaries.blob", 'wb') as f:
+            for summary in summaries:
+                encoded: bytes = json.dumps(summary, ensure_ascii=False).encode("utf-8")
+                f.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+
+        np.save(tmp_dir / "offsets.npy", np.array(offsets, dtype=np.int64))
+        with open(tmp_dir / cls.META_NAME, 'w', encoding='utf-8') as f:
+            json.dump({**meta, "rows": len(offsets) - 1}, f, indent=2)
+
+        if os.path.exists(summaries_dir):
+            shutil.rmtree(summaries_dir)
+        os.replace(tmp_dir, summaries_dir)
+        return cls(summaries_dir)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def get(self, idx: int) -> Dict[str, Any]:
+        start, end = int(self._offsets[idx]), int(self._offsets[idx + 1])
+        if self._blob is None or start == end:
+            return {"name": "", "tags": [], "description": ""}
+        return json.loads(self._blob[start:end])
@@ -0,0 +1,143 @@
+import logging
+import math
+import time
+from typing import Any, Dict, Optional
+
+import faiss
+import numpy as np
+
+
+class IndexOptions:
+    INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+    STORAGE_CODECS: Dict[str, str] = {
+        "float32": "Flat",
+        "float16": "SQfp16",
+        "int8": "SQ8",
+    }
+
+    def __init__(
+        self,
+        index_type: str = "flat",
+        nlist: int = 0,
+        nprobe: int = 16,
+        pq_m: int = 64,
+        hnsw_m: int = 32,
+        ef_search: int = 128,
+        train_sample: int = 50000,
+        storage: str = "float32",
+    ) -> None:
+        index_type = index_type.lower()
+        if index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type}, expected one of {self.INDEX_TYPES}")
+
+        storage = storage.lower()
+        if storage not in self.STORAGE_CODECS:
+            raise ValueError(f"Unknown index storage {storage}, expected one of {tuple(self.STORAGE_CODECS)}")
+
+        self.index_type: str = index_type
+        self.storage: str = storage
+        self.nlist: int = nlist
+        self.nprobe: int = max(1, nprobe)
+        self.pq_m: int = pq_m
+        self.hnsw_m: int = hnsw_m
+        self.ef_search: int = max(1, ef_search)
+        self.train_sample: int = max(1, train_sample)
+
+    @classmethod
+    def from_config(cls, server_config: Any) -> "IndexOptions":
+        return cls(
+            index_type=server_config.INDEX_TYPE,
+            nlist=server_config.INDEX_NLIST,
+            nprobe=server_config.INDEX_NPROBE,
+            pq_m=server_config.INDEX_PQ_M,
+            hnsw_m=server_config.INDEX_HNSW_M,
+            ef_search=server_config.INDEX_EF_SEARCH,
+            train_sample=server_config.INDEX_TRAIN_SAMPLE,
+            storage=server_config.INDEX_STORAGE,
+        )
+
+    def resolve_nlist(self, rows: int) -> int:
+        if self.nlist > 0:
+            return min(self.nlist, rows)
+        return max(1, min(int(4 * math.sqrt(rows)), rows // 39))
+
+    def factory_string(self, rows: int) -> str:
+        codec: str = self.STORAGE_CODECS[self.storage]
+
+        if self.index_type == "hnsw":
+            return f"HNSW{self.hnsw_m}" if codec == "Flat" else f"HNSW{self.hnsw_m}_{codec}"
+        if self.index_type == "ivf_flat":
+            return f"IVF{self.resolve_nlist(rows)},{codec}"
+        if self.index_type == "ivf_pq":
+            return f"IVF{self.resolve_nlist(rows)},PQ{self.pq_m}"
+        return codec
+
+
+def build_index(embeddings: np.ndarray, options: IndexOptions, logger: logging.Logger) -> faiss.Index:
+    rows, dimension = embeddings.shape
+    spec: str = options.factory_string(rows)
+    index: faiss.Index = faiss.index_factory(dimension, spec, faiss.METRIC_INNER_PRODUCT)
+
+    if not index.is_trained:
+        sample_size: int = min(rows, options.train_sample)
+        sample_ids = np.random.default_rng(0).choice(rows, size=sample_size, replace=False)
+        logger.info(f"Training {spec} index on {sample_size} vectors")
+        index.train(embeddings[np.sort(sample_ids)])
+
+    index.add(embeddings)
+    configure_search(index, options)
+    return index
+
+
+def configure_search(index: faiss.Index, options: IndexOptions) -> None:
+    ivf: Optional[faiss.IndexIVF] = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = options.nprobe
+
+    hnsw_index = faiss.downcast_index(index)
+    if hasattr(hnsw_index, "hnsw"):
+        hnsw_index.hnsw.efSearch = options.ef_search
+
+
+def search_parameters(
+    index: faiss.Index,
+    options: IndexOptions,
+    selector: faiss.IDSelector,
+) -> faiss.SearchParameters:
+    if faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=options.nprobe)
+    if hasattr(faiss.downcast_index(index), "hnsw"):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=options.ef_search)
+    return faiss.SearchParameters(sel=selector)
+
+
+def evaluate_recall(
+    index: faiss.Index,
+    embeddings: np.ndarray,
+    k: int = 50,
+    n_queries: int = 200,
+) -> Dict[str, float]:
+    rows, dimension = embeddings.shape
+    k = min(k, rows)
+    query_ids = np.random.default_rng(1).choice(rows, size=min(n_queries, rows), replace=False)
+    queries = np.ascontiguousarray(embeddings[np.sort(query_ids)], dtype=np.float32)
+
+    flat = faiss.IndexFlatIP(dimension)
+    flat.add(np.ascontiguousarray(embeddings, dtype=np.float32))
+
+    started_at: float = time.perf_counter()
+    _, expected = flat.search(queries, k)
+    flat_ms: float = (time.perf_counter() - started_at) * 1000 / len(queries)
+
+    started_at = time.perf_counter()
+    _, found = index.search(queries, k)
+    index_ms: float = (time.perf_counter() - started_at) * 1000 / len(queries)
+
+    hits: int = sum(len(np.intersect1d(e, f)) for e, f in zip(expected, found))
+    return {
+        "recall": hits / (len(queries) * k),
+        "k": k,
+        "queries": len(queries),
+        "flat_ms_per_query": flat_ms,
+        "index_ms_per_query": index_ms,
+    }
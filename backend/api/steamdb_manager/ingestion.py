@@ -0,0 +1,77 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class GameFilter:
+    def __init__(
+        self,
+        min_owners: int = 35000,
+        require_description: bool = True,
+        require_name: bool = False,
+    ) -> None:
+        self.min_owners: int = min_owners
+        self.require_description: bool = require_description
+        self.require_name: bool = require_name
+
+    @classmethod
+    def from_config(cls, server_config: Any) -> "GameFilter":
+        return cls(
+            min_owners=server_config.FILTER_MIN_OWNERS,
+            require_description=server_config.FILTER_REQUIRE_DESCRIPTION,
+            require_name=server_config.FILTER_REQUIRE_NAME,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "min_owners": self.min_owners,
+            "require_description": self.require_description,
+            "require_name": self.require_name,
+        }
+
+    def accepts(self, game: Dict[str, Any]) -> bool:
+        if self.require_description and not game.get("description"):
+            return False
+        if self.require_name and not game.get("name"):
+            return False
+
+        stsp_owners: Optional[Any] = game.get("stsp_owners")
+        if self.min_owners > 0:
+            if not isinstance(stsp_owners, (int, float)) or stsp_owners <= self.min_owners:
+                return False
+        return True
+
+
+def iter_steamdb_games(steamdb_path: str, fields: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+        Yields the games of steamdb.json one by one, keeping only the requested top-level fields.
+        Other fields are skipped by the parser and never turned into Python objects.
+    """
+    if ijson is None:
+        yield from _iter_loaded_games(steamdb_path, fields)
+        return
+
+    wanted = {f"item.{field}": field for field in fields}
+    game: Dict[str, Any] = {}
+
+    with open(steamdb_path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "item":
+                if event == "start_map":
+                    game = {}
+                elif event == "end_map":
+                    yield game
+            elif prefix in wanted and event not in ("map_key", "start_map", "end_map", "start_array", "end_array"):
+                game[wanted[prefix]] = value
+
+
+def _iter_loaded_games(steamdb_path: str, fields: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    fields = tuple(fields)
+    with open(steamdb_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for game in data:
+        yield {field: game.get(field) for field in fields}
@@ -0,0 +1,188 @@
+import html
+import json
+import os
+import re
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+from .catalog import GameCatalog
+
+TOKEN_PATTERN: re.Pattern = re.compile(r"\w+")
+HTML_TAG_PATTERN: re.Pattern = re.compile(r"<[^>]+>")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from game games has have in is it its like of on or "
+    "similar that the their this to with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+class LexicalIndex:
+    """
+        BM25 inverted index over game names, tags, genres and descriptions.
+
+        Postings are stored as CSR arrays (term -> doc ids with precomputed BM25 weights),
+        so scoring a query only touches the postings of its own terms.
+    """
+
+    META_NAME: str = "meta.json"
+    K1: float = 1.2
+    B: float = 0.75
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        meta: Dict[str, Any],
+    ) -> None:
+        self.vocabulary: Dict[str, int] = vocabulary
+        self.indptr: np.ndarray = indptr
+        self.doc_ids: np.ndarray = doc_ids
+        self.weights: np.ndarray = weights
+        self.meta: Dict[str, Any] = meta
+        self.rows: int = meta["rows"]
+
+    @classmethod
+    def build(
+        cls,
+        catalog: GameCatalog,
+        name_boost: int = 3,
+        max_df_ratio: float = 0.5,
+    ) -> "LexicalIndex":
+        vocabulary: Dict[str, int] = {}
+        term_ids = array("i")
+        doc_ids = array("i")
+        term_freqs = array("f")
+        doc_lengths: np.ndarray = np.zeros(len(catalog), dtype=np.float32)
+
+        for idx in tqdm(range(len(catalog)), desc="Building lexical index", unit="game"):
+            freqs: Dict[str, float] = {}
+            for token in tokenize(catalog.get(idx, "name")):
+                freqs[token] = freqs.get(token, 0.0) + name_boost
+            for field in ("tags", "genres", "description"):
+                text: str = catalog.get(idx, field)
+                if field == "description":
+                    text = html.unescape(HTML_TAG_PATTERN.sub(" ", text))
+                for token in tokenize(text):
+                    freqs[token] = freqs.get(token, 0.0) + 1.0
+
+            for token, freq in freqs.items():
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                doc_ids.append(idx)
+                term_freqs.append(freq)
+            doc_lengths[idx] = sum(freqs.values())
+
+        terms: np.ndarray = np.frombuffer(term_ids, dtype=np.int32)
+        docs: np.ndarray = np.frombuffer(doc_ids, dtype=np.int32)
+        tfs: np.ndarray = np.frombuffer(term_freqs, dtype=np.float32)
+
+        rows: int = len(catalog)
+        doc_freqs: np.ndarray = np.bincount(terms, minlength=len(vocabulary))
+        idf: np.ndarray = np.log1p((rows - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        avg_length: float = float(doc_lengths.mean()) if rows else 0.0
+        norms: np.ndarray = cls.K1 * (1 - cls.B + cls.B * doc_lengths / max(avg_length, 1e-9))
+        weights: np.ndarray = idf[terms] * tfs * (cls.K1 + 1) / (tfs + norms[docs])
+
+        # terms found in most games barely move BM25 scores but have the longest postings
+        keep: np.ndarray = doc_freqs[terms] <= max(1, max_df_ratio * rows)
+        terms, docs, weights = terms[keep], docs[keep], weights[keep]
+
+        order: np.ndarray = np.argsort(terms, kind="stable")
+        indptr: np.ndarray = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=indptr[1:])
+
+        meta: Dict[str, Any] = {
+            "rows": rows,
+            "fingerprint": catalog.fingerprint,
+            "terms": len(vocabulary),
+            "postings": int(len(order)),
+            "params": {"k1": cls.K1, "b": cls.B, "name_boost": name_boost, "max_df_ratio": max_df_ratio},
+        }
+        return cls(vocabulary, indptr, docs[order].copy(), weights[order].astype(np.float32), meta)
+
+    @classmethod
+    def read_meta(cls, index_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(index_dir) / cls.META_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "LexicalIndex":
+        index_dir = Path(index_dir)
+        meta: Optional[Dict[str, Any]] = cls.read_meta(str(index_dir))
+        if meta is None:
+            raise FileNotFoundError(f"Lexical index meta not found in {index_dir}")
+
+        with open(index_dir / "vocabulary.json", 'r', encoding='utf-8') as f:
+            terms: List[str] = json.load(f)
+        return cls(
+            {term: term_id for term_id, term in enumerate(terms)},
+            np.load(index_dir / "indptr.npy", mmap_mode="r"),
+            np.load(index_dir / "doc_ids.npy", mmap_mode="r"),
+            np.load(index_dir / "weights.npy", mmap_mode="r"),
+            meta,
+        )
+
+    def save(self, index_dir: str) -> None:
+        tmp_dir = Path(f"{index_dir}.tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        with open(tmp_dir / "vocabulary.json", 'w', encoding='utf-8') as f:
+            json.dump(sorted(self.vocabulary, key=self.vocabulary.__getitem__), f, ensure_ascii=False)
+        np.save(tmp_dir / "indptr.npy", self.indptr)
+        np.save(tmp_dir / "doc_ids.npy", self.doc_ids)
+        np.save(tmp_dir / "weights.npy", self.weights)
+        with open(tmp_dir / self.META_NAME, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+
+        if os.path.exists(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    def search(self, query: str, k: int, bitmap: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        term_ids: List[int] = [
+            self.vocabulary[token] for token in dict.fromkeys(tokenize(query)) if token in self.vocabulary
+        ]
+        if not term_ids or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        docs: np.ndarray = np.concatenate([self.doc_ids[self.indptr[t]:self.indptr[t + 1]] for t in term_ids])
+        weights: np.ndarray = np.concatenate([self.weights[self.indptr[t]:self.indptr[t + 1]] for t in term_ids])
+        if bitmap is not None:
+            allowed: np.ndarray = (bitmap[docs >> 3] >> (docs & 7)) & 1
+            docs, weights = docs[allowed == 1], weights[allowed == 1]
+        if len(docs) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        scores: np.ndarray = np.bincount(inverse, weights=weights)
+        if len(scores) > k:
+            top: np.ndarray = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return unique_docs[top].astype(np.int64), scores[top].astype(np.float32)
+
+
+def reciprocal_rank_fusion(rankings: List[np.ndarray], k: int, rrf_k: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, idx in enumerate(ranking):
+            if idx < 0:
+                continue
+            scores[int(idx)] = scores.get(int(idx), 0.0) + 1.0 / (rrf_k + rank + 1)
+    fused: List[int] = sorted(scores, key=lambda idx: -scores[idx])[:k]
+    return np.array(fused, dtype=np.int64), np.array([scores[idx] for idx in fused], dtype=np.float32)
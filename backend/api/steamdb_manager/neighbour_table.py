@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+VectorsFn = Callable[[np.ndarray], np.ndarray]
+SearchFn = Callable[[np.ndarray, int], Tuple[np.ndarray, np.ndarray]]
+
+
+class NeighbourTable:
+    """
+        Precomputed top-n inner product neighbours of every catalog game, stored as a
+        rows x n int32 id matrix and a float16 score matrix that are memory-mapped at serve time.
+
+        Every row is keyed by a hash of the game's sid and vector, so a rebuild after a catalog
+        change only searches games whose content is new and merges them into the other rows.
+    """
+
+    META_NAME: str = "meta.json"
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray, keys: np.ndarray, meta: Dict[str, Any]) -> None:
+        self.ids: np.ndarray = ids
+        self.scores: np.ndarray = scores
+        self.keys: np.ndarray = keys
+        self.meta: Dict[str, Any] = meta
+        self.rows: int = meta["rows"]
+        self.n: int = meta["n"]
+
+    @staticmethod
+    def row_keys(sids: Iterable[Any], vectors: np.ndarray) -> np.ndarray:
+        keys: np.ndarray = np.empty(len(vectors), dtype=np.uint64)
+        for position, (sid, vector) in enumerate(zip(sids, vectors)):
+            payload: bytes = np.float64(sid).tobytes() + np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+            keys[position] = int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "little")
+        return keys
+
+    @classmethod
+    def build(
+        cls,
+        keys: np.ndarray,
+        vectors: VectorsFn,
+        search: SearchFn,
+        n: int,
+        batch_size: int = 1024,
+        previous: Optional["NeighbourTable"] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+        full_rebuild_ratio: float = 0.5,
+    ) -> "NeighbourTable":
+        rows: int = len(keys)
+        ids: np.ndarray = np.full((rows, n), -1, dtype=np.int32)
+        scores: np.ndarray = np.zeros((rows, n), dtype=np.float16)
+        stale: np.ndarray = np.ones(rows, dtype=bool)
+
+        if previous is not None and previous.n == n:
+            stale, new_rows = cls._reuse_rows(previous, keys, ids, scores)
+            if stale.sum() > full_rebuild_ratio * rows:
+                stale[:] = True
+            elif len(new_rows):
+                cls._merge_new_rows(np.flatnonzero(~stale), new_rows, ids, scores, vectors, batch_size)
+            if logger is not None:
+                logger.info(
+                    f"Neighbour table rebuild: {rows - int(stale.sum())} of {rows} rows reused, "
+                    f"{len(new_rows)} new or changed games"
+                )
+
+        stale_rows: np.ndarray = np.flatnonzero(stale)
+        for start in tqdm(range(0, len(stale_rows), batch_size), desc="Searching neighbours", unit="batch"):
+            batch: np.ndarray = stale_rows[start:start + batch_size]
+            distances, indices = search(vectors(batch), n + 1)
+            # drop the game itself, or the farthest neighbour when the index did not return it
+            own: np.ndarray = indices == batch[:, None]
+            own[~own.any(axis=1), -1] = True
+            batch_ids: np.ndarray = indices[~own].reshape(len(batch), n)
+            ids[batch] = batch_ids
+            scores[batch] = np.where(batch_ids >= 0, distances[~own].reshape(len(batch), n), 0)
+
+        table_meta: Dict[str, Any] = {**(meta or {}), "rows": rows, "n": n}
+        return cls(ids, scores, keys, table_meta)
+
+    @staticmethod
+    def _reuse_rows(
+        previous: "NeighbourTable",
+        keys: np.ndarray,
+        ids: np.ndarray,
+        scores: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        old_rows: Dict[int, int] = {int(key): row for row, key in enumerate(previous.keys)}
+        new_to_old: np.ndarray = np.array([old_rows.get(int(key), -1) for key in keys], dtype=np.int64)
+        reused: np.ndarray = np.flatnonzero(new_to_old >= 0)
+        old_to_new: np.ndarray = np.full(previous.rows, -1, dtype=np.int64)
+        old_to_new[new_to_old[reused]] = reused
+
+        old_ids: np.ndarray = np.asarray(previous.ids[new_to_old[reused]], dtype=np.int64)
+        remapped: np.ndarray = np.where(old_ids >= 0, old_to_new[np.maximum(old_ids, 0)], -1)
+        ids[reused] = remapped
+        scores[reused] = previous.scores[new_to_old[reused]]
+
+        stale: np.ndarray = new_to_old < 0
+        # a neighbour that was removed or changed leaves a hole only a full search can fill
+        stale[reused[((old_ids >= 0) & (remapped < 0)).any(axis=1)]] = True
+        return stale, np.flatnonzero(new_to_old < 0)
+
+    @staticmethod
+    def _merge_new_rows(
+        rows: np.ndarray,
+        new_rows: np.ndarray,
+        ids: np.ndarray,
+        scores: np.ndarray,
+        vectors: VectorsFn,
+        batch_size: int,
+    ) -> None:
+        n: int = ids.shape[1]
+        new_vectors: np.ndarray = vectors(new_rows)
+        for start in tqdm(range(0, len(rows), batch_size), desc="Merging new games into neighbours", unit="batch"):
+            batch: np.ndarray = rows[start:start + batch_size]
+            batch_ids: np.ndarray = ids[batch].astype(np.int64)
+            batch_scores: np.ndarray = np.where(batch_ids >= 0, scores[batch].astype(np.float32), -np.inf)
+
+            candidate_ids: np.ndarray = np.hstack([batch_ids, np.broadcast_to(new_rows, (len(batch), len(new_rows)))])
+            candidate_scores: np.ndarray = np.hstack([batch_scores, vectors(batch) @ new_vectors.T])
+            top: np.ndarray = np.argsort(-candidate_scores, axis=1, kind="stable")[:, :n]
+            top_ids: np.ndarray = np.take_along_axis(candidate_ids, top, axis=1)
+            top_scores: np.ndarray = np.take_along_axis(candidate_scores, top, axis=1)
+
+            found: np.ndarray = np.isfinite(top_scores)
+            ids[batch] = np.where(found, top_ids, -1)
+            scores[batch] = np.where(found, top_scores, 0)
+
+    @classmethod
+    def read_meta(cls, table_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(table_dir) / cls.META_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @classmethod
+    def load(cls, table_dir: str) -> "NeighbourTable":
+        table_dir = Path(table_dir)
+        meta: Optional[Dict[str, Any]] = cls.read_meta(str(table_dir))
+        if meta is None:
+            raise FileNotFoundError(f"Neighbour table meta not found in {table_dir}")
+
+        return cls(
+            np.load(table_dir / "ids.npy", mmap_mode="r"),
+            np.load(table_dir / "scores.npy", mmap_mode="r"),
+            np.load(table_dir / "keys.npy", mmap_mode="r"),
+            meta,
+        )
+
+    def save(self, table_dir: str) -> None:
+        tmp_dir = Path(f"{table_dir}.tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        np.save(tmp_dir / "ids.npy", np.ascontiguousarray(self.ids, dtype=np.int32))
+        np.save(tmp_dir / "scores.npy", np.ascontiguousarray(self.scores, dtype=np.float16))
+        np.save(tmp_dir / "keys.npy", np.ascontiguousarray(self.keys, dtype=np.uint64))
+        with open(tmp_dir / self.META_NAME, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+
+        if os.path.exists(table_dir):
+            shutil.rmtree(table_dir)
+        os.replace(tmp_dir, table_dir)
+
+    def neighbours(self, idx: int, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        row_ids: np.ndarray = np.asarray(self.ids[idx])
+        found: np.ndarray = row_ids >= 0
+        return row_ids[found][:k].astype(np.int64), np.asarray(self.scores[idx])[found][:k].astype(np.float32)
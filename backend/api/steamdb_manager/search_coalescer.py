@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from api.metrics import SEARCH_COALESCE_WAIT_SECONDS
+
+
+class _SearchRequest:
+    def __init__(self, query: str, k: int) -> None:
+        self.query: str = query
+        self.k: int = k
+        self.enqueued_at: float = time.perf_counter()
+        self.future: Future = Future()
+
+
+class SearchCoalescer:
+    """
+        Collects single-query searches coming from concurrent request threads and runs
+        them as one batched search once max_batch_size requests are queued or the oldest
+        one has waited max_wait_ms.
+    """
+
+    def __init__(
+        self,
+        search_batch: Callable[[List[str], int], List[List[Dict[str, Any]]]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        logger: logging.Logger,
+    ) -> None:
+        self.search_batch = search_batch
+        self.max_batch_size: int = max(1, max_batch_size)
+        self.max_wait: float = max(0.0, max_wait_ms) / 1000
+        self.logger = logger
+
+        self._queue: List[_SearchRequest] = []
+        self._condition = threading.Condition()
+        self._closed: bool = False
+
+        self._requests: int = 0
+        self._batches: int = 0
+        self._largest_batch: int = 0
+        self._total_wait: float = 0.0
+        self._max_wait_seen: float = 0.0
+        self._max_queue_depth: int = 0
+
+        self._worker = threading.Thread(target=self._run, name="SearchCoalescer", daemon=True)
+        self._worker.start()
+
+    def search(self, query: str, k: int) -> List[Dict[str, Any]]:
+        request = _SearchRequest(query, k)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Search coalescer is closed")
+            self._queue.append(request)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._condition.notify()
+        return request.future.result()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": self._requests / self._batches if self._batches else 0.0,
+                "max_batch_size": self._largest_batch,
+                "avg_wait_ms": self._total_wait / self._requests * 1000 if self._requests else 0.0,
+                "max_wait_ms": self._max_wait_seen * 1000,
+            }
+
+    def _next_batch(self) -> List[_SearchRequest]:
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+
+            if self._queue:
+                deadline: float = self._queue[0].enqueued_at + self.max_wait
+                while len(self._queue) < self.max_batch_size and not self._closed:
+                    remaining: float = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+            batch: List[_SearchRequest] = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_SearchRequest] = self._next_batch()
+            if not batch:
+                return
+
+            started_at: float = time.perf_counter()
+            waits: List[float] = [started_at - request.enqueued_at for request in batch]
+            for wait in waits:
+                SEARCH_COALESCE_WAIT_SECONDS.observe(wait)
+            with self._condition:
+                self._requests += len(batch)
+                self._batches += 1
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._total_wait += sum(waits)
+                self._max_wait_seen = max(self._max_wait_seen, max(waits))
+
+            try:
+                results = self.search_batch(
+                    [request.query for request in batch],
+                    max(request.k for request in batch),
+                )
+                for request, result in zip(batch, results):
+                    request.future.set_result(result[:request.k])
+            except Exception as e:
+                self.logger.error(f"Coalesced search of {len(batch)} queries failed: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+            self.logger.debug(
+                f"Coalesced {len(batch)} searches, added wait up to {max(waits) * 1000:.1f} ms, "
+                f"search took {(time.perf_counter() - started_at) * 1000:.1f} ms"
+            )
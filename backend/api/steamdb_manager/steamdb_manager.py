@@ -1,16 +1,42 @@
+import asyncio
 import json
 import numpy as np
 import faiss
-from sklearn.preprocessing import normalize
 from tqdm import tqdm
+import atexit
+import gc
+import multiprocessing
 import os
-from bs4 import BeautifulSoup
-import html
-import re
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+import time
+from collections import deque
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Deque, Iterable, Iterator, Optional, Tuple
 import ollama
 
+from api.cache import TTLCache
 from api.config import ServerConfig
+from api.metrics import REGISTRY, STAGE_SECONDS, UPSTREAM_REQUESTS
+from .catalog import GameCatalog, GameCatalogWriter
+from .embedding_store import EmbeddingStore
+from .ingestion import GameFilter, iter_steamdb_games
+from .description_cleaner import (
+    DESCRIPTION_TAGS,
+    clean_game_description,
+    clean_game_descriptions,
+    extract_tags_from_description,
+)
+from .filter_index import GameFilterIndex
+from .game_summaries import GameSummaries, fit_token_budget, summarize_games
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+from .neighbour_table import NeighbourTable
+from .title_index import TitleIndex
+from .index_factory import IndexOptions, build_index, configure_search, evaluate_recall, search_parameters
+from .memory_usage import current_rss_mb, peak_rss_mb
+from .search_coalescer import SearchCoalescer
+from .store_search import SteamStoreSearch
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 
@@ -18,343 +44,968 @@ class SteamDBManager:
     def __init__(self, server_config: ServerConfig) -> None:
         self.logger = server_config.logger_config.get_logger("SteamDBManager")
         self.steamdb_path: str = server_config.STEAMDB_PATH
+        self.catalog_path: str = server_config.CATALOG_PATH or f"{os.path.splitext(self.steamdb_path)[0]}_catalog"
+        self.game_filter: GameFilter = GameFilter.from_config(server_config)
         self.model_name: str = server_config.INDEX_MODEL_NAME
         self.embeddings_path: str = server_config.EMBEDDINGS_PATH
-        self.data: List[Dict[str, Any]] = self._load_data()
-        self._filter_games()
+        self.embed_batch_size: int = max(1, server_config.EMBED_BATCH_SIZE)
+        self.embed_workers: int = max(1, server_config.EMBED_WORKERS)
+        self.embed_max_retries: int = max(1, server_config.EMBED_MAX_RETRIES)
+        self.embed_checkpoint_rows: int = server_config.EMBED_CHECKPOINT_ROWS
+        self.clean_workers: int = server_config.CLEAN_WORKERS or os.cpu_count() or 1
+        self.clean_chunk_size: int = max(1, server_config.CLEAN_CHUNK_SIZE)
+        self.clean_queue_size: int = max(1, server_config.CLEAN_QUEUE_SIZE)
+        self.embeddings_store_path: str = (
+            server_config.EMBEDDINGS_STORE_PATH or f"{os.path.splitext(self.embeddings_path)[0]}_store"
+        )
+        self.manifest_path: str = f"{os.path.splitext(self.embeddings_path)[0]}.manifest.json"
+        self.index_path: str = server_config.INDEX_PATH or f"{os.path.splitext(self.embeddings_path)[0]}.faiss"
+        self.embedding_model_key: str = f"{self.model_name}:{self.EMBEDDING_MODEL}"
+        self.index_options: IndexOptions = IndexOptions.from_config(server_config)
+        self.recall_queries: int = server_config.INDEX_RECALL_QUERIES
+        self.keep_embeddings: bool = server_config.INDEX_KEEP_EMBEDDINGS
+        self.lexical_index_path: str = (
+            server_config.LEXICAL_INDEX_PATH or f"{os.path.splitext(self.index_path)[0]}.lexical"
+        )
+        self.lexical_name_boost: int = server_config.LEXICAL_NAME_BOOST
+        self.hybrid_search: bool = server_config.SEARCH_HYBRID
+        self.hybrid_candidates: int = max(1, server_config.SEARCH_HYBRID_CANDIDATES)
+        self.rrf_k: int = server_config.SEARCH_RRF_K
+        self.title_index_path: str = (
+            server_config.TITLE_INDEX_PATH or f"{os.path.splitext(self.index_path)[0]}.titles"
+        )
+        self.title_min_similarity: float = server_config.TITLE_MIN_SIMILARITY
+        self.neighbours_path: str = (
+            server_config.NEIGHBOURS_PATH or f"{os.path.splitext(self.index_path)[0]}.neighbours"
+        )
+        self.neighbours_n: int = server_config.NEIGHBOURS_N
+        self.neighbours_batch_size: int = max(1, server_config.NEIGHBOURS_BATCH_SIZE)
+        self.store_search: Optional[SteamStoreSearch] = (
+            SteamStoreSearch.from_config(server_config, self.logger) if server_config.STEAM_STORE_FALLBACK else None
+        )
+        self.summaries_path: str = server_config.SUMMARIES_PATH or f"{os.path.splitext(self.index_path)[0]}.summaries"
+        self.summary_desc_chars: int = server_config.SUMMARY_DESC_CHARS
+        self.summary_max_tags: int = server_config.SUMMARY_MAX_TAGS
+        self.tool_token_budget: int = server_config.TOOL_TOKEN_BUDGET
+        self.data: GameCatalog = self._load_data()
+        self.data_fingerprint: str = self.data.fingerprint
+        self.filter_index: GameFilterIndex = GameFilterIndex(self.data)
         self.ollama_client = ollama.Client(host=server_config.OLLAMA_HOST)
+        self.async_ollama_client = ollama.AsyncClient(host=server_config.OLLAMA_HOST)
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=max(1, server_config.SEARCH_EXECUTOR_WORKERS),
+            thread_name_prefix="FaissSearch",
+        )
 
-        if os.path.exists(self.embeddings_path):
-            self.embeddings: np.ndarray = self._load_embeddings()
+        self.embeddings: Optional[np.ndarray] = None
+        embeddings_up_to_date: bool = self._embeddings_up_to_date()
+        if embeddings_up_to_date and self._index_up_to_date():
+            self.index: faiss.Index = self._load_index()
+            if self.keep_embeddings:
+                self.embeddings = self._load_embeddings(mmap_mode="r")
         else:
-            self.embeddings: np.ndarray = self._generate_embeddings()
-            self._save_embeddings(self.embeddings)
-
-        self.index: faiss.Index = self._create_faiss_index(self.embeddings)
-
-    DESCRIPTION_TAGS: Dict[str, str] = {
-        # === CORE GENRES ===
-        r"\brpg\b": "RPG",
-        r"\brole[- ]?playing\b": "RPG",
-        r"\baction rpg\b": "Action RPG",
-        r"\bjrpg\b": "JRPG",
-        r"\bsouls[- ]?like\b": "Souls-like",
-        r"\bmmo\b": "MMO",
-        r"\bmmorpg\b": "MMORPG",
-        r"\barpg\b": "ARPG",
-
-        r"\bshooter\b": "Shooter",
-        r"\bfps\b": "FPS",
-        r"\bfirst[- ]?person shooter\b": "FPS",
-        r"\btps\b": "TPS",
-        r"\bthird[- ]?person shooter\b": "Third-Person Shooter",
-        r"\btop[- ]?down shooter\b": "Top-Down Shooter",
-
-        r"\bstrategy\b": "Strategy",
-        r"\brts\b": "RTS",
-        r"\breal[- ]?time strategy\b": "RTS",
-        r"\bturn[- ]?based\b": "Turn-Based",
-        r"\btactical\b": "Tactical",
-
-        r"\broguelike\b": "Roguelike",
-        r"\brogue[- ]?lite\b": "Roguelite",
-        r"\bpermadeath\b": "Permadeath",
-
-        r"\bplatformer\b": "Platformer",
-        r"\bmetroidvania\b": "Metroidvania",
-
-        r"\bsurvival\b": "Survival",
-        r"\bcra(ft|fting)\b": "Crafting",
-        r"\bbase building\b": "Base Building",
-
-        r"\bpuzzle\b": "Puzzle",
-
-        r"\bhorror\b": "Horror",
-        r"\bsurvival horror\b": "Survival Horror",
-
-        r"\bsimulation\b": "Simulation",
-        r"\blife sim\b": "Life Simulation",
-        r"\bfarming\b": "Farming",
-        r"\bfarm\b": "Farming",
-        r"\bmanagement\b": "Management",
-
-        r"\bracing\b": "Racing",
-        r"\bdriving\b": "Driving",
-        r"\bvehicle combat\b": "Vehicular Combat",
-
-        # === WORLD / SETTING ===
-        r"\bfantasy\b": "Fantasy",
-        r"\bhigh fantasy\b": "High Fantasy",
-        r"\bdark fantasy\b": "Dark Fantasy",
-
-        r"\bmedieval\b": "Medieval",
-        r"\bknight\b": "Medieval",
-
-        r"\bmagic(al)?\b": "Magic",
-        r"\bspell\b": "Magic",
-
-        r"\bsteampunk\b": "Steampunk",
-        r"\bcyberpunk\b": "Cyberpunk",
-
-        r"\bpost[- ]?apocalyptic\b": "Post-Apocalyptic",
-        r"\bdystopian\b": "Dystopian",
-        r"\bapocalypse\b": "Post-Apocalyptic",
-
-        r"\bscience fiction\b": "Sci-Fi",
-        r"\bsci[- ]?fi\b": "Sci-Fi",
-        r"\bspace\b": "Space",
-        r"\bgalaxy\b": "Space",
-        r"\binterstellar\b": "Space",
-
-        r"\bwestern\b": "Western",
-        r"\bsamurai\b": "Samurai",
-        r"\bninja\b": "Ninja",
-        r"\bmytholog(y|ical)\b": "Mythology",
-
-        # === WORLD TYPE ===
-        r"\bopen world\b": "Open World",
-        r"\bopen[- ]?world\b": "Open World",
-        r"\bsandbox\b": "Sandbox",
-        r"\bnon[- ]?linear\b": "Non-linear",
-        r"\bhub[- ]?based\b": "Hub World",
-
-        # === STORY / TONE ===
-        r"\bstory[- ]?driven\b": "Story Rich",
-        r"\bstory rich\b": "Story Rich",
-        r"\bnarrative\b": "Narrative",
-        r"\bchoices matter\b": "Choices Matter",
-        r"\bbranching\b": "Choices Matter",
-        r"\bmoral choices?\b": "Moral Choices",
-        r"\bcharacter driven\b": "Character Driven",
-        r"\bepic\b": "Epic",
-        r"\blemotional\b": "Emotional",
-
-        # === CHARACTERS ===
-        r"\bcompanions?\b": "Companions",
-        r"\bfollowers?\b": "Companions",
-        r"\bfactions?\b": "Factions",
-
-        # === COMBAT ===
-        r"\bcombat\b": "Combat",
-        r"\bmelee\b": "Melee Combat",
-        r"\bsword\b": "Melee Combat",
-        r"\barchery\b": "Archery",
-        r"\branged\b": "Ranged Combat",
-        r"\bgunfight\b": "Gun Combat",
-        r"\bshootout\b": "Gun Combat",
-
-        r"\bboss(es)?\b": "Boss Fights",
-        r"\bstealth\b": "Stealth",
-        r"\bcover system\b": "Cover Shooter",
-        r"\bparkour\b": "Parkour",
-        r"\bdodging\b": "Dodging",
-
-        # === RPG SYSTEMS / PROGRESSION ===
-        r"\blevel up\b": "Progression",
-        r"\bleveling\b": "Progression",
-        r"\bexperience\b": "Progression",
-        r"\bxp\b": "Progression",
-
-        r"\bskills?\b": "Skills",
-        r"\bskill tree\b": "Skills",
-        r"\babilities\b": "Abilities",
-        r"\btraits?\b": "Traits",
-        r"\bperks?\b": "Perks",
-
-        r"\bloot\b": "Loot",
-        r"\bloot system\b": "Loot",
-        r"\binventory\b": "Inventory",
-        r"\bcrafting\b": "Crafting",
-        r"\bresource(s)?\b": "Resource Management",
-
-        # === QUESTS / EXPLORATION ===
-        r"\bquest(s)?\b": "Questing",
-        r"\bside quest\b": "Side Quests",
-        r"\bexplor(ation|e)\b": "Exploration",
-        r"\bdiscover\b": "Exploration",
-        r"\bdungeon(s)?\b": "Dungeons",
-        r"\braids?\b": "Raids",
-        r"\bcaves?\b": "Caves",
-        r"\bruins?\b": "Ruins",
-
-        # === WORLD ACTIVITIES ===
-        r"\bhunting\b": "Hunting",
-        r"\bfishing\b": "Fishing",
-        r"\bharvesting\b": "Harvesting",
-        r"\bmining\b": "Mining",
-        r"\bhorse riding\b": "Horse Riding",
-        r"\bmount\b": "Mounts",
-
-        # === ENEMIES / CREATURES ===
-        r"\bmonsters?\b": "Monsters",
-        r"\bbeasts?\b": "Beasts",
-        r"\bdemons?\b": "Demons",
-        r"\bdragons?\b": "Dragons",
-        r"\bundead\b": "Undead",
-        r"\bzombies?\b": "Zombies",
-        r"\baliens?\b": "Aliens",
-        r"\brobots?\b": "Robots",
-        r"\bmechs?\b": "Mechs",
-
-        # === MULTIPLAYER / ONLINE ===
-        r"\bcoop\b": "Co-op",
-        r"\bco[- ]?op\b": "Co-op",
-        r"\bmultiplayer\b": "Multiplayer",
-        r"\bonline\b": "Online",
-        r"\bpvp\b": "PvP",
-        r"\bpve\b": "PvE",
-        r"\bguild(s)?\b": "Guilds",
-        r"\bclan(s)?\b": "Clans",
-
-        # === VISUAL STYLE ===
-        r"\bpixel art\b": "Pixel Art",
-        r"\banime\b": "Anime",
-        r"\bcartoon\b": "Cartoon",
-        r"\bvoxel\b": "Voxel",
-        r"\b2d\b": "2D",
-        r"\b3d\b": "3D",
-        r"\bisometric\b": "Isometric",
-        r"\btop[- ]?down\b": "Top-Down",
-
-        # === MISC ===
-        r"\brealistic\b": "Realistic",
-        r"\bphysics\b": "Physics",
-        r"\bdestruction\b": "Destruction",
-        r"\bcraft\b": "Crafting",
-        r"\bbuilder\b": "Building",
-        r"\bopen ended\b": "Open-Ended",
-    }
+            if embeddings_up_to_date:
+                self.embeddings = self._load_embeddings()
+            else:
+                self.embeddings = self._generate_embeddings()
+                self._save_embeddings(self.embeddings)
+
+            self.index: faiss.Index = self._create_faiss_index(self.embeddings)
+            self._save_index(self.index)
+
+            if self.recall_queries > 0:
+                self.evaluate_index_recall(n_queries=self.recall_queries)
+
+            if not self.keep_embeddings:
+                self.embeddings = None
+                gc.collect()
+
+        self.lexical_index: Optional[LexicalIndex] = self._load_lexical_index() if self.hybrid_search else None
+        self.summaries: GameSummaries = self._load_summaries()
+        self.title_index: TitleIndex = self._load_title_index()
+        self._direct_map_lock = threading.Lock()
+        self.neighbour_table: Optional[NeighbourTable] = self._load_neighbour_table()
+
+        # threads are only started once loading succeeded, a failed start leaves nothing running
+        self.query_cache: TTLCache = TTLCache(
+            max_size=server_config.QUERY_CACHE_SIZE,
+            ttl=server_config.QUERY_CACHE_TTL,
+            persist_path=server_config.QUERY_CACHE_PATH,
+            logger=self.logger,
+        )
+        self.search_coalescer: Optional[SearchCoalescer] = None
+        if server_config.SEARCH_COALESCE_MAX_BATCH > 1:
+            self.search_coalescer = SearchCoalescer(
+                self.find_similar_games_batch,
+                max_batch_size=server_config.SEARCH_COALESCE_MAX_BATCH,
+                max_wait_ms=server_config.SEARCH_COALESCE_WAIT_MS,
+                logger=self.logger,
+            )
+            search_coalescer: SearchCoalescer = self.search_coalescer
+            REGISTRY.gauge(
+                "steam_rag_search_coalescer_queue_depth",
+                "Searches waiting for the next coalesced batch",
+                lambda: search_coalescer.stats()["queue_depth"],
+            )
+            REGISTRY.gauge(
+                "steam_rag_search_coalescer_avg_batch_size",
+                "Average number of searches answered per coalesced batch",
+                lambda: search_coalescer.stats()["avg_batch_size"],
+            )
+        atexit.register(self.close)
+
+        self.logger.info(
+            f"Index ready: {self.index.ntotal} vectors, steady-state RSS {current_rss_mb():.0f} MB, "
+            f"peak RSS {peak_rss_mb():.0f} MB"
+        )
 
-    def extract_tags_from_description(self, description: str) -> List[str]:
-        found_tags: set[str] = set()
+    def close(self) -> None:
+        """
+            Stops the coalescer worker and saves the query cache. Called at exit, and by the
+            servers before a restart replaces this manager.
+        """
+        atexit.unregister(self.close)
+        if self.search_coalescer is not None:
+            self.search_coalescer.close()
+            self.search_coalescer = None
+        self.query_cache.close()
+        self.search_executor.shutdown(wait=False)
+
+    EMBEDDING_MODEL: str = "mxbai-embed-large"
 
-        for pattern, tag in SteamDBManager.DESCRIPTION_TAGS.items():
-            if re.search(pattern, description, flags=re.IGNORECASE):
-                found_tags.add(tag)
+    DESCRIPTION_TAGS: Dict[str, str] = DESCRIPTION_TAGS
 
-        return list(found_tags)
+    def extract_tags_from_description(self, description: str) -> List[str]:
+        return extract_tags_from_description(description)
 
     def _get_cleaned_description(self, game: Dict[str, Any]) -> str:
-        name: str = (game.get("name") or "").strip()
+        return clean_game_description(game)
+
+    def _steamdb_source(self) -> Dict[str, Any]:
+        stat = os.stat(self.steamdb_path)
+        return {
+            "path": os.path.abspath(self.steamdb_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "filter": self.game_filter.to_dict(),
+        }
+
+    def _load_data(self) -> GameCatalog:
+        source: Dict[str, Any] = self._steamdb_source()
+        manifest: Optional[Dict[str, Any]] = GameCatalog.read_manifest(self.catalog_path)
+        if manifest is not None and manifest.get("source") == source:
+            catalog = GameCatalog(self.catalog_path)
+            self.logger.info(f"Opened game catalog {self.catalog_path} with {len(catalog)} games")
+            return catalog
+
+        self.logger.info("Started streaming steamdb data into game catalog")
+        writer = GameCatalogWriter(self.catalog_path, source)
+        for game in self._filter_games(self._iter_steamdb()):
+            writer.add(game)
+        catalog: GameCatalog = writer.close()
+
+        self.logger.info(f"Converted steamdb data to game catalog {self.catalog_path} with {len(catalog)} games")
+        return catalog
+
+    def _iter_steamdb(self) -> Iterator[Dict[str, Any]]:
+        return iter_steamdb_games(self.steamdb_path, GameCatalog.TEXT_FIELDS + GameCatalog.NUMERIC_FIELDS)
+
+    def _filter_games(self, games: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        accepted: int = 0
+        rejected: int = 0
+        for game in tqdm(games, desc="Filtering games", unit="game"):
+            if self.game_filter.accepts(game):
+                accepted += 1
+                yield game
+            else:
+                rejected += 1
+        self.logger.info(f"Filtered steamdb data: {accepted} games accepted, {rejected} rejected")
 
-        raw_desc: str = game.get("description", "") or ""
-        clean: str = BeautifulSoup(raw_desc, "html.parser").get_text(separator=" ")
-        clean = html.unescape(clean)
-        clean = re.sub(r"\s+", " ", clean).strip()
+    def _generate_embeddings(self) -> np.ndarray:
+        self.logger.info(
+            f"Started generating embeddings with {self.clean_workers} cleaning and {self.embed_workers} embedding workers"
+        )
+        store = EmbeddingStore(self.embeddings_store_path, self.logger, self.embed_checkpoint_rows)
+        cleaned_chunks: queue.Queue = queue.Queue(maxsize=self.clean_queue_size)
+        stop_cleaning = threading.Event()
+        cleaner = threading.Thread(
+            target=self._clean_descriptions,
+            args=(cleaned_chunks, stop_cleaning),
+            name="DescriptionCleaner",
+            daemon=True,
+        )
 
-        tags: str = game.get("tags", "") or ""
-        if tags:
-            tags = " ".join(tags.split(","))
+        keys: List[str] = []
+        missing: Dict[str, str] = {}
+        batch_keys: List[str] = []
+        pending: Dict[Future, List[str]] = {}
+        started_at: float = time.perf_counter()
 
-        auto_tags: List[str] = self.extract_tags_from_description(clean)
-        auto_tags_str: str = " ".join(auto_tags) if auto_tags else ""
+        cleaner.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.embed_workers) as executor, \
+                    tqdm(total=len(self.data), desc="Generating embeddings", unit="game") as progress:
+                while True:
+                    texts: Any = cleaned_chunks.get()
+                    if texts is None:
+                        break
+                    if isinstance(texts, BaseException):
+                        raise texts
+
+                    for text in texts:
+                        key: str = EmbeddingStore.make_key(text, self.embedding_model_key)
+                        keys.append(key)
+                        if key in store or key in missing:
+                            progress.update(1)
+                            continue
+
+                        missing[key] = text
+                        batch_keys.append(key)
+                        if len(batch_keys) >= self.embed_batch_size:
+                            self._submit_batch(executor, batch_keys, missing, pending, store, progress, started_at)
+                            batch_keys = []
+
+                if batch_keys:
+                    self._submit_batch(executor, batch_keys, missing, pending, store, progress, started_at)
+                while pending:
+                    self._collect_batches(pending, store, progress, started_at)
+        finally:
+            stop_cleaning.set()
+            store.flush()
+
+        elapsed: float = time.perf_counter() - started_at
+        self.logger.info(
+            f"Finished generating embeddings in {elapsed:.1f}s: {len(keys) - len(missing)} reused from the store, "
+            f"{len(missing)} embedded ({len(missing) / max(elapsed, 1e-9):.1f} games/s)"
+        )
+        store.compact(keys)
+        return np.stack([store.get(key) for key in keys])
+
+    def _clean_descriptions(self, output: queue.Queue, stop: threading.Event) -> None:
+        def put(item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    output.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
 
-        combined_tags: str = " ".join(dict.fromkeys((tags + " " + auto_tags_str).split()))
+        try:
+            chunks: Iterator[List[Dict[str, Any]]] = (
+                [self.data[idx] for idx in range(start, min(start + self.clean_chunk_size, len(self.data)))]
+                for start in range(0, len(self.data), self.clean_chunk_size)
+            )
+
+            if self.clean_workers <= 1:
+                for chunk in chunks:
+                    if stop.is_set():
+                        return
+                    put(clean_game_descriptions(chunk))
+            else:
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=self.clean_workers, mp_context=context) as pool:
+                    in_flight: Deque[Future] = deque()
+                    for chunk in chunks:
+                        if stop.is_set():
+                            break
+                        in_flight.append(pool.submit(clean_game_descriptions, chunk))
+                        if len(in_flight) >= self.clean_workers * 2:
+                            put(in_flight.popleft().result())
+
+                    while in_flight and not stop.is_set():
+                        put(in_flight.popleft().result())
+                    for future in in_flight:
+                        future.cancel()
+
+            put(None)
+        except BaseException as e:
+            self.logger.error(f"Description cleaning failed: {e}")
+            put(e)
+
+    def _submit_batch(
+        self,
+        executor: ThreadPoolExecutor,
+        batch_keys: List[str],
+        missing: Dict[str, str],
+        pending: Dict[Future, List[str]],
+        store: EmbeddingStore,
+        progress: tqdm,
+        started_at: float,
+    ) -> None:
+        if len(pending) >= self.embed_workers * 2:
+            self._collect_batches(pending, store, progress, started_at)
+
+        batch: List[str] = [missing[key] for key in batch_keys]
+        pending[executor.submit(self._embed_batch, batch)] = batch_keys
+
+    def _collect_batches(
+        self,
+        pending: Dict[Future, List[str]],
+        store: EmbeddingStore,
+        progress: tqdm,
+        started_at: float,
+    ) -> None:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch_keys: List[str] = pending.pop(future)
+            store.append(batch_keys, future.result())
+            progress.update(len(batch_keys))
+
+        games_per_second: float = progress.n / max(time.perf_counter() - started_at, 1e-9)
+        progress.set_postfix(games_per_sec=f"{games_per_second:.1f}")
+        self.logger.info(f"Embedded {progress.n}/{progress.total} games ({games_per_second:.1f} games/s)")
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        for attempt in range(1, self.embed_max_retries + 1):
+            try:
+                response = self.ollama_client.embed(
+                    model=self.EMBEDDING_MODEL,
+                    input=texts
+                )
+                UPSTREAM_REQUESTS.inc(upstream="ollama", outcome="ok")
+                embeddings = np.array(response["embeddings"], dtype=np.float32)
+                # leaves zero vectors (e.g. an empty description) as they are instead of dividing by 0
+                faiss.normalize_L2(embeddings)
+                return embeddings
+            except Exception as e:
+                UPSTREAM_REQUESTS.inc(upstream="ollama", outcome="error")
+                if attempt == self.embed_max_retries:
+                    self.logger.error(f"Failed to embed batch of {len(texts)} texts after {attempt} attempts: {e}")
+                    raise
+
+                delay: float = 2 ** (attempt - 1)
+                self.logger.warning(
+                    f"Embedding batch of {len(texts)} texts failed (attempt {attempt}): {e}, retrying in {delay}s"
+                )
+                time.sleep(delay)
 
-        genres: str = game.get("genres", "") or ""
-        if genres:
-            genres = " ".join(genres.split(","))
+    def _get_text_embedding(self, text: str) -> np.ndarray:
+        return self._embed_batch([text])[0]
+
+    QUERY_PREFIX: str = "Represent the user query for retrieving relevant video games. \n"
+
+    def _query_cache_keys(self, queries: List[str]) -> List[str]:
+        return [f"{self.embedding_model_key}\0{' '.join(query.lower().split())}" for query in queries]
+
+    def _cached_query_embeddings(
+        self,
+        queries: List[str],
+        cache_keys: List[str],
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+        embeddings: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for cache_key, query in zip(cache_keys, queries):
+            if cache_key in embeddings or cache_key in missing:
+                continue
+            embedding: Optional[np.ndarray] = self.query_cache.get(cache_key)
+            if embedding is None:
+                missing[cache_key] = query
+            else:
+                embeddings[cache_key] = embedding
+        return embeddings, missing
+
+    def _stack_query_embeddings(self, cache_keys: List[str], embeddings: Dict[str, np.ndarray]) -> np.ndarray:
+        self.logger.debug(f"Query embedding cache stats: {self.query_cache.stats()}")
+        query_embeddings: np.ndarray = np.stack([embeddings[cache_key] for cache_key in cache_keys])
+        faiss.normalize_L2(query_embeddings)
+        return query_embeddings
+
+    def _get_query_embeddings(self, queries: List[str]) -> np.ndarray:
+        with STAGE_SECONDS.time(stage="query_embedding"):
+            return self._embed_queries(queries)
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        cache_keys: List[str] = self._query_cache_keys(queries)
+        embeddings, missing = self._cached_query_embeddings(queries, cache_keys)
+
+        missing_keys: List[str] = list(missing)
+        for start in range(0, len(missing_keys), self.embed_batch_size):
+            batch_keys: List[str] = missing_keys[start:start + self.embed_batch_size]
+            batch_embeddings: np.ndarray = self._embed_batch(
+                [f"{self.QUERY_PREFIX}{missing[cache_key]}" for cache_key in batch_keys]
+            )
+            for cache_key, embedding in zip(batch_keys, batch_embeddings):
+                embeddings[cache_key] = embedding
+                self.query_cache.set(cache_key, embedding)
+
+        return self._stack_query_embeddings(cache_keys, embeddings)
+
+    async def _embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        for attempt in range(1, self.embed_max_retries + 1):
+            try:
+                response = await self.async_ollama_client.embed(
+                    model=self.EMBEDDING_MODEL,
+                    input=texts
+                )
+                UPSTREAM_REQUESTS.inc(upstream="ollama", outcome="ok")
+                embeddings = np.array(response["embeddings"], dtype=np.float32)
+                # leaves zero vectors (e.g. an empty description) as they are instead of dividing by 0
+                faiss.normalize_L2(embeddings)
+                return embeddings
+            except Exception as e:
+                UPSTREAM_REQUESTS.inc(upstream="ollama", outcome="error")
+                if attempt == self.embed_max_retries:
+                    self.logger.error(f"Failed to embed batch of {len(texts)} texts after {attempt} attempts: {e}")
+                    raise
+
+                delay: float = 2 ** (attempt - 1)
+                self.logger.warning(
+                    f"Embedding batch of {len(texts)} texts failed (attempt {attempt}): {e}, retrying in {delay}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _get_query_embeddings_async(self, queries: List[str]) -> np.ndarray:
+        with STAGE_SECONDS.time(stage="query_embedding"):
+            return await self._embed_queries_async(queries)
+
+    async def _embed_queries_async(self, queries: List[str]) -> np.ndarray:
+        cache_keys: List[str] = self._query_cache_keys(queries)
+        embeddings, missing = self._cached_query_embeddings(queries, cache_keys)
+
+        missing_keys: List[str] = list(missing)
+        batches: List[List[str]] = [
+            missing_keys[start:start + self.embed_batch_size]
+            for start in range(0, len(missing_keys), self.embed_batch_size)
+        ]
+        results: List[np.ndarray] = await asyncio.gather(*(
+            self._embed_batch_async([f"{self.QUERY_PREFIX}{missing[cache_key]}" for cache_key in batch_keys])
+            for batch_keys in batches
+        ))
+        for batch_keys, batch_embeddings in zip(batches, results):
+            for cache_key, embedding in zip(batch_keys, batch_embeddings):
+                embeddings[cache_key] = embedding
+                self.query_cache.set(cache_key, embedding)
+
+        return self._stack_query_embeddings(cache_keys, embeddings)
 
-        result: List[str] = []
+    def _create_faiss_index(self, embeddings: np.ndarray) -> faiss.Index:
+        spec: str = self.index_options.factory_string(embeddings.shape[0])
+        self.logger.info(f"Started building {spec} index")
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings)
 
-        if name:
-            result.append(f"Game: {name}.")
+        index: faiss.Index = build_index(embeddings, self.index_options, self.logger)
 
-        if combined_tags:
-            result.append(f"Tags: {combined_tags}.")
+        self.logger.info("Finished building index")
+        return index
 
-        if genres:
-            result.append(f"Genres: {genres}.")
+    def evaluate_index_recall(self, n_queries: int = 200, k: int = 50) -> Dict[str, float]:
+        if self.embeddings is None:
+            self.logger.warning("Can not evaluate index recall, raw embeddings are not kept in memory")
+            return {}
+
+        embeddings: np.ndarray = np.array(self.embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+        report: Dict[str, float] = evaluate_recall(self.index, embeddings, k=k, n_queries=n_queries)
+        self.logger.info(
+            f"Index recall@{report['k']} over {report['queries']} queries: {report['recall']:.4f}, "
+            f"{report['index_ms_per_query']:.3f} ms/query vs {report['flat_ms_per_query']:.3f} ms/query for flat"
+        )
+        return report
 
-        final_text: str = "\n".join(result).strip()
-        final_text = (
-            "Represent the meaning of the following video game description for semantic retrieval:\n"
-            f"{final_text}"
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_manifest(self, rows: int, dimension: int, index: Optional[Dict[str, Any]] = None) -> None:
+        manifest: Dict[str, Any] = {
+            "model": self.embedding_model_key,
+            "rows": rows,
+            "dimension": dimension,
+            "data_hash": self.data_fingerprint,
+        }
+        if index is not None:
+            manifest["index"] = index
+
+        tmp_path: str = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _embeddings_up_to_date(self) -> bool:
+        if not os.path.exists(self.embeddings_path):
+            return False
+
+        manifest: Optional[Dict[str, Any]] = self._read_manifest()
+        if manifest is None:
+            rows, dimension = np.load(self.embeddings_path, mmap_mode="r").shape
+            if rows != len(self.data):
+                self.logger.info(f"Embeddings file has {rows} rows, catalog has {len(self.data)} games, rebuilding")
+                return False
+            self.logger.info("Embeddings file has no manifest, adopting it for the current catalog")
+            self._write_manifest(rows, dimension)
+            return True
+
+        if (
+            manifest.get("model") != self.embedding_model_key
+            or manifest.get("data_hash") != self.data_fingerprint
+            or manifest.get("rows") != len(self.data)
+        ):
+            self.logger.info("Embeddings are stale for the current catalog or model, rebuilding")
+            return False
+        return True
+
+    def _index_up_to_date(self) -> bool:
+        manifest: Optional[Dict[str, Any]] = self._read_manifest()
+        index_info: Dict[str, Any] = (manifest or {}).get("index") or {}
+
+        if (
+            not os.path.exists(self.index_path)
+            or index_info.get("rows") != len(self.data)
+            or index_info.get("spec") != self.index_options.factory_string(len(self.data))
+        ):
+            self.logger.info("Persisted index is missing or stale, rebuilding")
+            return False
+        return True
+
+    def _save_index(self, index: faiss.Index) -> None:
+        tmp_path: str = f"{self.index_path}.tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+        self._write_manifest(
+            index.ntotal,
+            index.d,
+            index={
+                "path": os.path.basename(self.index_path),
+                "type": type(index).__name__,
+                "spec": self.index_options.factory_string(index.ntotal),
+                "rows": index.ntotal,
+            },
         )
+        self.logger.info(f"Saved index with {index.ntotal} vectors to {self.index_path}")
 
-        return final_text
-
-    def _load_data(self) -> List[Dict[str, Any]]:
-        self.logger.info("Started loading steamdb data")
-        with open(self.steamdb_path, 'r', encoding='utf-8') as f:
-            data: List[Dict[str, Any]] = json.load(f)
-        self.logger.info("Loaded steamdb data")
-        return data
-
-    def _filter_games(self) -> None:
-        result: List[Dict[str, Any]] = []
-        for game in tqdm(self.data, desc="Generating embeddings", unit="game"):
-            description: Optional[str] = game.get("description", "")
-            stsp_owners: Optional[int] = game.get("stsp_owners", "")
-            if description is None or description == "" or stsp_owners is None or stsp_owners <= 35000:
-                continue
-            result.append(game)
-        self.data = result
+    def _load_index(self) -> faiss.Index:
+        self.logger.info(f"Loading index from {self.index_path}")
+        try:
+            index: faiss.Index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP)
+        except RuntimeError as e:
+            self.logger.warning(f"Can not memory-map index {self.index_path}, reading it fully: {e}")
+            index = faiss.read_index(self.index_path)
+        configure_search(index, self.index_options)
 
-    def _generate_embeddings(self) -> np.ndarray:
-        self.logger.info("Started generating embeddings")
-        embeddings: List[np.ndarray] = []
-        i = 0
-        for game in tqdm(self.data, desc="Generating embeddings", unit="game"):
-            try:
-                description: str = self._get_cleaned_description(game)
-            except Exception:
-                print("Exception!!")
-                description = str(game.get("description", ""))
-            if i == 5:
-                print(description)
-            i += 1
-            
-            emb: np.ndarray = self._get_text_embedding(description)
-            embeddings.append(emb)
-
-        self.logger.info("Finished generating embeddings")
-        return np.array(embeddings)
+        self.logger.info(f"Loaded index with {index.ntotal} vectors")
+        return index
 
-    def _get_text_embedding(self, text: str) -> np.ndarray:
-        response = self.ollama_client.embeddings(
-            model="mxbai-embed-large",
-            prompt=text
+    def _load_lexical_index(self) -> LexicalIndex:
+        meta: Optional[Dict[str, Any]] = LexicalIndex.read_meta(self.lexical_index_path)
+        if (
+            meta is not None
+            and meta.get("fingerprint") == self.data_fingerprint
+            and meta.get("params", {}).get("name_boost") == self.lexical_name_boost
+        ):
+            lexical_index: LexicalIndex = LexicalIndex.load(self.lexical_index_path)
+            self.logger.info(f"Loaded lexical index with {meta['terms']} terms from {self.lexical_index_path}")
+            return lexical_index
+
+        self.logger.info("Lexical index is missing or stale, rebuilding")
+        lexical_index = LexicalIndex.build(self.data, name_boost=self.lexical_name_boost)
+        lexical_index.save(self.lexical_index_path)
+        self.logger.info(
+            f"Saved lexical index with {lexical_index.meta['terms']} terms and "
+            f"{lexical_index.meta['postings']} postings to {self.lexical_index_path}"
         )
-        emb = np.array(response["embedding"], dtype=np.float32)
-        emb = emb / np.linalg.norm(emb)
-        return emb
-
-    def _create_faiss_index(self, embeddings: np.ndarray) -> faiss.Index:
-        self.logger.info("Started building index")
-        embeddings = normalize(embeddings)
-
-        dimension: int = embeddings.shape[1]
-        index = faiss.IndexFlatIP(dimension)
-        index.add(embeddings.astype(np.float32))
+        return LexicalIndex.load(self.lexical_index_path)
+
+    def _load_title_index(self) -> TitleIndex:
+        meta: Optional[Dict[str, Any]] = TitleIndex.read_meta(self.title_index_path)
+        if meta is not None and meta.get("fingerprint") == self.data_fingerprint:
+            self.logger.info(f"Loaded title index with {meta['trigrams']} trigrams from {self.title_index_path}")
+            return TitleIndex.load(self.title_index_path)
+
+        self.logger.info("Title index is missing or stale, rebuilding")
+        title_index: TitleIndex = TitleIndex.build(self.data)
+        title_index.save(self.title_index_path)
+        self.logger.info(
+            f"Saved title index with {title_index.meta['trigrams']} trigrams to {self.title_index_path}"
+        )
+        return TitleIndex.load(self.title_index_path)
+
+    def _neighbour_table_meta(self) -> Dict[str, Any]:
+        return {"fingerprint": self.data_fingerprint, "model": self.embedding_model_key}
+
+    def _load_neighbour_table(self) -> Optional[NeighbourTable]:
+        if self.neighbours_n <= 0:
+            return None
+
+        meta: Optional[Dict[str, Any]] = NeighbourTable.read_meta(self.neighbours_path)
+        expected: Dict[str, Any] = {**self._neighbour_table_meta(), "rows": len(self.data), "n": self.neighbours_n}
+        if meta is None or any(meta.get(name) != value for name, value in expected.items()):
+            # building the table is an offline job (build_neighbours.py), serving falls back to searches
+            self.logger.info(f"Neighbour table {self.neighbours_path} is missing or stale, similar games are searched")
+            return None
+
+        self.logger.info(f"Opened neighbour table with top {meta['n']} neighbours of {meta['rows']} games")
+        return NeighbourTable.load(self.neighbours_path)
+
+    def build_neighbour_table(self) -> NeighbourTable:
+        """
+            Computes the top NEIGHBOURS_N neighbours of every game with batched index searches,
+            reusing rows of the previous table whose games did not change.
+        """
+        embeddings: np.ndarray = self.embeddings if self.embeddings is not None else self._load_embeddings(mmap_mode="r")
+
+        def vectors(ids: np.ndarray) -> np.ndarray:
+            if len(embeddings):
+                batch: np.ndarray = np.array(embeddings[ids], dtype=np.float32)
+                faiss.normalize_L2(batch)
+                return batch
+            batch = self._stored_vectors(ids.tolist())
+            if batch is None:
+                raise RuntimeError("Index can not reconstruct stored vectors and no embeddings file is available")
+            return batch
+
+        sids: np.ndarray = self.data.column("sid")
+        keys: np.ndarray = np.concatenate([
+            NeighbourTable.row_keys(sids[start:start + self.neighbours_batch_size], vectors(
+                np.arange(start, min(start + self.neighbours_batch_size, len(self.data)))
+            ))
+            for start in range(0, len(self.data), self.neighbours_batch_size)
+        ]) if len(self.data) else np.empty(0, dtype=np.uint64)
+
+        previous: Optional[NeighbourTable] = None
+        previous_meta: Optional[Dict[str, Any]] = NeighbourTable.read_meta(self.neighbours_path)
+        if previous_meta is not None and previous_meta.get("model") == self.embedding_model_key:
+            previous = NeighbourTable.load(self.neighbours_path)
+
+        started_at: float = time.perf_counter()
+        table: NeighbourTable = NeighbourTable.build(
+            keys,
+            vectors,
+            lambda queries, k: self.index.search(queries, k),
+            n=self.neighbours_n,
+            batch_size=self.neighbours_batch_size,
+            previous=previous,
+            meta=self._neighbour_table_meta(),
+            logger=self.logger,
+        )
+        table.save(self.neighbours_path)
+        self.logger.info(
+            f"Saved top {table.n} neighbours of {table.rows} games to {self.neighbours_path} "
+            f"in {time.perf_counter() - started_at:.1f}s"
+        )
+        self.neighbour_table = NeighbourTable.load(self.neighbours_path)
+        return self.neighbour_table
+
+    def _load_summaries(self) -> GameSummaries:
+        params: Dict[str, Any] = {"desc_chars": self.summary_desc_chars, "max_tags": self.summary_max_tags}
+        meta: Optional[Dict[str, Any]] = GameSummaries.read_meta(self.summaries_path)
+        if meta is not None and meta.get("fingerprint") == self.data_fingerprint and meta.get("params") == params:
+            self.logger.info(f"Opened game summaries {self.summaries_path}")
+            return GameSummaries(self.summaries_path)
+
+        self.logger.info("Game summaries are missing or stale, rebuilding")
+        summaries: GameSummaries = GameSummaries.write(
+            self.summaries_path,
+            self._summarize_catalog(),
+            {"fingerprint": self.data_fingerprint, "params": params},
+        )
+        self.logger.info(f"Saved {len(summaries)} game summaries to {self.summaries_path}")
+        return summaries
 
-        self.logger.info("Finished building index")
-        return index
+    def _summarize_catalog(self) -> Iterator[Dict[str, Any]]:
+        chunks: Iterator[List[Dict[str, Any]]] = (
+            [self.data[idx] for idx in range(start, min(start + self.clean_chunk_size, len(self.data)))]
+            for start in range(0, len(self.data), self.clean_chunk_size)
+        )
+        summarize = partial(summarize_games, desc_chars=self.summary_desc_chars, max_tags=self.summary_max_tags)
+
+        with tqdm(total=len(self.data), desc="Summarizing games", unit="game") as progress:
+            if self.clean_workers <= 1:
+                results: Iterator[List[Dict[str, Any]]] = map(summarize, chunks)
+                for summaries in results:
+                    progress.update(len(summaries))
+                    yield from summaries
+            else:
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=self.clean_workers, mp_context=context) as pool:
+                    for summaries in pool.map(summarize, chunks):
+                        progress.update(len(summaries))
+                        yield from summaries
 
     def _save_embeddings(self, embeddings: np.ndarray) -> None:
         np.save(self.embeddings_path, embeddings)
+        self._write_manifest(embeddings.shape[0], embeddings.shape[1])
 
-    def _load_embeddings(self) -> np.ndarray:
+    def _load_embeddings(self, mmap_mode: Optional[str] = None) -> np.ndarray:
         try:
-            embeddings: np.ndarray = np.load(self.embeddings_path)
+            embeddings: np.ndarray = np.load(self.embeddings_path, mmap_mode=mmap_mode)
             return embeddings
         except FileNotFoundError:
             return np.array([])
 
-    def find_similar_games(self, query: str, k: int = 50) -> List[Dict[str, str]]:
-        query = f"Represent the user query for retrieving relevant video games. \n{query}"
-        self.logger.info(f"Started finding similiar games by query: {query}")
+    def find_similar_games(
+        self,
+        query: str,
+        k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        search_coalescer: Optional[SearchCoalescer] = self.search_coalescer
+        if search_coalescer is None or filters:
+            return self.find_similar_games_batch([query], k=k, filters=filters)[0]
+
+        similar_games: List[Dict[str, Any]] = search_coalescer.search(query, k)
+        self.logger.debug(f"Search coalescer stats: {search_coalescer.stats()}")
+        return similar_games
+
+    def find_similar_games_batch(
+        self,
+        queries: List[str],
+        k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if not queries:
+            return []
+        self.logger.info(f"Started finding similiar games by {len(queries)} queries: {queries}, filters: {filters}")
+
+        bitmap: Optional[np.ndarray] = self._filter_bitmap(filters)
+        if bitmap is not None and not bitmap.any():
+            return [[] for _ in queries]
+
+        query_embeddings: np.ndarray = self._get_query_embeddings(queries)
+        return self._search_embeddings(queries, query_embeddings, k, bitmap)
+
+    async def find_similar_games_batch_async(
+        self,
+        queries: List[str],
+        k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if not queries:
+            return []
+        self.logger.info(f"Started finding similiar games by {len(queries)} queries: {queries}, filters: {filters}")
+
+        bitmap: Optional[np.ndarray] = self._filter_bitmap(filters)
+        if bitmap is not None and not bitmap.any():
+            return [[] for _ in queries]
+
+        query_embeddings: np.ndarray = await self._get_query_embeddings_async(queries)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.search_executor,
+            self._search_embeddings,
+            queries,
+            query_embeddings,
+            k,
+            bitmap,
+        )
 
-        query_embedding: np.ndarray = self._get_text_embedding(query).reshape(1, -1)
-        query_embedding = normalize(query_embedding)
-        
-        distances, indices = self.index.search(query_embedding.astype(np.float32), k)
-        self.logger.info(f"Found {k} similiar games")
+    def resolve_title(self, title: str) -> Optional[Dict[str, Any]]:
+        with STAGE_SECONDS.time(stage="title_resolution"):
+            resolved: Optional[Tuple[int, float]] = self.title_index.resolve(title, self.title_min_similarity)
+        if resolved is None:
+            self.logger.info(f"Title {title!r} did not match any game")
+            return None
+
+        idx, similarity = resolved
+        name: str = self.data.get(idx, "name")
+        self.logger.info(f"Title {title!r} resolved to {name!r} (row {idx}, similarity {similarity:.2f})")
+        return {"id": idx, "name": name, "match": "exact" if similarity == 1.0 else "fuzzy", "similarity": round(similarity, 4)}
+
+    def search_titles(self, name: str, limit: int = 5) -> List[str]:
+        with STAGE_SECONDS.time(stage="title_resolution"):
+            rows: List[int] = self.title_index.suggest(name, limit, self.title_min_similarity)
+        if rows or self.store_search is None:
+            return [self.data.get(idx, "name") for idx in rows]
+
+        self.logger.info(f"No local title matches {name!r}, asking the Steam store")
+        return self.store_search.search(name, limit)
+
+    def _stored_vectors(self, ids: List[int]) -> Optional[np.ndarray]:
+        if self.embeddings is not None and len(self.embeddings):
+            vectors: np.ndarray = np.array(self.embeddings[ids], dtype=np.float32)
+        else:
+            try:
+                vectors = self.index.reconstruct_batch(np.array(ids, dtype=np.int64))
+            except RuntimeError:
+                ivf = faiss.try_extract_index_ivf(self.index)
+                if ivf is None:
+                    return None
+                # IVF indexes can only reconstruct vectors once they know which list holds every id
+                with self._direct_map_lock:
+                    if ivf.direct_map.type == faiss.DirectMap.NoMap:
+                        self.logger.info("Building IVF direct map to reconstruct stored vectors")
+                        ivf.make_direct_map()
+                vectors = self.index.reconstruct_batch(np.array(ids, dtype=np.int64))
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def find_games_like(
+        self,
+        title: str,
+        k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+            "Games like <title>": searches with the stored vector of the resolved game, so no
+            embedding request is made. Returns None when the title matches no game.
+        """
+        game: Optional[Dict[str, Any]] = self.resolve_title(title)
+        if game is None:
+            return None
+
+        bitmap: Optional[np.ndarray] = self._filter_bitmap(filters)
+        if bitmap is not None and not bitmap.any():
+            return {"game": game, "similar_games": []}
+
+        precomputed: Optional[List[Dict[str, Any]]] = self._precomputed_neighbours(game["id"], k, bitmap)
+        if precomputed is not None:
+            return {"game": game, "similar_games": precomputed}
+
+        vectors: Optional[np.ndarray] = self._stored_vectors([game["id"]])
+        if vectors is None:
+            self.logger.warning(f"Index can not reconstruct stored vectors, embedding {game['name']!r} instead")
+            vectors = self._get_query_embeddings([self._title_query(game["id"])])
+        return {"game": game, "similar_games": self._search_neighbours(game["id"], vectors, k, bitmap)}
+
+    async def find_games_like_async(
+        self,
+        title: str,
+        k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        game: Optional[Dict[str, Any]] = self.resolve_title(title)
+        if game is None:
+            return None
+
+        bitmap: Optional[np.ndarray] = self._filter_bitmap(filters)
+        if bitmap is not None and not bitmap.any():
+            return {"game": game, "similar_games": []}
+
+        precomputed: Optional[List[Dict[str, Any]]] = self._precomputed_neighbours(game["id"], k, bitmap)
+        if precomputed is not None:
+            return {"game": game, "similar_games": precomputed}
+
+        loop = asyncio.get_running_loop()
+        vectors: Optional[np.ndarray] = await loop.run_in_executor(self.search_executor, self._stored_vectors, [game["id"]])
+        if vectors is None:
+            self.logger.warning(f"Index can not reconstruct stored vectors, embedding {game['name']!r} instead")
+            vectors = await self._get_query_embeddings_async([self._title_query(game["id"])])
+        similar_games: List[Dict[str, Any]] = await loop.run_in_executor(
+            self.search_executor, self._search_neighbours, game["id"], vectors, k, bitmap,
+        )
+        return {"game": game, "similar_games": similar_games}
+
+    def _precomputed_neighbours(self, idx: int, k: int, bitmap: Optional[np.ndarray]) -> Optional[List[Dict[str, Any]]]:
+        if self.neighbour_table is None:
+            return None
+
+        ids, scores = self.neighbour_table.neighbours(idx)
+        if bitmap is not None:
+            allowed: np.ndarray = ((bitmap[ids >> 3] >> (ids & 7)) & 1) == 1
+            ids, scores = ids[allowed], scores[allowed]
+        # filtering can leave fewer than k games even though the index has more of them below the top n
+        if len(ids) < k and (bitmap is not None or k > self.neighbour_table.n):
+            return None
+        return self._games_by_ids(ids[:k], scores[:k])
+
+    def _title_query(self, idx: int) -> str:
+        summary: Dict[str, Any] = self.summaries.get(idx)
+        return f"{summary['name']}. {summary.get('description', '')}"
+
+    def _search_neighbours(
+        self,
+        idx: int,
+        vectors: np.ndarray,
+        k: int,
+        bitmap: Optional[np.ndarray],
+    ) -> List[Dict[str, Any]]:
+        # one extra neighbour because the game itself is usually its own nearest one
+        distances, indices = self._faiss_search(vectors, k + 1, bitmap)
+        keep: np.ndarray = indices[0] != idx
+        return self._games_by_ids(indices[0][keep][:k], distances[0][keep][:k])
+
+    def _filter_bitmap(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        bitmap: Optional[np.ndarray] = self.filter_index.build_bitmap(filters) if filters else None
+        if bitmap is not None:
+            self.logger.info(f"Filters {filters} allow {self.filter_index.count(bitmap)} of {self.index.ntotal} games")
+        return bitmap
+
+    def _search_embeddings(
+        self,
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        k: int,
+        bitmap: Optional[np.ndarray],
+    ) -> List[List[Dict[str, Any]]]:
+        candidates: int = max(k, self.hybrid_candidates) if self.lexical_index is not None else k
+        distances, indices = self._faiss_search(query_embeddings, candidates, bitmap)
+        self.logger.info(f"Found {k} similiar games for each of {len(queries)} queries")
+
+        if self.lexical_index is None:
+            return [self._games_by_ids(ids, scores) for ids, scores in zip(indices, distances)]
+
+        with STAGE_SECONDS.time(stage="lexical_search"):
+            lexical_ids: List[np.ndarray] = [
+                self.lexical_index.search(query, candidates, bitmap)[0] for query in queries
+            ]
+        results: List[List[Dict[str, Any]]] = []
+        for query_embedding, vector_ids, vector_distances, ids in zip(query_embeddings, indices, distances, lexical_ids):
+            fused_ids, rank_scores = reciprocal_rank_fusion([vector_ids, ids], k=k, rrf_k=self.rrf_k)
+            similarities: np.ndarray = self._fused_similarities(query_embedding, fused_ids, vector_ids, vector_distances)
+            results.append(self._games_by_ids(fused_ids, similarities, rank_scores))
+        return results
+
+    def _fused_similarities(
+        self,
+        query_embedding: np.ndarray,
+        ids: np.ndarray,
+        vector_ids: np.ndarray,
+        vector_distances: np.ndarray,
+    ) -> np.ndarray:
+        """
+            Cosine similarity of every fused result: taken from the vector search where the game was
+            a vector candidate, computed from its stored vector where only the lexical index found it.
+        """
+        known: Dict[int, float] = {int(idx): float(d) for idx, d in zip(vector_ids, vector_distances) if idx >= 0}
+        similarities: np.ndarray = np.array([known.get(int(idx), np.nan) for idx in ids], dtype=np.float32)
+        missing: np.ndarray = np.flatnonzero(np.isnan(similarities))
+        if len(missing):
+            vectors: Optional[np.ndarray] = self._stored_vectors(ids[missing].tolist())
+            if vectors is not None:
+                similarities[missing] = vectors @ query_embedding
+        return similarities
+
+    def _faiss_search(
+        self,
+        query_embeddings: np.ndarray,
+        k: int,
+        bitmap: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        params: Optional[faiss.SearchParameters] = None
+        if bitmap is not None:
+            selector = faiss.IDSelectorBitmap(self.index.ntotal, faiss.swig_ptr(bitmap))
+            params = search_parameters(self.index, self.index_options, selector)
+
+        with STAGE_SECONDS.time(stage="faiss_search"):
+            return self.index.search(query_embeddings, k, params=params)
+
+    def _games_by_ids(
+        self,
+        ids: np.ndarray,
+        similarities: np.ndarray,
+        rank_scores: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+            Summaries with the cosine similarity to the query and, for hybrid search results,
+            the reciprocal rank fusion score that ordered them.
+        """
         similar_games = []
-        for i, idx in enumerate(indices[0]):
-            game = self.data[idx]
-            similar_games.append({
-                'name': game['name'],
-                'description': game['description']
-            })
+        for position, (idx, similarity) in enumerate(zip(ids, similarities)):
+            if idx < 0:
+                continue
+            game: Dict[str, Any] = {**self.summaries.get(int(idx))}
+            game['similarity'] = None if np.isnan(similarity) else round(float(similarity), 4)
+            if rank_scores is not None:
+                game['rank_score'] = round(float(rank_scores[position]), 4)
+            similar_games.append(game)
         return similar_games
+
+    def fit_token_budget(self, games: List[Dict[str, Any]], token_budget: Optional[int] = None) -> List[Dict[str, Any]]:
+        budget: int = self.tool_token_budget if token_budget is None else token_budget
+        fitted: List[Dict[str, Any]] = fit_token_budget(games, budget)
+        if len(fitted) < len(games):
+            self.logger.info(f"Trimmed tool payload from {len(games)} to {len(fitted)} games to fit {budget} tokens")
+        return fitted
@@ -0,0 +1,58 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from api.cache import TTLCache
+from api.config import ServerConfig
+
+
+class SteamStoreSearch:
+    """
+        Name search through the live Steam store API, used only when the local title index
+        finds nothing. Answers, including empty ones, are cached and every call has a timeout.
+    """
+
+    URL: str = "https://store.steampowered.com/api/storesearch/"
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        timeout: float,
+        cache_size: int,
+        cache_ttl: float,
+    ) -> None:
+        self.logger = logger
+        self.timeout: float = timeout
+        self.cache: TTLCache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.session: requests.Session = requests.Session()
+
+    @classmethod
+    def from_config(cls, server_config: ServerConfig, logger: logging.Logger) -> "SteamStoreSearch":
+        return cls(
+            logger=logger,
+            timeout=server_config.STEAM_STORE_TIMEOUT,
+            cache_size=server_config.STEAM_STORE_CACHE_SIZE,
+            cache_ttl=server_config.STEAM_STORE_CACHE_TTL,
+        )
+
+    def search(self, term: str, limit: int = 5) -> List[str]:
+        cache_key: str = " ".join(term.lower().split())
+        names: Optional[List[str]] = self.cache.get(cache_key)
+        if names is None:
+            names = self._request(term)
+            if names is None:
+                # failures are not cached, the next call tries again
+                return []
+            self.cache.set(cache_key, names)
+        return names[:limit]
+
+    def _request(self, term: str) -> Optional[List[str]]:
+        params: Dict[str, Any] = {"term": term, "l": "english", "cc": "US"}
+        try:
+            response = self.session.get(self.URL, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return [item["name"] for item in response.json().get("items", [])]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.logger.warning(f"Steam store search for {term!r} failed: {e}")
+            return None
@@ -0,0 +1,62 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+class TagExtractor:
+    """
+        Finds every tag of a {pattern: tag} mapping in one scan of the text.
+
+        Patterns of the form \\b<letter>... can only match where a word starts with
+        that letter, so a single scanner visits those word starts and tries just the
+        patterns of the matching first-letter bucket there. Patterns of any other
+        shape are searched on their own.
+    """
+
+    QUANTIFIERS: str = "?*+{"
+
+    def __init__(self, patterns: Dict[str, str], flags: int = re.IGNORECASE) -> None:
+        self._buckets: Dict[str, List[Tuple[re.Pattern, str]]] = {}
+        self._fallback: List[Tuple[re.Pattern, str]] = []
+        self._tag_order: Dict[str, int] = {}
+
+        for pattern, tag in patterns.items():
+            self._tag_order.setdefault(tag, len(self._tag_order))
+            compiled: re.Pattern = re.compile(pattern, flags)
+            first_letter: Optional[str] = self._first_letter(pattern)
+            if first_letter is None:
+                self._fallback.append((compiled, tag))
+            else:
+                self._buckets.setdefault(first_letter, []).append((compiled, tag))
+
+        self._bucketed: List[Tuple[re.Pattern, str]] = [
+            pattern_tag for bucket in self._buckets.values() for pattern_tag in bucket
+        ]
+        letters: str = "".join(sorted(self._buckets))
+        self._scanner: Optional[re.Pattern] = (
+            re.compile(rf"\b[{re.escape(letters)}]", flags) if letters else None
+        )
+
+    @classmethod
+    def _first_letter(cls, pattern: str) -> Optional[str]:
+        if not pattern.startswith(r"\b") or len(pattern) < 3:
+            return None
+
+        letter: str = pattern[2]
+        following: str = pattern[3:4]
+        if not letter.isalnum() or following in cls.QUANTIFIERS and following != "":
+            return None
+        return letter.lower()
+
+    def extract(self, text: str) -> List[str]:
+        found_tags: set[str] = {tag for pattern, tag in self._fallback if pattern.search(text)}
+
+        if self._scanner is not None:
+            for match in self._scanner.finditer(text):
+                position: int = match.start()
+                # case-insensitive matching may accept letters whose lower() differs, e.g. the Kelvin sign
+                bucket = self._buckets.get(text[position].lower()) or self._bucketed
+                for pattern, tag in bucket:
+                    if tag not in found_tags and pattern.match(text, position):
+                        found_tags.add(tag)
+
+        return sorted(found_tags, key=self._tag_order.__getitem__)
@@ -0,0 +1,211 @@
+import bisect
+import json
+import os
+import re
+import shutil
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+from .catalog import GameCatalog
+
+TRADEMARK_PATTERN: re.Pattern = re.compile(r"[™®©]")
+NON_WORD_PATTERN: re.Pattern = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    # trademark signs go first, NFKC would turn ™ into "tm"
+    title = unicodedata.normalize("NFKC", TRADEMARK_PATTERN.sub("", title)).casefold()
+    return " ".join(NON_WORD_PATTERN.sub(" ", title).split())
+
+
+def title_trigrams(normalized: str) -> List[str]:
+    # padding makes short titles and word starts produce their own trigrams
+    padded: str = f"  {normalized} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class TitleIndex:
+    """
+        Resolves a game title to its catalog row: normalized exact match first, then trigram
+        similarity (Dice coefficient) for typos and partial names. Ties go to the most owned game.
+    """
+
+    META_NAME: str = "meta.json"
+
+    def __init__(
+        self,
+        titles: List[str],
+        vocabulary: Dict[str, int],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        gram_counts: np.ndarray,
+        owners: np.ndarray,
+        meta: Dict[str, Any],
+    ) -> None:
+        self.titles: List[str] = titles
+        self.vocabulary: Dict[str, int] = vocabulary
+        self.indptr: np.ndarray = indptr
+        self.doc_ids: np.ndarray = doc_ids
+        self.gram_counts: np.ndarray = gram_counts
+        self.owners: np.ndarray = owners
+        self.meta: Dict[str, Any] = meta
+
+        self.exact: Dict[str, int] = {}
+        for idx, title in enumerate(titles):
+            current: Optional[int] = self.exact.get(title)
+            if title and (current is None or owners[idx] > owners[current]):
+                self.exact[title] = idx
+
+        # titles in sorted order, a prefix matches one contiguous range of it
+        self.sorted_rows: np.ndarray = np.array(sorted(range(len(titles)), key=titles.__getitem__), dtype=np.int64)
+        self.sorted_titles: List[str] = [titles[idx] for idx in self.sorted_rows]
+
+    @classmethod
+    def build(cls, catalog: GameCatalog) -> "TitleIndex":
+        titles: List[str] = []
+        vocabulary: Dict[str, int] = {}
+        gram_ids = array("i")
+        doc_ids = array("i")
+        gram_counts: np.ndarray = np.zeros(len(catalog), dtype=np.int32)
+
+        for idx in tqdm(range(len(catalog)), desc="Building title index", unit="game"):
+            title: str = normalize_title(catalog.get(idx, "name"))
+            titles.append(title)
+            if not title:
+                continue
+            grams: List[str] = title_trigrams(title)
+            for gram in grams:
+                gram_ids.append(vocabulary.setdefault(gram, len(vocabulary)))
+                doc_ids.append(idx)
+            gram_counts[idx] = len(grams)
+
+        grams_array: np.ndarray = np.frombuffer(gram_ids, dtype=np.int32)
+        docs: np.ndarray = np.frombuffer(doc_ids, dtype=np.int32)
+        order: np.ndarray = np.argsort(grams_array, kind="stable")
+        indptr: np.ndarray = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(grams_array, minlength=len(vocabulary)), out=indptr[1:])
+
+        meta: Dict[str, Any] = {
+            "rows": len(catalog),
+            "fingerprint": catalog.fingerprint,
+            "trigrams": len(vocabulary),
+            "postings": int(len(order)),
+        }
+        owners: np.ndarray = np.nan_to_num(np.asarray(catalog.column("stsp_owners"), dtype=np.float64)).astype(np.int64)
+        return cls(titles, vocabulary, indptr, docs[order].copy(), gram_counts, owners, meta)
+
+    @classmethod
+    def read_meta(cls, index_dir: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(index_dir) / cls.META_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "TitleIndex":
+        index_dir = Path(index_dir)
+        meta: Optional[Dict[str, Any]] = cls.read_meta(str(index_dir))
+        if meta is None:
+            raise FileNotFoundError(f"Title index meta not found in {index_dir}")
+
+        with open(index_dir / "titles.json", 'r', encoding='utf-8') as f:
+            titles: List[str] = json.load(f)
+        with open(index_dir / "vocabulary.json", 'r', encoding='utf-8') as f:
+            grams: List[str] = json.load(f)
+        return cls(
+            titles,
+            {gram: gram_id for gram_id, gram in enumerate(grams)},
+            np.load(index_dir / "indptr.npy", mmap_mode="r"),
+            np.load(index_dir / "doc_ids.npy", mmap_mode="r"),
+            np.load(index_dir / "gram_counts.npy", mmap_mode="r"),
+            np.load(index_dir / "owners.npy", mmap_mode="r"),
+            meta,
+        )
+
+    def save(self, index_dir: str) -> None:
+        tmp_dir = Path(f"{index_dir}.tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        with open(tmp_dir / "titles.json", 'w', encoding='utf-8') as f:
+            json.dump(self.titles, f, ensure_ascii=False)
+        with open(tmp_dir / "vocabulary.json", 'w', encoding='utf-8') as f:
+            json.dump(sorted(self.vocabulary, key=self.vocabulary.__getitem__), f, ensure_ascii=False)
+        np.save(tmp_dir / "indptr.npy", self.indptr)
+        np.save(tmp_dir / "doc_ids.npy", self.doc_ids)
+        np.save(tmp_dir / "gram_counts.npy", self.gram_counts)
+        np.save(tmp_dir / "owners.npy", self.owners)
+        with open(tmp_dir / self.META_NAME, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+
+        if os.path.exists(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    def search(self, title: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        normalized: str = normalize_title(title)
+        gram_ids: List[int] = [
+            self.vocabulary[gram] for gram in title_trigrams(normalized) if gram in self.vocabulary
+        ] if normalized else []
+        if not gram_ids or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        docs: np.ndarray = np.concatenate([self.doc_ids[self.indptr[g]:self.indptr[g + 1]] for g in gram_ids])
+        unique_docs, shared = np.unique(docs, return_counts=True)
+        similarity: np.ndarray = 2 * shared / (len(title_trigrams(normalized)) + self.gram_counts[unique_docs])
+
+        order: np.ndarray = np.lexsort((-self.owners[unique_docs], -similarity))[:k]
+        return unique_docs[order].astype(np.int64), similarity[order].astype(np.float32)
+
+    def complete(self, prefix: str, k: int) -> np.ndarray:
+        """
+            Autocomplete: rows whose normalized title starts with prefix, most owned first.
+        """
+        normalized: str = normalize_title(prefix)
+        if not normalized or k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        start: int = bisect.bisect_left(self.sorted_titles, normalized)
+        end: int = bisect.bisect_left(self.sorted_titles, normalized + "\U0010ffff", lo=start)
+        rows: np.ndarray = self.sorted_rows[start:end]
+        owners: np.ndarray = np.asarray(self.owners[rows])
+        if len(rows) > k:
+            top: np.ndarray = np.argpartition(-owners, k - 1)[:k]
+            rows, owners = rows[top], owners[top]
+        return rows[np.argsort(-owners, kind="stable")]
+
+    def suggest(self, query: str, k: int, min_similarity: float = 0.6) -> List[int]:
+        """
+            Title lookup for search boxes: the exact title, then prefix matches by owners,
+            then trigram matches for typos.
+        """
+        rows: List[int] = []
+        exact: Optional[int] = self.exact.get(normalize_title(query))
+        if exact is not None:
+            rows.append(exact)
+        for idx in self.complete(query, k):
+            if len(rows) < k and int(idx) not in rows:
+                rows.append(int(idx))
+        if len(rows) < k:
+            ids, similarity = self.search(query, k)
+            for idx in ids[similarity >= min_similarity]:
+                if len(rows) < k and int(idx) not in rows:
+                    rows.append(int(idx))
+        return rows
+
+    def resolve(self, title: str, min_similarity: float = 0.6) -> Optional[Tuple[int, float]]:
+        exact: Optional[int] = self.exact.get(normalize_title(title))
+        if exact is not None:
+            return exact, 1.0
+
+        ids, similarity = self.search(title, k=1)
+        if len(ids) == 0 or similarity[0] < min_similarity:
+            return None
+        return int(ids[0]), float(similarity[0])
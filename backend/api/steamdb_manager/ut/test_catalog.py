@@ -0,0 +1,24 @@
+from api.steamdb_manager.catalog import GameCatalog, GameCatalogWriter
+
+
+def test_catalog_round_trip(tmp_path):
+    games = [
+        {"sid": 1, "name": "Hollow Knight", "description": "<p>Метроидвания</p>", "tags": "Metroidvania,Souls-like",
+         "genres": "Action,Indie", "stsp_owners": 5000000, "full_price": 1499},
+        {"sid": 2, "name": "Portal", "description": None, "stsp_owners": None, "full_price": ""},
+    ]
+
+    writer = GameCatalogWriter(str(tmp_path / "catalog"), source={"path": "steamdb.json"})
+    for game in games:
+        writer.add(game)
+    writer.close()
+
+    catalog = GameCatalog(str(tmp_path / "catalog"))
+    assert len(catalog) == 2
+    assert catalog.get(0, "description") == "<p>Метроидвания</p>"
+    assert catalog.get(0, "stsp_owners") == 5000000
+    assert catalog[1] == {
+        "name": "Portal", "description": "", "tags": "", "genres": "",
+        "sid": 2, "stsp_owners": None, "full_price": None,
+    }
+    assert GameCatalog.read_manifest(str(tmp_path / "catalog"))["source"] == {"path": "steamdb.json"}
@@ -0,0 +1,21 @@
+import logging
+from types import SimpleNamespace
+
+import numpy as np
+
+from api.steamdb_manager.steamdb_manager import SteamDBManager
+
+
+class _Ollama:
+    def embed(self, model, input):
+        return {"embeddings": [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0]][:len(input)]}
+
+
+def test_embed_batch_normalizes_rows_and_keeps_zero_vectors_finite():
+    manager = SimpleNamespace(
+        EMBEDDING_MODEL="model", ollama_client=_Ollama(), embed_max_retries=1, logger=logging.getLogger("test")
+    )
+    embeddings = SteamDBManager._embed_batch(manager, ["", "Celeste"])
+
+    assert np.isfinite(embeddings).all()
+    np.testing.assert_allclose(embeddings, [[0.0, 0.0, 0.0], [0.6, 0.8, 0.0]])
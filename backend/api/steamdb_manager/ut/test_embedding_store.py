@@ -0,0 +1,69 @@
+import logging
+
+import numpy as np
+
+from api.steamdb_manager.embedding_store import EmbeddingStore
+
+logger = logging.getLogger("test")
+
+
+def _vectors(rows, seed=0):
+    return np.random.default_rng(seed).standard_normal((rows, 4)).astype(np.float32)
+
+
+def _keys(texts):
+    return [EmbeddingStore.make_key(text, "model") for text in texts]
+
+
+def test_store_resumes_from_checkpoints_and_dedupes(tmp_path):
+    keys = _keys(["a", "b", "c"])
+    vectors = _vectors(3)
+    store = EmbeddingStore(str(tmp_path), logger, checkpoint_rows=2)
+    store.append(keys[:2], vectors[:2])
+    store.append(keys, vectors)
+    assert len(list(tmp_path.glob("chunk_*.npz"))) == 1
+
+    # c is still buffered: a crash before flush() only loses the rows after the last checkpoint
+    resumed = EmbeddingStore(str(tmp_path), logger, checkpoint_rows=2)
+    assert len(resumed) == 2 and keys[2] not in resumed
+    resumed.append(keys, vectors)
+    resumed.flush()
+
+    reloaded = EmbeddingStore(str(tmp_path), logger)
+    assert len(reloaded) == 3
+    np.testing.assert_array_equal(reloaded.get(keys[2]), vectors[2])
+    assert EmbeddingStore.make_key("a", "model") != EmbeddingStore.make_key("a", "other-model")
+
+
+def test_unreadable_chunks_are_skipped(tmp_path):
+    keys = _keys(["a", "b"])
+    store = EmbeddingStore(str(tmp_path), logger)
+    store.append(keys, _vectors(2))
+    store.flush()
+    (tmp_path / "chunk_000007.npz").write_bytes(b"truncated")
+    (tmp_path / "chunk_000008.tmp.npz").write_bytes(b"partial write")
+
+    reloaded = EmbeddingStore(str(tmp_path), logger)
+    assert len(reloaded) == 2
+    assert not (tmp_path / "chunk_000008.tmp.npz").exists()
+
+    reloaded.append(_keys(["c"]), _vectors(1))
+    reloaded.flush()
+    assert (tmp_path / "chunk_000008.npz").exists()
+
+
+def test_compact_drops_stale_rows(tmp_path):
+    keys = _keys(["a", "b", "c", "d"])
+    vectors = _vectors(4)
+    store = EmbeddingStore(str(tmp_path), logger, checkpoint_rows=2)
+    store.append(keys, vectors)
+
+    assert store.compact(keys) == 0
+    assert store.compact(keys[:3], min_stale_ratio=0.5) == 0
+    assert store.compact(keys[1:3]) == 2
+    assert len(list(tmp_path.glob("chunk_*.npz"))) == 1
+
+    reloaded = EmbeddingStore(str(tmp_path), logger)
+    assert len(reloaded) == 2 and keys[0] not in reloaded
+    np.testing.assert_array_equal(reloaded.get(keys[1]), vectors[1])
+    np.testing.assert_array_equal(reloaded.get(keys[2]), vectors[2])
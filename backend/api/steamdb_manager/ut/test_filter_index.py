@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from api.steamdb_manager.catalog import GameCatalogWriter
+from api.steamdb_manager.filter_index import GameFilterIndex
+
+
+def _allowed(filter_index, bitmap):
+    return list(np.flatnonzero(np.unpackbits(bitmap, count=filter_index.rows, bitorder="little")))
+
+
+def test_filter_index_bitmaps(tmp_path):
+    games = [
+        {"name": "A", "tags": "Souls-like,Co-op", "genres": "RPG,Action", "stsp_owners": 5000000, "full_price": 1999},
+        {"name": "B", "tags": "Co-op", "genres": "Strategy", "stsp_owners": 50000, "full_price": 999},
+        {"name": "C", "tags": "Souls-like", "genres": "RPG", "stsp_owners": None, "full_price": 5999},
+    ]
+    writer = GameCatalogWriter(str(tmp_path / "catalog"), source={})
+    for game in games:
+        writer.add(game)
+    filter_index = GameFilterIndex(writer.close())
+
+    assert filter_index.build_bitmap({}) is None
+    assert _allowed(filter_index, filter_index.build_bitmap({"genres": ["rpg"]})) == [0, 2]
+    assert _allowed(filter_index, filter_index.build_bitmap({"genres": ["RPG"], "tags": "co-op"})) == [0]
+    assert _allowed(filter_index, filter_index.build_bitmap({"min_owners": 10000, "max_price": 1999})) == [0, 1]
+    assert filter_index.count(filter_index.build_bitmap({"tags": ["Horror"]})) == 0
+
+    with pytest.raises(ValueError):
+        filter_index.build_bitmap({"platform": "linux"})
+    with pytest.raises(ValueError):
+        filter_index.build_bitmap({"max_price": "cheap"})
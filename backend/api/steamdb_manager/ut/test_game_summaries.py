@@ -0,0 +1,36 @@
+from api.steamdb_manager.game_summaries import GameSummaries, estimate_tokens, fit_token_budget, summarize_game
+
+
+def test_summarize_game_is_compact():
+    game = {
+        "name": " Hollow Knight ",
+        "description": "<p>Forge your own path in an epic action adventure through a vast ruined kingdom.</p>" * 20,
+        "tags": "Metroidvania,Souls-like,metroidvania",
+    }
+    summary = summarize_game(game, desc_chars=60, max_tags=5)
+
+    assert summary["name"] == "Hollow Knight"
+    assert summary["tags"][:2] == ["Metroidvania", "Souls-like"]
+    assert len(summary["tags"]) <= 5
+    assert len(summary["description"]) <= 61
+    assert summary["description"].endswith("…")
+    assert "<p>" not in summary["description"]
+
+
+def test_fit_token_budget_keeps_ranked_prefix():
+    items = [{"name": f"Game {i}", "description": "x" * 40} for i in range(10)]
+    fitted = fit_token_budget(items, token_budget=60)
+
+    assert fitted == items[:len(fitted)]
+    assert 0 < len(fitted) < len(items)
+    assert estimate_tokens(fitted) <= 60
+    assert fit_token_budget(items, token_budget=0) == items
+
+
+def test_game_summaries_round_trip(tmp_path):
+    summaries = [{"name": "Портал", "tags": ["Puzzle"], "description": ""}, {"name": "", "tags": [], "description": ""}]
+    store = GameSummaries.write(str(tmp_path / "summaries"), iter(summaries), {"fingerprint": "abc"})
+
+    assert len(store) == 2
+    assert store.get(0) == summaries[0]
+    assert GameSummaries(str(tmp_path / "summaries")).meta["fingerprint"] == "abc"
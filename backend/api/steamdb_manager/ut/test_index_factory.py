@@ -0,0 +1,52 @@
+import logging
+
+import faiss
+import numpy as np
+import pytest
+
+from api.steamdb_manager.index_factory import IndexOptions, build_index, evaluate_recall
+
+
+def _embeddings(rows=1000, dimension=16):
+    embeddings = np.random.default_rng(0).standard_normal((rows, dimension)).astype(np.float32)
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+
+def test_flat_index_has_full_recall():
+    embeddings = _embeddings()
+    index = build_index(embeddings, IndexOptions("flat"), logging.getLogger("test"))
+
+    report = evaluate_recall(index, embeddings, k=10, n_queries=50)
+    assert report["recall"] == 1.0
+
+
+def test_approximate_indexes():
+    embeddings = _embeddings()
+    options = {
+        "hnsw": IndexOptions("hnsw", hnsw_m=16, ef_search=64),
+        "ivf_flat": IndexOptions("ivf_flat", nlist=8, nprobe=8),
+        "float16": IndexOptions("flat", storage="float16"),
+        "int8": IndexOptions("hnsw", hnsw_m=16, ef_search=64, storage="int8"),
+    }
+
+    for index_options in options.values():
+        index = build_index(embeddings, index_options, logging.getLogger("test"))
+        report = evaluate_recall(index, embeddings, k=10, n_queries=50)
+
+        assert index.ntotal == len(embeddings)
+        assert report["recall"] > 0.9
+
+
+def test_factory_strings():
+    assert IndexOptions("flat").factory_string(1000) == "Flat"
+    assert IndexOptions("hnsw", hnsw_m=16).factory_string(1000) == "HNSW16"
+    assert IndexOptions("ivf_flat").factory_string(40000) == "IVF800,Flat"
+    assert IndexOptions("ivf_pq", nlist=256, pq_m=32).factory_string(40000) == "IVF256,PQ32"
+    assert IndexOptions("flat", storage="int8").factory_string(1000) == "SQ8"
+    assert IndexOptions("hnsw", storage="float16").factory_string(1000) == "HNSW32_SQfp16"
+
+
+def test_unknown_index_type():
+    with pytest.raises(ValueError):
+        IndexOptions("annoy")
@@ -0,0 +1,38 @@
+import numpy as np
+
+from api.steamdb_manager.catalog import GameCatalogWriter
+from api.steamdb_manager.lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+
+def _catalog(tmp_path):
+    games = [
+        {"name": "Hollow Knight", "description": "<p>Explore a vast ruined kingdom of insects</p>", "tags": "Metroidvania"},
+        {"name": "Knight Quest", "description": "A knight, a quest and a dragon", "tags": "RPG"},
+        {"name": "Stardew Valley", "description": "Farming &amp; friendship in a quiet valley", "tags": "Farming Sim"},
+    ]
+    writer = GameCatalogWriter(str(tmp_path / "catalog"), source={})
+    for game in games:
+        writer.add(game)
+    return writer.close()
+
+
+def test_lexical_index_ranks_title_match_first(tmp_path):
+    index = LexicalIndex.build(_catalog(tmp_path), max_df_ratio=1.0)
+    index.save(str(tmp_path / "lexical"))
+    loaded = LexicalIndex.load(str(tmp_path / "lexical"))
+
+    for lexical_index in (index, loaded):
+        ids, scores = lexical_index.search("games like Hollow Knight", k=10)
+        assert list(ids[:2]) == [0, 1]
+        assert scores[0] > scores[1]
+        assert list(lexical_index.search("farming", k=10)[0]) == [2]
+        assert len(lexical_index.search("unknown words", k=10)[0]) == 0
+
+    bitmap = np.packbits(np.array([False, True, True]), bitorder="little")
+    assert list(loaded.search("hollow knight", k=10, bitmap=bitmap)[0]) == [1]
+
+
+def test_reciprocal_rank_fusion():
+    fused, scores = reciprocal_rank_fusion([np.array([3, 1, 2, -1]), np.array([1, 4])], k=3, rrf_k=60)
+    assert list(fused) == [1, 3, 4]
+    assert scores[0] == np.float32(1 / 62 + 1 / 61)
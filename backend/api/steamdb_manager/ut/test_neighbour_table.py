@@ -0,0 +1,53 @@
+import faiss
+import numpy as np
+
+from api.steamdb_manager.neighbour_table import NeighbourTable
+
+
+def _table(vectors, sids, n=3, previous=None):
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    return NeighbourTable.build(
+        NeighbourTable.row_keys(sids, vectors),
+        lambda ids: vectors[ids],
+        index.search,
+        n=n,
+        batch_size=4,
+        previous=previous,
+        full_rebuild_ratio=1.0,
+    )
+
+
+def _vectors(rows, seed):
+    vectors = np.random.default_rng(seed).normal(size=(rows, 8)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def test_neighbour_table_excludes_self_and_round_trips(tmp_path):
+    vectors = _vectors(10, seed=0)
+    table = _table(vectors, sids=range(10))
+    table.save(str(tmp_path / "neighbours"))
+    loaded = NeighbourTable.load(str(tmp_path / "neighbours"))
+
+    scores = vectors @ vectors.T
+    np.fill_diagonal(scores, -np.inf)
+    for idx in range(10):
+        ids, row_scores = loaded.neighbours(idx)
+        assert list(ids) == list(np.argsort(-scores[idx])[:3])
+        assert np.allclose(row_scores, scores[idx][ids], atol=1e-2)
+    assert loaded.ids.dtype == np.int32 and loaded.scores.dtype == np.float16
+
+
+def test_incremental_rebuild_matches_full_build():
+    vectors = _vectors(20, seed=1)
+    previous = _table(vectors[:16], sids=range(16))
+
+    # game 3 is removed, game 7 changes and games 16..19 are added
+    changed = vectors.copy()
+    changed[7] = _vectors(1, seed=2)[0]
+    rows = [row for row in range(20) if row != 3]
+    incremental = _table(changed[rows], sids=rows, previous=previous)
+    full = _table(changed[rows], sids=rows)
+
+    assert np.array_equal(incremental.ids, full.ids)
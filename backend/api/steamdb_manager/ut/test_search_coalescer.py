@@ -0,0 +1,51 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from api.metrics import SEARCH_COALESCE_WAIT_SECONDS
+from api.steamdb_manager.search_coalescer import SearchCoalescer
+
+
+def test_concurrent_searches_are_batched():
+    batch_sizes = []
+
+    def search_batch(queries, k):
+        batch_sizes.append(len(queries))
+        time.sleep(0.01)
+        return [[{"name": f"{query}-{i}"} for i in range(k)] for query in queries]
+
+    waits_before = SEARCH_COALESCE_WAIT_SECONDS.count()
+    coalescer = SearchCoalescer(search_batch, max_batch_size=8, max_wait_ms=20, logger=logging.getLogger("test"))
+    results = {}
+
+    def worker(n):
+        results[n] = coalescer.search(f"q{n}", k=1 + n % 3)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    coalescer.close()
+
+    for n in range(20):
+        assert results[n] == [{"name": f"q{n}-{i}"} for i in range(1 + n % 3)]
+    assert sum(batch_sizes) == 20
+    assert max(batch_sizes) <= 8
+    assert len(batch_sizes) < 20
+    assert coalescer.stats()["requests"] == 20
+    assert SEARCH_COALESCE_WAIT_SECONDS.count() - waits_before == 20
+
+
+def test_errors_are_propagated():
+    def search_batch(queries, k):
+        raise RuntimeError("ollama is down")
+
+    coalescer = SearchCoalescer(search_batch, max_batch_size=4, max_wait_ms=1, logger=logging.getLogger("test"))
+    try:
+        with pytest.raises(RuntimeError, match="ollama is down"):
+            coalescer.search("q", k=5)
+    finally:
+        coalescer.close()
@@ -0,0 +1,51 @@
+import logging
+
+import faiss
+import numpy as np
+import pytest
+
+from api.steamdb_manager.lexical_index import reciprocal_rank_fusion
+from api.steamdb_manager.steamdb_manager import SteamDBManager
+
+VECTORS = np.array([[1.0, 0.0, 0.0], [0.6, 0.8, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+QUERY = np.array([[0.8, 0.6, 0.0]], dtype=np.float32)
+
+
+class _Summaries:
+    def get(self, idx):
+        return {"name": f"game {idx}"}
+
+
+class _LexicalIndex:
+    def search(self, query, k, bitmap=None):
+        return np.array([2], dtype=np.int64), np.array([1.0], dtype=np.float32)
+
+
+def _manager(lexical_index):
+    # skips loading the catalog, only the search path is under test
+    manager = SteamDBManager.__new__(SteamDBManager)
+    manager.logger = logging.getLogger("test")
+    manager.index = faiss.IndexFlatIP(VECTORS.shape[1])
+    manager.index.add(VECTORS)
+    manager.embeddings = VECTORS
+    manager.summaries = _Summaries()
+    manager.lexical_index = lexical_index
+    manager.hybrid_candidates = 2
+    manager.rrf_k = 60
+    return manager
+
+
+def test_vector_search_reports_cosine_similarity():
+    games = _manager(None)._search_embeddings(["query"], QUERY, 2, None)[0]
+    assert games == [{"name": "game 1", "similarity": 0.96}, {"name": "game 0", "similarity": 0.8}]
+
+
+def test_hybrid_search_reports_cosine_similarity_and_rank_score():
+    games = _manager(_LexicalIndex())._search_embeddings(["query"], QUERY, 2, None)[0]
+    ids, rank_scores = reciprocal_rank_fusion([np.array([1, 0]), np.array([2])], k=2, rrf_k=60)
+
+    assert [game["name"] for game in games] == [f"game {idx}" for idx in ids] == ["game 1", "game 2"]
+    similarities = {game["name"]: game["similarity"] for game in games}
+    # game 2 was found only by the lexical index, its similarity comes from the stored vector
+    assert similarities == {"game 1": 0.96, "game 2": 0.0}
+    assert [game["rank_score"] for game in games] == pytest.approx([round(float(s), 4) for s in rank_scores])
@@ -0,0 +1,85 @@
+import logging
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+
+from api.steamdb_manager.catalog import GameCatalogWriter
+from api.steamdb_manager.steamdb_manager import SteamDBManager
+from api.steamdb_manager.store_search import SteamStoreSearch
+from api.steamdb_manager.title_index import TitleIndex
+
+logger = logging.getLogger("test")
+
+
+def _response(names):
+    response = mock.Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {"items": [{"name": name} for name in names]}
+    return response
+
+
+def _store_search():
+    return SteamStoreSearch(logger, timeout=0.5, cache_size=10, cache_ttl=60)
+
+
+def test_answers_are_cached_and_requests_have_a_timeout():
+    store_search = _store_search()
+    with mock.patch.object(requests.Session, "get", return_value=_response(["Factorio", "Factorio: Space Age"])) as get:
+        assert store_search.search("Factorio", limit=1) == ["Factorio"]
+        assert store_search.search("  factorio ", limit=5) == ["Factorio", "Factorio: Space Age"]
+        assert get.call_count == 1
+        assert get.call_args.kwargs["timeout"] == 0.5
+        assert get.call_args.kwargs["params"]["term"] == "Factorio"
+
+    with mock.patch.object(requests.Session, "get", return_value=_response([])) as get:
+        assert store_search.search("Unknown Game") == []
+        assert store_search.search("unknown game") == []
+        assert get.call_count == 1
+
+
+def test_failures_are_not_cached():
+    store_search = _store_search()
+    failures = [requests.Timeout("slow store"), requests.ConnectionError("offline"), _response(["Factorio"])]
+    with mock.patch.object(requests.Session, "get", side_effect=failures) as get:
+        assert store_search.search("Factorio") == []
+        assert store_search.search("Factorio") == []
+        assert store_search.search("Factorio") == ["Factorio"]
+        assert get.call_count == 3
+
+    bad_status = _response([])
+    bad_status.raise_for_status.side_effect = requests.HTTPError("503")
+    with mock.patch.object(requests.Session, "get", return_value=bad_status):
+        assert store_search.search("Celeste") == []
+        assert store_search.cache.get("celeste") is None
+
+
+def _manager(tmp_path, store_search):
+    writer = GameCatalogWriter(str(tmp_path / "catalog"), source={})
+    for name, owners in (("Hollow Knight", 5000000), ("Hollow Knight: Silksong", 1000000), ("Celeste", 2000000)):
+        writer.add({"name": name, "stsp_owners": owners})
+    catalog = writer.close()
+    # search_titles only needs the title index, the catalog and the optional store fallback
+    return SimpleNamespace(
+        title_index=TitleIndex.build(catalog),
+        title_min_similarity=0.6,
+        data=catalog,
+        store_search=store_search,
+        logger=logger,
+    )
+
+
+def test_search_titles_uses_the_store_only_as_a_fallback(tmp_path):
+    manager = _manager(tmp_path, _store_search())
+    with mock.patch.object(requests.Session, "get", return_value=_response(["Factorio"])) as get:
+        assert SteamDBManager.search_titles(manager, "Hollow Knight")[0] == "Hollow Knight"
+        assert get.call_count == 0
+        assert SteamDBManager.search_titles(manager, "Factorio") == ["Factorio"]
+        assert get.call_count == 1
+
+
+def test_search_titles_without_fallback_stays_local(tmp_path):
+    manager = _manager(tmp_path, None)
+    with mock.patch.object(requests.Session, "get") as get:
+        assert SteamDBManager.search_titles(manager, "Factorio") == []
+        get.assert_not_called()
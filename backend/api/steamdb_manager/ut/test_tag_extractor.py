@@ -0,0 +1,27 @@
+import re
+
+from api.steamdb_manager.description_cleaner import DESCRIPTION_TAGS
+from api.steamdb_manager.tag_extractor import TagExtractor
+
+
+def test_tag_extractor_matches_per_pattern_search():
+    descriptions = [
+        "An action RPG and role-playing souls-like with co-op boss fights and crafting.",
+        "Open world survival sandbox: explore dungeons, join guilds and clans, build your base.",
+        "Relaxing puzzle game. No combat, no bosses.",
+        "",
+    ]
+    extractor = TagExtractor(DESCRIPTION_TAGS)
+
+    for description in descriptions:
+        expected = {
+            tag for pattern, tag in DESCRIPTION_TAGS.items()
+            if re.search(pattern, description, flags=re.IGNORECASE)
+        }
+        assert set(extractor.extract(description)) == expected
+
+
+def test_tag_extractor_overlapping_patterns_and_order():
+    extractor = TagExtractor({r"\baction\b": "Action", r"\baction rpg\b": "Action RPG", r"\brpg\b": "RPG"})
+
+    assert extractor.extract("RPG. Action RPG!") == ["Action", "Action RPG", "RPG"]
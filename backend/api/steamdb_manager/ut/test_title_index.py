@@ -0,0 +1,47 @@
+from api.steamdb_manager.catalog import GameCatalogWriter
+from api.steamdb_manager.title_index import TitleIndex, normalize_title
+
+
+def _catalog(tmp_path):
+    games = [
+        {"name": "Hollow Knight", "stsp_owners": 5000000},
+        {"name": "Hollow Knight", "stsp_owners": 100},
+        {"name": "Stardew Valley™", "stsp_owners": 20000000},
+        {"name": "Hollow Knight: Silksong", "stsp_owners": 1000000},
+        {"name": "", "stsp_owners": 10},
+    ]
+    writer = GameCatalogWriter(str(tmp_path / "catalog"), source={})
+    for game in games:
+        writer.add(game)
+    return writer.close()
+
+
+def test_normalize_title():
+    assert normalize_title("  STARDEW   Valley™ ") == "stardew valley"
+    assert normalize_title("Hollow Knight: Silksong") == "hollow knight silksong"
+
+
+def test_title_index_exact_and_fuzzy_resolution(tmp_path):
+    index = TitleIndex.build(_catalog(tmp_path))
+    index.save(str(tmp_path / "titles"))
+    loaded = TitleIndex.load(str(tmp_path / "titles"))
+
+    for title_index in (index, loaded):
+        assert title_index.resolve("hollow knight") == (0, 1.0)
+        assert title_index.resolve("Stardew Valley") == (2, 1.0)
+
+        idx, similarity = title_index.resolve("Holow Knigt Silksong")
+        assert idx == 3
+        assert 0.6 <= similarity < 1.0
+        assert title_index.resolve("Factorio") is None
+        assert title_index.resolve("") is None
+
+
+def test_title_index_suggest_ranks_prefix_matches_by_owners(tmp_path):
+    index = TitleIndex.build(_catalog(tmp_path))
+
+    assert list(index.complete("hollow", k=5)) == [0, 3, 1]
+    assert list(index.complete("Hollow Knight: S", k=5)) == [3]
+    assert index.suggest("hollow knight", k=2) == [0, 3]
+    assert index.suggest("stardew vally", k=5) == [2]
+    assert index.suggest("Factorio", k=5) == []
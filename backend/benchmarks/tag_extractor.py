@@ -0,0 +1,68 @@
+import argparse
+import itertools
+import re
+import time
+from typing import Callable, Dict, List
+
+from api.steamdb_manager.description_cleaner import DESCRIPTION_TAGS, strip_html
+from api.steamdb_manager.ingestion import GameFilter, iter_steamdb_games
+from api.steamdb_manager.tag_extractor import TagExtractor
+
+
+def extract_tags_per_pattern(description: str) -> List[str]:
+    found_tags: set[str] = set()
+
+    for pattern, tag in DESCRIPTION_TAGS.items():
+        if re.search(pattern, description, flags=re.IGNORECASE):
+            found_tags.add(tag)
+
+    return list(found_tags)
+
+
+def load_descriptions(steamdb_path: str, sample: int) -> List[str]:
+    game_filter = GameFilter()
+    games = (game for game in iter_steamdb_games(steamdb_path, ("description", "stsp_owners")) if game_filter.accepts(game))
+
+    descriptions: List[str] = []
+    for game in itertools.islice(games, sample):
+        descriptions.append(strip_html(game["description"]))
+    return descriptions
+
+
+def measure(extract: Callable[[str], List[str]], descriptions: List[str], repeat: int) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        started_at: float = time.perf_counter()
+        for description in descriptions:
+            extract(description)
+        best = min(best, time.perf_counter() - started_at)
+    return best / len(descriptions) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare per-description cost of tag extraction")
+    parser.add_argument("--steamdb", "-s", type=str, default="./data/steamdb.json", help="Path to steamdb.json")
+    parser.add_argument("--sample", "-n", type=int, default=2000, help="Number of catalog descriptions to use")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Timing repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    descriptions: List[str] = load_descriptions(args.steamdb, args.sample)
+    extractor = TagExtractor(DESCRIPTION_TAGS)
+
+    mismatches: int = sum(
+        set(extract_tags_per_pattern(description)) != set(extractor.extract(description))
+        for description in descriptions
+    )
+    timings: Dict[str, float] = {
+        "per-pattern re.search": measure(extract_tags_per_pattern, descriptions, args.repeat),
+        "single-pass TagExtractor": measure(extractor.extract, descriptions, args.repeat),
+    }
+
+    average_length: float = sum(map(len, descriptions)) / max(len(descriptions), 1)
+    print(f"{len(descriptions)} descriptions, {average_length:.0f} chars on average, {mismatches} mismatches")
+    for name, microseconds in timings.items():
+        print(f"{name:<28} {microseconds:10.1f} us/description")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import argparse
+
+from api.config import ServerConfig
+from api.steamdb_manager import SteamDBManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute the top NEIGHBOURS_N similar games of every catalog game")
+    parser.add_argument(
+        "--env-file",
+        "-e",
+        type=str,
+        help="Path to .env server configuration file"
+    )
+    args = parser.parse_args()
+
+    config: ServerConfig = ServerConfig(env_file=args.env_file) if args.env_file else ServerConfig()
+    logger = config.logger_config.get_logger("build_neighbours")
+    if config.NEIGHBOURS_N <= 0:
+        logger.error("NEIGHBOURS_N is not positive, nothing to build")
+        return
+
+    # the manager builds or refreshes the catalog, embeddings and index first
+    steamdb_manager = SteamDBManager(config)
+    steamdb_manager.build_neighbour_table()
+
+
+if __name__ == "__main__":
+    main()
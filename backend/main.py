@@ -25,7 +25,11 @@ def main() -> NoReturn:
     while True:
         try:
             logger.info(f"Initializing server (attempt {RESTART_COUNTER}) with {args.env_file or 'default'} environment")
-            server: Server = Server(config)
+            if config.SERVER_MODE == "async":
+                from api.kernel.async_server import AsyncServer
+                server = AsyncServer(config)
+            else:
+                server = Server(config)
             RESTART_COUNTER += 1
             server.run()
 
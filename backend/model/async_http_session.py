@@ -0,0 +1,110 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from api.config import ServerConfig
+from model.http_session import RETRY_STATUSES
+
+
+class AsyncLLMHttpClient:
+    """
+        asyncio counterpart of LLMHttpClient: one keep-alive aiohttp connection pool shared by
+        all in-flight requests of the event loop, with the same timeouts and retry policy.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        pool_size: int,
+    ) -> None:
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries: int = max(0, max_retries)
+        self.retry_backoff: float = retry_backoff
+        self.pool_size: int = max(0, pool_size)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, server_config: ServerConfig) -> "AsyncLLMHttpClient":
+        return cls(
+            connect_timeout=server_config.LLM_CONNECT_TIMEOUT,
+            read_timeout=server_config.LLM_READ_TIMEOUT,
+            max_retries=server_config.LLM_MAX_RETRIES,
+            retry_backoff=server_config.LLM_RETRY_BACKOFF,
+            # 0 means no limit on simultaneous upstream connections
+            pool_size=server_config.LLM_POOL_SIZE,
+        )
+
+    def _client_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_start.append(self._on_connect_start)
+            trace_config.on_connection_create_end.append(self._on_connect_end)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=self.timeout,
+                trace_configs=[trace_config],
+            )
+        return self._session
+
+    @staticmethod
+    async def _on_connect_start(session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+        context.connect_started_at = time.perf_counter()
+
+    @staticmethod
+    async def _on_connect_end(session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+        timings: Dict[str, float] = context.trace_request_ctx
+        timings["connect_ms"] += (time.perf_counter() - context.connect_started_at) * 1000
+        timings["new_connections"] += 1
+
+    def _retry_delay(self, attempt: int, response: aiohttp.ClientResponse) -> float:
+        retry_after: Optional[str] = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return self.retry_backoff * 2 ** (attempt - 1)
+
+    async def open_stream(self, url: str, **kwargs: Any) -> Tuple[aiohttp.ClientResponse, Dict[str, float]]:
+        timings: Dict[str, float] = {"connect_ms": 0.0, "new_connections": 0}
+        started_at: float = time.perf_counter()
+
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                response: aiohttp.ClientResponse = await self._client_session().post(
+                    url, trace_request_ctx=timings, **kwargs
+                )
+            except aiohttp.SocketTimeoutError:
+                # a read timeout means the model is still generating, resending the prompt would only pile up work
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt > self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                continue
+
+            if response.status not in RETRY_STATUSES or attempt > self.max_retries:
+                break
+            delay: float = self._retry_delay(attempt, response)
+            # an unread body would close the connection instead of returning it to the pool
+            await response.read()
+            response.release()
+            await asyncio.sleep(delay)
+
+        timings["ttfb_ms"] = (time.perf_counter() - started_at) * 1000
+        return response, timings
+
+    async def post(self, url: str, **kwargs: Any) -> Tuple[int, bytes, Dict[str, float]]:
+        started_at: float = time.perf_counter()
+        response, timings = await self.open_stream(url, **kwargs)
+        async with response:
+            body: bytes = await response.read()
+        timings["total_ms"] = (time.perf_counter() - started_at) * 1000
+        return response.status, body, timings
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
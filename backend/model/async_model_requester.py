@@ -0,0 +1,147 @@
+import json
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from api.config import ServerConfig
+from model.async_http_session import AsyncLLMHttpClient
+from model.model_requester import ModelRequester, ModelUpstreamError, RoundStep
+from model.streaming import AnswerTextExtractor, ToolCallAccumulator, iter_sse_chunks
+from tools import ToolsDispatcher
+
+
+class AsyncModelRequester(ModelRequester):
+    """
+        ModelRequester for the asyncio server: LLM rounds await the shared aiohttp pool and
+        blocking tools run on tools_executor, so a request holds no thread while waiting.
+    """
+
+    def __init__(
+        self,
+        tools_dispatcher: ToolsDispatcher,
+        server_config: ServerConfig,
+        http_client: AsyncLLMHttpClient,
+        tools_executor: Optional[Executor] = None,
+    ):
+        super().__init__(tools_dispatcher, server_config)
+        self.async_http_client = http_client
+        self.tools_executor = tools_executor
+
+    async def get_model_answer_async(self):
+        started_at = time.perf_counter()
+        timings = None
+        outcome = "error"
+        try:
+            status, body, timings = await self.async_http_client.post(
+                self.URL,
+                headers=self._request_headers(),
+                data=self._request_body(),
+            )
+            self.logger.info(
+                f"Model responded {status}: connect {timings['connect_ms']:.1f} ms "
+                f"({timings['new_connections']} new connections), TTFB {timings['ttfb_ms']:.1f} ms, "
+                f"total {timings['total_ms']:.1f} ms"
+            )
+
+            if status != 200:
+                self.logger.error(f"Error API: {status} {body.decode('utf-8', errors='replace')}")
+                return {}
+            outcome = "ok"
+            response = json.loads(body)
+            self.logger.info(f'Got final answer{response["choices"][0]["message"]}')
+            return response
+        except aiohttp.SocketTimeoutError as e:
+            self.logger.error(f"Model request timed out: {e}")
+            return {}
+        except Exception as e:
+            self.logger.error(f"Error in get_model_answer_async: {e}")
+            return {}
+        finally:
+            self._record_llm_round(started_at, timings, outcome)
+
+    async def _call_tool_async(self, parsed) -> str:
+        self.tool_calls += 1
+        return self._format_tool_answer(
+            await self.tools_dispatcher.parse_and_call_async(parsed, self.tools_executor)
+        )
+
+    async def model_async(self, text: str):
+        try:
+            rounds = self.round_loop(text)
+            step = next(rounds)
+            while step.kind != RoundStep.ANSWER:
+                if step.kind == RoundStep.MODEL:
+                    step = rounds.send(self._response_message(await self.get_model_answer_async()))
+                else:
+                    step = rounds.send(await self._call_tool_async(step.parsed))
+            return step.text
+        finally:
+            self._record_request()
+
+    async def stream_model_answer_async(
+        self,
+        extractor: AnswerTextExtractor,
+        tool_calls: ToolCallAccumulator,
+    ) -> AsyncIterator[str]:
+        started_at = time.perf_counter()
+        timings = None
+        outcome = "error"
+        try:
+            response, timings = await self.async_http_client.open_stream(
+                self.URL,
+                headers=self._request_headers(stream=True),
+                data=self._request_body(stream=True),
+            )
+            async with response:
+                if response.status != 200:
+                    self.logger.error(f"Error API: {response.status} {await response.text()}")
+                    raise ModelUpstreamError(f"Model upstream responded {response.status}")
+
+                first_token_ms = 0.0
+                async for raw_line in response.content:
+                    for delta in iter_sse_chunks([raw_line.decode("utf-8").rstrip("\r\n")]):
+                        if delta.get("tool_calls"):
+                            tool_calls.feed(delta["tool_calls"])
+                        if not delta.get("content"):
+                            continue
+                        if not first_token_ms:
+                            first_token_ms = (time.perf_counter() - started_at) * 1000
+                        piece = extractor.feed(delta["content"])
+                        if piece:
+                            yield piece
+            outcome = "ok"
+        finally:
+            self._record_llm_round(started_at, timings, outcome)
+
+        self.logger.info(
+            f"Model stream finished: connect {timings['connect_ms']:.1f} ms "
+            f"({timings['new_connections']} new connections), TTFB {timings['ttfb_ms']:.1f} ms, "
+            f"first token {first_token_ms:.1f} ms, total {(time.perf_counter() - started_at) * 1000:.1f} ms"
+        )
+
+    async def model_stream_async(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        try:
+            rounds = self.round_loop(text)
+            step = next(rounds)
+            streamed = False
+            while step.kind != RoundStep.ANSWER:
+                if step.kind == RoundStep.MODEL:
+                    extractor = AnswerTextExtractor()
+                    tool_calls = ToolCallAccumulator()
+                    async for piece in self.stream_model_answer_async(extractor, tool_calls):
+                        yield {"event": "token", "data": {"text": piece}}
+                    streamed = extractor.streamed
+                    step = rounds.send(self._streamed_message(extractor, tool_calls))
+                else:
+                    yield step.tool_call_event()
+                    tool_answer = await self._call_tool_async(step.parsed)
+                    yield step.tool_result_event()
+                    step = rounds.send(tool_answer)
+            for event in step.answer_events(streamed):
+                yield event
+        except Exception as e:
+            yield self._stream_error_event(e)
+        finally:
+            self._record_request()
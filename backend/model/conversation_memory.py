@@ -0,0 +1,144 @@
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+CHARS_PER_TOKEN: float = 4.0
+COMPACTED_PREFIX: str = "[Earlier tool result, already used]"
+TRUNCATED_SUFFIX: str = "… [truncated to fit the token budget]"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _collect_names(payload: Any, names: List[str]) -> None:
+    if isinstance(payload, dict):
+        if isinstance(payload.get("name"), str):
+            names.append(payload["name"])
+            return
+        for value in payload.values():
+            _collect_names(value, names)
+    elif isinstance(payload, list):
+        for item in payload:
+            if isinstance(item, str):
+                names.append(item)
+            else:
+                _collect_names(item, names)
+
+
+def summarize_tool_output(content: str, max_chars: int = 600) -> str:
+    """
+        Compact stand-in for a tool result the model has already answered to: the game
+        names it listed (in rank order) instead of full summaries, or a shortened text.
+    """
+    try:
+        payload: Any = json.loads(content)
+    except ValueError:
+        payload = None
+
+    names: List[str] = []
+    _collect_names(payload, names)
+    summary: str = f"games: {', '.join(names)}" if names else content
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rstrip() + "…"
+    return f"{COMPACTED_PREFIX} {summary}"
+
+
+class ConversationMemory:
+    """
+        Messages of one /process request.
+
+        - a message equal to the previous one (or a repeated system prompt) is not stored twice;
+        - tool results are replaced by summarize_tool_output() once the model replied after them;
+        - render() keeps the request under token_budget by dropping the oldest exchanges between
+          the first user message and the latest round, then by truncating the longest message
+          of that round. Native tool results are never kept without the assistant message that
+          called them.
+    """
+
+    def __init__(self, token_budget: int, logger: logging.Logger, tail_messages: int = 2) -> None:
+        self.token_budget: int = token_budget
+        self.logger = logger
+        self.tail_messages: int = tail_messages
+        self.messages: List[Dict[str, Any]] = []
+        self._tool_results: List[int] = []
+        self.tokens_sent: int = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def add(self, role: str, content: str) -> bool:
+        return self.add_message({"role": role, "content": content})
+
+    def add_message(self, message: Dict[str, Any]) -> bool:
+        if message.get("content") is None:
+            message = {**message, "content": ""}
+        if self.messages and self.messages[-1] == message:
+            return False
+        if message["role"] == "system" and message in self.messages:
+            return False
+
+        if message["role"] == "assistant":
+            self._compact_consumed_tool_results()
+        self.messages.append(message)
+        return True
+
+    def add_tool_result(self, content: str, tool_call_id: Optional[str] = None) -> None:
+        # the prompt protocol has no tool role, its results are sent back as user messages
+        if tool_call_id is None:
+            added: bool = self.add("user", content)
+        else:
+            added = self.add_message({"role": "tool", "tool_call_id": tool_call_id, "content": content})
+        if added:
+            self._tool_results.append(len(self.messages) - 1)
+
+    def _compact_consumed_tool_results(self) -> None:
+        for position in self._tool_results:
+            message: Dict[str, Any] = self.messages[position]
+            if not message["content"].startswith(COMPACTED_PREFIX):
+                message["content"] = summarize_tool_output(message["content"])
+        self._tool_results = []
+
+    @staticmethod
+    def _message_tokens(message: Dict[str, Any]) -> int:
+        tokens: int = estimate_tokens(message["content"])
+        if message.get("tool_calls"):
+            tokens += estimate_tokens(json.dumps(message["tool_calls"], ensure_ascii=False))
+        return tokens
+
+    def tokens(self, messages: Optional[List[Dict[str, Any]]] = None) -> int:
+        return sum(self._message_tokens(message) for message in (self.messages if messages is None else messages))
+
+    def render(self) -> List[Dict[str, Any]]:
+        messages: List[Dict[str, Any]] = [dict(message) for message in self.messages]
+        tokens: int = self.tokens(messages)
+        if self.token_budget > 0 and tokens > self.token_budget:
+            messages = self._fit_budget(messages)
+            self.logger.warning(
+                f"Conversation of {tokens} tokens exceeds the budget of {self.token_budget}, "
+                f"sending {len(messages)} of {len(self.messages)} messages ({self.tokens(messages)} tokens)"
+            )
+        self.tokens_sent += self.tokens(messages)
+        return messages
+
+    def _fit_budget(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        first_user: int = next((i for i, message in enumerate(messages) if message["role"] == "user"), 0)
+        tail_start: int = max(first_user + 1, len(messages) - self.tail_messages)
+        # a tool message is only valid after the assistant message with its tool_calls
+        while tail_start > first_user + 1 and messages[tail_start]["role"] == "tool":
+            tail_start -= 1
+        while tail_start > first_user + 1 and self.tokens(messages) > self.token_budget:
+            del messages[first_user + 1]
+            tail_start -= 1
+            while tail_start > first_user + 1 and messages[first_user + 1]["role"] == "tool":
+                del messages[first_user + 1]
+                tail_start -= 1
+
+        overflow: int = self.tokens(messages) - self.token_budget
+        # the system prompt and the question are never cut, only the latest round can be
+        if overflow > 0 and len(messages) > first_user + 1:
+            longest: Dict[str, Any] = max(messages[first_user + 1:], key=lambda message: len(message["content"]))
+            keep_chars: int = max(0, len(longest["content"]) - math.ceil(overflow * CHARS_PER_TOKEN) - len(TRUNCATED_SUFFIX))
+            longest["content"] = longest["content"][:keep_chars] + TRUNCATED_SUFFIX
+        return messages
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from api.config import ServerConfig
+
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+# connections are opened by the thread that sends the request, so per-thread counters are enough
+_connect_timing = threading.local()
+
+
+def _record_connect(started_at: float) -> None:
+    _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + time.perf_counter() - started_at
+    _connect_timing.count = getattr(_connect_timing, "count", 0) + 1
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        started_at: float = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started_at)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        started_at: float = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started_at)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class LLMHttpClient:
+    """
+        Keep-alive connection pool for LLM API calls, shared by all request threads.
+
+        The pool lives in one HTTPAdapter mounted into a requests.Session per thread, so
+        connections are reused across requests without sharing Session state between threads.
+    """
+
+    _shared: Optional["LLMHttpClient"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        pool_size: int,
+    ) -> None:
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=max_retries,
+            # a read timeout means the model is still generating, resending the prompt would only pile up work
+            read=False,
+            backoff_factor=retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.adapter = _TimedHTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=retry)
+        self._sessions = threading.local()
+
+    @classmethod
+    def from_config(cls, server_config: ServerConfig) -> "LLMHttpClient":
+        return cls(
+            connect_timeout=server_config.LLM_CONNECT_TIMEOUT,
+            read_timeout=server_config.LLM_READ_TIMEOUT,
+            max_retries=server_config.LLM_MAX_RETRIES,
+            retry_backoff=server_config.LLM_RETRY_BACKOFF,
+            pool_size=server_config.LLM_POOL_SIZE or server_config.THREADS,
+        )
+
+    @classmethod
+    def shared(cls, server_config: ServerConfig) -> "LLMHttpClient":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_config(server_config)
+            return cls._shared
+
+    def _session(self) -> requests.Session:
+        session: Optional[requests.Session] = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._sessions.session = session
+        return session
+
+    def open_stream(self, url: str, **kwargs: Any) -> Tuple[requests.Response, Dict[str, float]]:
+        _connect_timing.seconds = 0.0
+        _connect_timing.count = 0
+
+        started_at: float = time.perf_counter()
+        response: requests.Response = self._session().post(url, timeout=self.timeout, stream=True, **kwargs)
+        timings: Dict[str, float] = {
+            "connect_ms": _connect_timing.seconds * 1000,
+            "new_connections": _connect_timing.count,
+            "ttfb_ms": (time.perf_counter() - started_at) * 1000,
+        }
+        return response, timings
+
+    def post(self, url: str, **kwargs: Any) -> Tuple[requests.Response, Dict[str, float]]:
+        started_at: float = time.perf_counter()
+        response, timings = self.open_stream(url, **kwargs)
+        # force the body read so total_ms covers the whole download, not only the headers
+        _ = response.content
+        timings["total_ms"] = (time.perf_counter() - started_at) * 1000
+        return response, timings
@@ -1,21 +1,99 @@
 import requests
+import hashlib
 import json
+import time
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
 from tools import ToolsDispatcher
 from api.config import ServerConfig
+from api.metrics import (
+    LLM_HTTP_SECONDS,
+    LLM_MALFORMED_OUTPUTS,
+    LLM_PROMPT_TOKENS,
+    LLM_ROUNDS_PER_REQUEST,
+    STAGE_SECONDS,
+    TOOL_CALLS_PER_REQUEST,
+    UPSTREAM_REQUESTS,
+)
+from model.conversation_memory import ConversationMemory
+from model.http_session import LLMHttpClient
+from model.streaming import AnswerTextExtractor, ToolCallAccumulator, iter_sse_chunks
+from model.tool_schemas import final_answer_format, native_tools, tool_call_or_answer_format
+
+# (tool_call_id, {"function": ..., "arguments": ...}); the id is None outside of the tools mode
+ToolCall = Tuple[Optional[str], Dict[str, Any]]
+
+
+class ModelLoopError(RuntimeError):
+    """
+        The model/tool loop could not produce an answer; the message is safe to show to clients.
+    """
+
+
+class ModelUpstreamError(ModelLoopError):
+    """
+        The model upstream failed to return an answer for consecutive rounds.
+    """
+
+
+class RoundStep:
+    """
+        What the model/tool loop needs next: a model round, a tool call or nothing (the final answer).
+    """
+
+    MODEL: str = "model"
+    TOOL: str = "tool"
+    ANSWER: str = "answer"
+
+    def __init__(
+        self,
+        kind: str,
+        round_number: int,
+        parsed: Optional[Dict[str, Any]] = None,
+        text: Optional[str] = None,
+    ) -> None:
+        self.kind: str = kind
+        self.round_number: int = round_number
+        self.parsed: Dict[str, Any] = parsed or {}
+        self.text: Optional[str] = text
+
+    def tool_call_event(self) -> Dict[str, Any]:
+        return {
+            "event": "tool_call",
+            "data": {"round": self.round_number, "function": self.parsed.get("function"), "arguments": self.parsed.get("arguments")},
+        }
+
+    def tool_result_event(self) -> Dict[str, Any]:
+        return {"event": "tool_result", "data": {"round": self.round_number, "function": self.parsed.get("function")}}
+
+    def answer_events(self, streamed: bool) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = [] if streamed else [{"event": "token", "data": {"text": self.text}}]
+        events.append({"event": "done", "data": {"text": self.text, "rounds": self.round_number}})
+        return events
+
+
 class ModelRequester:
+    LLM_MODES = ("prompt", "tools", "json_schema")
+
     def __init__(self, tools_dispatcher : ToolsDispatcher, server_config : ServerConfig):
         self.API_TOKEN = server_config.API_TOKEN
         self.URL = server_config.URL
         self.MODEL = server_config.MODEL
         self.logger = server_config.logger_config.get_logger("ModelRequester")
         self.tools_dispatcher = tools_dispatcher
-        self.memory = []
+        self.http_client = LLMHttpClient.shared(server_config)
+        self.memory = ConversationMemory(server_config.LLM_TOKEN_BUDGET, self.logger)
         self.tools_limit = 10
+        # the HTTP client already retried the call, so only a few failed rounds are retried on top of it
+        self.max_failed_rounds = 2
+        self.rounds = 0
+        self.tool_calls = 0
+        self.llm_mode = server_config.LLM_MODE
+        if self.llm_mode not in self.LLM_MODES:
+            raise ValueError(f"Unknown LLM_MODE {self.llm_mode!r}, expected one of {', '.join(self.LLM_MODES)}")
         self.model_prompt = (
             "You are an intelligent reasoning agent which must solve the following task with strict discipline.\n\n"
             "You have access to a set of tools (functions).\n"
-            "Each tool is described in JSON format below:\n"
-            f"{self.tools_dispatcher.tools_config}\n\n"
+            f"{self._prompt_tools()}\n\n"
             "GENERAL OUTPUT RULES:\n"
             "- You must ALWAYS respond with EXACTLY ONE valid JSON object.\n"
             "- The JSON must be returned as a plain text string.\n"
@@ -45,9 +123,12 @@ class ModelRequester:
             " - HOWEVER: DO NOT call any tool if you already judged the query to be OUT OF-SCOPE in step 'TASK SCOPE CHECK'.\n"
             " - When calling the tool you MUST use ONLY this exact JSON call format:\n"
             " {\"function\": \"steam_search_by_desc_tool\", \"arguments\": {\"desc\": \"<detailed description>\\n tags: <tag1>, <tag2>, ...\"}}\n"
+            " - If the user names a specific game and asks for games like it, call 'steam_similar_by_title_tool' with that game's name instead:\n"
+            " {\"function\": \"steam_similar_by_title_tool\", \"arguments\": {\"title\": \"<game name>\"}}\n"
+            " If it answers that the game was not found, call 'steam_search_by_desc_tool' with a description of that game.\n"
             " - ALL TEXT SENT TO TOOLS MUST BE IN ENGLISH.\n"
             "4. TOOL RESPONSE HANDLING (VALIDATION REQUIRED):\n"
-            " - When you receive tool results (a list of {\"name\":..., \"description\":...}), YOU MUST validate each candidate game against the generated tags and description before accepting it.\n"
+            " - When you receive tool results (a list of {\"name\":..., \"tags\": [...], \"description\":..., \"similarity\":...} ordered by relevance, where the description is shortened and similarity is the cosine similarity to the query, higher means a closer match), YOU MUST validate each candidate game against the generated tags and description before accepting it.\n"
             " - Validation rules for each candidate from tools:\n"
             " a) Relevance: the game's description must contain at least one of the user's key phrases or concepts, and at least TWO of your generated tags must apply to the game. If it fails this relevance check, REJECT this candidate.\n"
             " b) Popularity: the candidate must be a popular title. For the purposes of this task, consider a title 'popular' if it is available on a major digital store (e.g., Steam, Epic, GOG) or has clear coverage from recognized gaming press. If you cannot confirm 'popular' from the tool output and you are unsure, treat it as NOT popular and reject.\n"
@@ -69,9 +150,29 @@ class ModelRequester:
             "- ALL GAMES IN THE FINAL ANSWER MUST BE POPULAR, REAL, AND RELEVANT.\n"
             "- YOU MUST NEVER OUTPUT ANYTHING OTHER THAN THE SINGLE JSON OBJECT described in the \"FINAL OUTPUT FORMAT\".\n"
             "- Follow the step sequence strictly: scope check → description & tags → decide to call tool (or not) → validate tool results → select/generate exactly 5 games → output final JSON.\n\n"
+            f"{self._prompt_mode_rules()}"
             "End of prompt.\n"
         )
 
+    def _prompt_tools(self) -> str:
+        if self.llm_mode == "tools":
+            # the upstream receives the tool definitions in the request body
+            return "The tools are described in the request and are called through native tool calls."
+        return (
+            "Each tool is described in JSON format below:\n"
+            f"{json.dumps(self.tools_dispatcher.tools_config, ensure_ascii=False, separators=(',', ':'))}"
+        )
+
+    def _prompt_mode_rules(self) -> str:
+        if self.llm_mode != "tools":
+            return ""
+        return (
+            "NATIVE TOOL CALLING:\n"
+            "- The {\"function\": ..., \"arguments\": ...} formats above only name the tool and its arguments:\n"
+            " call tools ONLY through the native tool calling interface, NEVER write such objects in your reply.\n"
+            "- Only the final answer is written as a JSON object: {\"text\": ...}.\n\n"
+        )
+
     def parse_tools_from_response(self, response):
         try:
             self.logger.info(f"Start parsing {response}")
@@ -97,48 +198,279 @@ class ModelRequester:
         except Exception as e:
             self.logger.error(f"Exception {e} while parsing response")
             return {}
-    
+
+    def prompt_version(self) -> str:
+        """
+            Hash of everything besides the user text that shapes an answer, used to key cached answers.
+        """
+        tools: str = json.dumps(self.tools_dispatcher.tools_config, sort_keys=True)
+        return hashlib.sha256(
+            f"{self.model_prompt}\0{tools}\0{self.tools_limit}\0{self.llm_mode}".encode("utf-8")
+        ).hexdigest()[:16]
+
+    def _request_headers(self, stream: bool = False) -> Dict[str, str]:
+        headers = {
+            "Authorization": f"Bearer {self.API_TOKEN}",
+            "Content-Type": "application/json",
+        }
+        if stream:
+            headers["Accept"] = "text/event-stream"
+        return headers
+
+    def _request_body(self, stream: bool = False) -> str:
+        messages = self.memory.render()
+        tokens = self.memory.tokens(messages)
+        LLM_PROMPT_TOKENS.observe(tokens)
+        self.logger.info(
+            f"Round {self.rounds + 1}: sending {len(messages)} messages, ~{tokens} tokens "
+            f"({self.memory.tokens_sent} tokens sent for this request so far)"
+        )
+        body: Dict[str, Any] = {
+            "model": self.MODEL,
+            "messages": messages
+        }
+        if self.llm_mode == "tools":
+            body["tools"] = native_tools(self.tools_dispatcher.tools_config)
+            body["response_format"] = final_answer_format()
+        elif self.llm_mode == "json_schema":
+            body["response_format"] = tool_call_or_answer_format(self.tools_dispatcher.tools_config)
+        if stream:
+            body["stream"] = True
+        return json.dumps(body)
+
+    def _parse_round(self, message: Dict[str, Any]) -> Tuple[Optional[str], List[ToolCall]]:
+        """
+            Final answer text or tool calls of one model round. Native tool calls (tools mode) are
+            converted to the {"function": ..., "arguments": ...} dicts ToolsDispatcher expects.
+        """
+        if message.get("tool_calls"):
+            calls: List[ToolCall] = []
+            for tool_call in message["tool_calls"]:
+                function = tool_call.get("function") or {}
+                try:
+                    arguments = json.loads(function.get("arguments") or "{}")
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Exception {e} while parsing arguments of {function.get('name')}")
+                    arguments = {}
+                calls.append((tool_call.get("id"), {"function": function.get("name"), "arguments": arguments}))
+            return None, calls
+
+        parsed = self.parse_tools_from_response({"choices": [{"message": message}]})
+        if isinstance(parsed, dict) and "text" in parsed:
+            return parsed["text"], []
+        if not isinstance(parsed, dict) or "function" not in parsed:
+            LLM_MALFORMED_OUTPUTS.inc(mode=self.llm_mode)
+            parsed = parsed if isinstance(parsed, dict) else {}
+        # a malformed round still goes through the dispatcher, whose error tells the model to retry
+        return None, [(None, parsed)]
+
+    def _response_message(self, response: Any) -> Optional[Dict[str, Any]]:
+        """
+            Assistant message of a chat completion, None for a failed round (an empty or unexpected body).
+        """
+        try:
+            message = response["choices"][0]["message"]
+        except (KeyError, IndexError, TypeError):
+            message = None
+        if not isinstance(message, dict):
+            self.logger.error(f"Model round {self.rounds} returned no message: {str(response)[:200]}")
+            return None
+        return message
+
+    def _remember_assistant(self, message: Dict[str, Any]) -> None:
+        if message.get("tool_calls"):
+            self.memory.add_message(
+                {"role": "assistant", "content": message.get("content") or "", "tool_calls": message["tool_calls"]}
+            )
+            self.logger.info(f"Added {len(message['tool_calls'])} tool calls to memory")
+        else:
+            self.add_to_memory("assistant", message.get("content") or "")
+
+    @staticmethod
+    def _streamed_message(extractor: AnswerTextExtractor, tool_calls: ToolCallAccumulator) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": extractor.buffer}
+        if tool_calls.calls:
+            message["tool_calls"] = tool_calls.calls
+        return message
+
+    def _record_llm_round(self, started_at: float, timings: Optional[Dict[str, float]], outcome: str) -> None:
+        self.rounds += 1
+        STAGE_SECONDS.observe(time.perf_counter() - started_at, stage="llm_round")
+        UPSTREAM_REQUESTS.inc(upstream="llm", outcome=outcome)
+        if timings is None:
+            return
+        if timings["new_connections"]:
+            LLM_HTTP_SECONDS.observe(timings["connect_ms"] / 1000, phase="connect")
+        LLM_HTTP_SECONDS.observe(timings["ttfb_ms"] / 1000, phase="ttfb")
+        LLM_HTTP_SECONDS.observe(timings.get("total_ms", (time.perf_counter() - started_at) * 1000) / 1000, phase="total")
+
+    def _record_request(self) -> None:
+        LLM_ROUNDS_PER_REQUEST.observe(self.rounds, mode=self.llm_mode)
+        TOOL_CALLS_PER_REQUEST.observe(self.tool_calls, mode=self.llm_mode)
+        self.logger.info(
+            f"Request took {self.rounds} model rounds and {self.tool_calls} tool calls "
+            f"({self.llm_mode} mode, ~{self.memory.tokens_sent} tokens sent)"
+        )
+
     def get_model_answer(self):
+        started_at = time.perf_counter()
+        timings = None
+        outcome = "error"
         try:
-            self.logger.info(f"Request model with API_TOKEN {self.API_TOKEN}")
-            response = requests.post(
-                url=self.URL,
-                headers={
-                    "Authorization": f"Bearer {self.API_TOKEN}",
-                    "Content-Type": "application/json",
-                },
-                data=json.dumps({
-                    "model": self.MODEL,
-                    "messages": self.memory
-                })
+            response, timings = self.http_client.post(
+                self.URL,
+                headers=self._request_headers(),
+                data=self._request_body(),
+            )
+            self.logger.info(
+                f"Model responded {response.status_code}: connect {timings['connect_ms']:.1f} ms "
+                f"({timings['new_connections']} new connections), TTFB {timings['ttfb_ms']:.1f} ms, "
+                f"total {timings['total_ms']:.1f} ms"
             )
 
             if response.status_code != 200:
                 self.logger.error(f"Error API: {response.status_code} {response.text}")
                 return {}
-            self.memory.append(response.json()["choices"][0]["message"])
-            self.logger.info(f'Got final answer{response.json()["choices"][0]["message"]["content"]}')
-            return response.json()
+            outcome = "ok"
+            answer = response.json()
+            self.logger.info(f'Got final answer{answer["choices"][0]["message"]}')
+            return answer
+        except requests.Timeout as e:
+            self.logger.error(f"Model request timed out: {e}")
+            return {}
         except Exception as e:
             self.logger.error(f"Error in get_model_answer: {e}")
             return {}
+        finally:
+            self._record_llm_round(started_at, timings, outcome)
 
     def add_to_memory(self, role, text):
-        self.memory.append({"role": role, "content": text})
-        self.logger.info("Added to memory " + text)
+        if self.memory.add(role, text):
+            self.logger.info("Added to memory " + text)
 
-    def model(self, text : str):
+    def add_tool_result_to_memory(self, text, tool_call_id: Optional[str] = None):
+        self.memory.add_tool_result(text, tool_call_id)
+        self.logger.info("Added tool result to memory " + text)
+
+    def round_loop(self, text: str) -> Generator[RoundStep, Any, None]:
+        """
+            The model/tool loop shared by the sync and async requesters, without any I/O.
+            It yields the next RoundStep; the caller sends back the assistant message of a MODEL
+            step (None when the round failed) or the tool answer of a TOOL step, and stops at the
+            ANSWER step.
+        """
         self.add_to_memory("system", self.model_prompt)
         self.add_to_memory("user", text)
-        for _ in range(self.tools_limit):
-            response = self.get_model_answer()
-            self.add_to_memory("assistant", response["choices"][0]["message"]["content"])
-            parsed = self.parse_tools_from_response(response)
-            if "text" in parsed:
-                break
-            tool_answer = self.tools_dispatcher.parse_and_call(parsed)
-            if len(str(tool_answer)) != 0 and tool_answer:
-                self.add_to_memory("user", str(tool_answer))
-            else:
-                self.add_to_memory("user", "Error: mistake in tool description or tool not found")
-        return parsed["text"]
+        failed_rounds = 0
+        for round_number in range(1, self.tools_limit + 1):
+            message: Optional[Dict[str, Any]] = yield RoundStep(RoundStep.MODEL, round_number)
+            if message is None:
+                failed_rounds += 1
+                if failed_rounds >= self.max_failed_rounds:
+                    raise ModelUpstreamError(f"Model upstream returned no answer for {failed_rounds} rounds")
+                self.logger.warning(f"Model round {round_number} failed, retrying")
+                continue
+            failed_rounds = 0
+            self._remember_assistant(message)
+            answer, calls = self._parse_round(message)
+            if answer is not None:
+                yield RoundStep(RoundStep.ANSWER, round_number, text=answer)
+                return
+            for tool_call_id, parsed in calls:
+                tool_answer: str = yield RoundStep(RoundStep.TOOL, round_number, parsed=parsed)
+                self.add_tool_result_to_memory(tool_answer, tool_call_id)
+        raise ModelLoopError(f"No final answer after {self.tools_limit} model rounds")
+
+    def model(self, text : str):
+        try:
+            rounds = self.round_loop(text)
+            step = next(rounds)
+            while step.kind != RoundStep.ANSWER:
+                if step.kind == RoundStep.MODEL:
+                    step = rounds.send(self._response_message(self.get_model_answer()))
+                else:
+                    step = rounds.send(self._call_tool(step.parsed))
+            return step.text
+        finally:
+            self._record_request()
+
+    def _call_tool(self, parsed) -> str:
+        self.tool_calls += 1
+        return self._format_tool_answer(self.tools_dispatcher.parse_and_call(parsed))
+
+    @staticmethod
+    def _format_tool_answer(tool_answer) -> str:
+        if len(str(tool_answer)) != 0 and tool_answer:
+            if not isinstance(tool_answer, str):
+                tool_answer = json.dumps(tool_answer, ensure_ascii=False)
+            return tool_answer
+        return "Error: mistake in tool description or tool not found"
+
+    def stream_model_answer(self, extractor: AnswerTextExtractor, tool_calls: ToolCallAccumulator) -> Iterator[str]:
+        """
+            Streams one model round, yields decoded pieces of a final {"text": ...} answer as they arrive.
+            Native tool calls are collected in tool_calls.
+        """
+        started_at = time.perf_counter()
+        timings = None
+        outcome = "error"
+        try:
+            response, timings = self.http_client.open_stream(
+                self.URL,
+                headers=self._request_headers(stream=True),
+                data=self._request_body(stream=True),
+            )
+            with response:
+                if response.status_code != 200:
+                    self.logger.error(f"Error API: {response.status_code} {response.text}")
+                    raise ModelUpstreamError(f"Model upstream responded {response.status_code}")
+
+                first_token_ms = 0.0
+                for delta in iter_sse_chunks(response.iter_lines(decode_unicode=True)):
+                    if delta.get("tool_calls"):
+                        tool_calls.feed(delta["tool_calls"])
+                    if not delta.get("content"):
+                        continue
+                    if not first_token_ms:
+                        first_token_ms = (time.perf_counter() - started_at) * 1000
+                    piece = extractor.feed(delta["content"])
+                    if piece:
+                        yield piece
+            outcome = "ok"
+        finally:
+            self._record_llm_round(started_at, timings, outcome)
+
+        self.logger.info(
+            f"Model stream finished: connect {timings['connect_ms']:.1f} ms "
+            f"({timings['new_connections']} new connections), TTFB {timings['ttfb_ms']:.1f} ms, "
+            f"first token {first_token_ms:.1f} ms, total {(time.perf_counter() - started_at) * 1000:.1f} ms"
+        )
+
+    def _stream_error_event(self, error: Exception) -> Dict[str, Any]:
+        self.logger.error(f"Error in model stream: {error}")
+        message = str(error) if isinstance(error, ModelLoopError) else "Model request failed"
+        return {"event": "error", "data": {"message": message}}
+
+    def model_stream(self, text: str) -> Iterator[Dict[str, Any]]:
+        try:
+            rounds = self.round_loop(text)
+            step = next(rounds)
+            streamed = False
+            while step.kind != RoundStep.ANSWER:
+                if step.kind == RoundStep.MODEL:
+                    extractor = AnswerTextExtractor()
+                    tool_calls = ToolCallAccumulator()
+                    for piece in self.stream_model_answer(extractor, tool_calls):
+                        yield {"event": "token", "data": {"text": piece}}
+                    streamed = extractor.streamed
+                    step = rounds.send(self._streamed_message(extractor, tool_calls))
+                else:
+                    yield step.tool_call_event()
+                    tool_answer = self._call_tool(step.parsed)
+                    yield step.tool_result_event()
+                    step = rounds.send(tool_answer)
+            yield from step.answer_events(streamed)
+        except Exception as e:
+            yield self._stream_error_event(e)
+        finally:
+            self._record_request()
@@ -0,0 +1,142 @@
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+ANSWER_PREFIX: str = '{"text":"'
+ANSWER_PREFIX_PATTERN: re.Pattern = re.compile(r'\s*\{\s*"text"\s*:\s*"')
+JSON_ESCAPES: Dict[str, str] = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def iter_sse_chunks(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+        Yields message deltas of an OpenAI-compatible chat completion stream ("data: {...}" lines).
+    """
+    finished: bool = False
+    # lines after [DONE] are still read, so the keep-alive connection goes back to the pool
+    for line in lines:
+        if finished or not line or not line.startswith("data:"):
+            continue
+        payload: str = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            finished = True
+            continue
+
+        chunk: Dict[str, Any] = json.loads(payload)
+        if "error" in chunk:
+            raise RuntimeError(f"Model stream failed: {chunk['error']}")
+        for choice in chunk.get("choices") or []:
+            delta: Dict[str, Any] = choice.get("delta") or {}
+            if delta:
+                yield delta
+
+
+def iter_sse_deltas(lines: Iterable[str]) -> Iterator[str]:
+    """
+        Yields content deltas of an OpenAI-compatible chat completion stream.
+    """
+    for delta in iter_sse_chunks(lines):
+        content: Optional[str] = delta.get("content")
+        if content:
+            yield content
+
+
+class ToolCallAccumulator:
+    """
+        Reassembles native tool calls of a streamed round: the id and name come in the first
+        delta of a call, its JSON arguments arrive in pieces keyed by the call index.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[int, Dict[str, Any]] = {}
+
+    def feed(self, tool_call_deltas: List[Dict[str, Any]]) -> None:
+        for delta in tool_call_deltas:
+            call: Dict[str, Any] = self._calls.setdefault(
+                delta.get("index", len(self._calls)),
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if delta.get("id"):
+                call["id"] = delta["id"]
+            function: Dict[str, Any] = delta.get("function") or {}
+            call["function"]["name"] += function.get("name") or ""
+            call["function"]["arguments"] += function.get("arguments") or ""
+
+    @property
+    def calls(self) -> List[Dict[str, Any]]:
+        return [self._calls[index] for index in sorted(self._calls)]
+
+
+class AnswerTextExtractor:
+    """
+        Incrementally decodes the "text" value of a streamed {"text": "..."} model answer.
+
+        Deltas of any other output (tool calls) are only accumulated, feed() returns "" for them.
+    """
+
+    def __init__(self) -> None:
+        self.buffer: str = ""
+        self.is_answer: Optional[bool] = None
+        self.streamed: str = ""
+        self._position: int = 0
+        self._finished: bool = False
+
+    def feed(self, delta: str) -> str:
+        self.buffer += delta
+        if self.is_answer is None:
+            self._detect()
+        if not self.is_answer or self._finished:
+            return ""
+
+        decoded: str = self._decode()
+        self.streamed += decoded
+        return decoded
+
+    def _detect(self) -> None:
+        match: Optional[re.Match] = ANSWER_PREFIX_PATTERN.match(self.buffer)
+        if match is not None:
+            self.is_answer = True
+            self._position = match.end()
+            return
+
+        compact: str = "".join(self.buffer.split())
+        if not ANSWER_PREFIX.startswith(compact):
+            self.is_answer = False
+
+    def _decode(self) -> str:
+        decoded = []
+        position: int = self._position
+        while position < len(self.buffer):
+            char: str = self.buffer[position]
+            if char == '"':
+                self._finished = True
+                position += 1
+                break
+            if char != '\\':
+                decoded.append(char)
+                position += 1
+                continue
+
+            if position + 1 >= len(self.buffer):
+                break
+            escape: str = self.buffer[position + 1]
+            if escape == 'u':
+                if position + 6 > len(self.buffer):
+                    break
+                code_point: int = int(self.buffer[position + 2:position + 6], 16)
+                if 0xD800 <= code_point < 0xDC00:
+                    # surrogate pairs are only decoded once the low half has arrived
+                    if position + 12 > len(self.buffer):
+                        break
+                    low: int = int(self.buffer[position + 8:position + 12], 16)
+                    decoded.append(chr(0x10000 + ((code_point - 0xD800) << 10) + (low - 0xDC00)))
+                    position += 12
+                    continue
+                decoded.append(chr(code_point))
+                position += 6
+                continue
+
+            decoded.append(JSON_ESCAPES.get(escape, escape))
+            position += 2
+
+        self._position = position
+        return "".join(decoded)
@@ -0,0 +1,53 @@
+import copy
+from typing import Any, Dict, List
+
+FINAL_ANSWER_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {"text": {"type": "string"}},
+    "required": ["text"],
+    "additionalProperties": False,
+}
+
+# tools.json entries kept as templates for new tools, never offered to the model
+PLACEHOLDER_TOOLS = frozenset({"example_tool"})
+
+
+def native_tools(tools_config: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+        tools.json already uses the OpenAI "tools" format, only function tools
+        that are not placeholders are passed on.
+    """
+    return [
+        copy.deepcopy(tool) for tool in tools_config
+        if tool.get("type") == "function" and "function" in tool
+        and tool["function"].get("name") not in PLACEHOLDER_TOOLS
+    ]
+
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+
+
+def final_answer_format() -> Dict[str, Any]:
+    return response_format("final_answer", FINAL_ANSWER_SCHEMA)
+
+
+def tool_call_or_answer_format(tools_config: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+        Schema for the prompt protocol: either {"text": ...} or {"function": <name>, "arguments": {...}}
+        with the arguments of that tool. The anyOf root is accepted by grammar-based
+        structured output (vLLM, llama.cpp, Ollama), not by OpenAI's strict mode.
+    """
+    variants: List[Dict[str, Any]] = [FINAL_ANSWER_SCHEMA]
+    for tool in native_tools(tools_config):
+        function: Dict[str, Any] = tool["function"]
+        variants.append({
+            "type": "object",
+            "properties": {
+                "function": {"type": "string", "enum": [function["name"]]},
+                "arguments": function.get("parameters") or {"type": "object"},
+            },
+            "required": ["function", "arguments"],
+            "additionalProperties": False,
+        })
+    return response_format("tool_call_or_answer", {"anyOf": variants})
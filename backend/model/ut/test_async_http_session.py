@@ -0,0 +1,94 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+from model.async_http_session import AsyncLLMHttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/chat"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_connections_and_retries(server_url):
+    async def scenario():
+        client = AsyncLLMHttpClient(connect_timeout=1, read_timeout=5, max_retries=2, retry_backoff=0, pool_size=2)
+        try:
+            status, body, timings = await client.post(server_url, data="{}")
+            assert (status, body) == (200, b'{"ok": true}')
+            assert timings["new_connections"] == 1
+            assert timings["total_ms"] >= timings["ttfb_ms"] >= 0
+
+            _Handler.statuses = [503, 429]
+            status, _, timings = await client.post(server_url, data="{}")
+            assert status == 200
+            assert timings["new_connections"] == 0
+
+            _Handler.statuses = [503, 503, 503]
+            status, _, _ = await client.post(server_url, data="{}")
+            assert status == 503
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_client_does_not_retry_read_timeouts():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(4)
+
+    async def scenario():
+        client = AsyncLLMHttpClient(connect_timeout=1, read_timeout=0.2, max_retries=2, retry_backoff=0, pool_size=1)
+        try:
+            with pytest.raises(aiohttp.SocketTimeoutError):
+                await client.post(f"http://127.0.0.1:{listener.getsockname()[1]}/chat", data="{}")
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    listener.close()
+
+
+def test_client_retries_refused_connections():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+
+    async def scenario():
+        client = AsyncLLMHttpClient(connect_timeout=1, read_timeout=1, max_retries=2, retry_backoff=0.01, pool_size=1)
+        try:
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await client.post(f"http://127.0.0.1:{port}/chat", data="{}")
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from api.config import ServerConfigOptions
+from model.async_model_requester import AsyncModelRequester
+from model.model_requester import ModelUpstreamError
+from tools.tool_dispatcher import ToolsDispatcher
+
+TIMINGS = {"connect_ms": 0.0, "new_connections": 0, "ttfb_ms": 1.0, "total_ms": 2.0}
+EXAMPLE_CALL = {"function": "example_tool", "arguments": {"string_param": "abc", "number_param": 1.5}}
+
+
+class _LoggerConfig:
+    def get_logger(self, name):
+        return logging.getLogger(name)
+
+
+def make_config(**overrides):
+    options = {name: default for name, (_, default) in ServerConfigOptions.OPTIONAL_VARS.items()}
+    options.update(API_TOKEN="token", URL="http://llm/chat", MODEL="model", THREADS=2, logger_config=_LoggerConfig())
+    options.update(overrides)
+    return SimpleNamespace(**options)
+
+
+class _StreamResponse:
+    status = 200
+
+    def __init__(self, lines):
+        self.content = self._lines(lines)
+
+    @staticmethod
+    async def _lines(lines):
+        for line in lines:
+            yield f"{line}\n".encode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeHttpClient:
+    """
+        Answers every model round with the next scripted assistant message.
+    """
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.bodies = []
+
+    async def post(self, url, headers, data):
+        self.bodies.append(json.loads(data))
+        message = self.messages.pop(0) if self.messages else None
+        if message is None:
+            return 503, b"overloaded", dict(TIMINGS)
+        return 200, json.dumps({"choices": [{"message": message}]}).encode("utf-8"), dict(TIMINGS)
+
+    async def open_stream(self, url, headers, data):
+        self.bodies.append(json.loads(data))
+        message = self.messages.pop(0)
+        deltas = [{"tool_calls": [dict(call, index=i)]} for i, call in enumerate(message.get("tool_calls", []))]
+        content = message.get("content") or ""
+        deltas += [{"content": content[i:i + 4]} for i in range(0, len(content), 4)]
+        lines = [f"data: {json.dumps({'choices': [{'delta': delta}]})}" for delta in deltas] + ["data: [DONE]"]
+        return _StreamResponse(lines), dict(TIMINGS)
+
+    async def close(self):
+        pass
+
+
+def _requester(messages, **overrides):
+    config = make_config(**overrides)
+    return AsyncModelRequester(ToolsDispatcher(config), config, FakeHttpClient(messages))
+
+
+def _text(content):
+    return {"role": "assistant", "content": json.dumps(content)}
+
+
+def test_prompt_mode_calls_tool_then_answers():
+    requester = _requester([_text(EXAMPLE_CALL), _text({"text": "Celeste"})])
+    assert asyncio.run(requester.model_async("games like Hollow Knight")) == "Celeste"
+    assert (requester.rounds, requester.tool_calls) == (2, 1)
+
+    second_round = requester.async_http_client.bodies[1]["messages"]
+    assert [message["role"] for message in second_round] == ["system", "user", "assistant", "user"]
+    assert "string_param: abc" in second_round[-1]["content"]
+    assert "tools" not in requester.async_http_client.bodies[0]
+
+
+def test_tools_mode_sends_native_tools_and_tool_messages():
+    native_call = {
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "example_tool", "arguments": json.dumps(EXAMPLE_CALL["arguments"])},
+    }
+    requester = _requester(
+        [{"role": "assistant", "content": None, "tool_calls": [native_call]}, _text({"text": "Celeste"})],
+        LLM_MODE="tools",
+    )
+    assert asyncio.run(requester.model_async("games like Hollow Knight")) == "Celeste"
+
+    first_body, second_body = requester.async_http_client.bodies
+    assert "example_tool" not in [tool["function"]["name"] for tool in first_body["tools"]]
+    assert first_body["response_format"]["json_schema"]["name"] == "final_answer"
+    assert second_body["messages"][-1]["role"] == "tool"
+    assert second_body["messages"][-1]["tool_call_id"] == "call_1"
+
+
+def test_stream_yields_tool_events_and_answer():
+    async def collect(requester):
+        return [event async for event in requester.model_stream_async("games like Hollow Knight")]
+
+    requester = _requester([_text(EXAMPLE_CALL), _text({"text": "Ori, Celeste"})])
+    events = asyncio.run(collect(requester))
+
+    kinds = [event["event"] for event in events]
+    assert kinds[:2] == ["tool_call", "tool_result"]
+    assert kinds[-1] == "done"
+    assert "".join(event["data"]["text"] for event in events if event["event"] == "token") == "Ori, Celeste"
+    assert events[-1]["data"] == {"text": "Ori, Celeste", "rounds": 2}
+
+
+def test_stream_reports_round_limit():
+    async def collect(requester):
+        return [event async for event in requester.model_stream_async("games like Hollow Knight")]
+
+    requester = _requester([_text(EXAMPLE_CALL)] * 10)
+    events = asyncio.run(collect(requester))
+    assert events[-1] == {"event": "error", "data": {"message": "No final answer after 10 model rounds"}}
+
+
+def test_failed_round_is_retried_then_reported():
+    requester = _requester([])
+    requester.async_http_client.messages = [None, _text({"text": "Celeste"})]
+    assert asyncio.run(requester.model_async("games like Hollow Knight")) == "Celeste"
+    assert requester.rounds == 2
+
+    requester = _requester([])
+    with pytest.raises(ModelUpstreamError):
+        asyncio.run(requester.model_async("games like Hollow Knight"))
+    assert requester.rounds == requester.max_failed_rounds
@@ -0,0 +1,56 @@
+import json
+import logging
+
+from model.conversation_memory import COMPACTED_PREFIX, TRUNCATED_SUFFIX, ConversationMemory, summarize_tool_output
+
+logger = logging.getLogger("test")
+
+
+def _tool_result(names):
+    return json.dumps([{"name": name, "description": "x" * 400, "tags": ["RPG"], "similarity": 0.5} for name in names])
+
+
+def test_duplicates_are_skipped_and_consumed_tool_results_compacted():
+    memory = ConversationMemory(token_budget=0, logger=logger)
+    memory.add("system", "prompt")
+    memory.add("user", "games like Hollow Knight")
+    memory.add("system", "prompt")
+    memory.add("assistant", '{"function": "steam_search_by_desc_tool"}')
+    memory.add("assistant", '{"function": "steam_search_by_desc_tool"}')
+    memory.add_tool_result(_tool_result(["Ori", "Celeste"]))
+    assert len(memory) == 4
+    assert memory.messages[-1]["content"].startswith("[{")
+
+    memory.add("assistant", '{"text": "Ori, Celeste"}')
+    assert memory.messages[3]["content"] == f"{COMPACTED_PREFIX} games: Ori, Celeste"
+    assert summarize_tool_output("plain text") == f"{COMPACTED_PREFIX} plain text"
+
+
+def test_render_fits_token_budget_without_touching_prompt_and_question():
+    memory = ConversationMemory(token_budget=200, logger=logger)
+    memory.add("system", "p" * 400)
+    memory.add("user", "question")
+    for round_number in range(3):
+        memory.add("assistant", f'{{"function": "tool", "round": {round_number}}}')
+        memory.add_tool_result("r" * 800)
+
+    messages = memory.render()
+    assert memory.tokens(messages) <= 200
+    assert messages[:2] == memory.messages[:2]
+    assert messages[-1]["content"].endswith(TRUNCATED_SUFFIX)
+    assert memory.tokens_sent == memory.tokens(messages)
+
+
+def test_native_tool_results_are_dropped_with_their_call():
+    memory = ConversationMemory(token_budget=150, logger=logger)
+    memory.add("system", "prompt")
+    memory.add("user", "games like Hollow Knight")
+    for call_id in ("call_1", "call_2"):
+        memory.add_message({"role": "assistant", "content": None, "tool_calls": [{"id": call_id, "type": "function"}]})
+        memory.add_tool_result(_tool_result(["Ori", "Celeste"]), call_id)
+    assert memory.messages[3]["role"] == "tool"
+    assert memory.messages[3]["content"].startswith(COMPACTED_PREFIX)
+
+    messages = memory.render()
+    assert [message["role"] for message in messages] == ["system", "user", "assistant", "tool"]
+    assert messages[2]["tool_calls"][0]["id"] == messages[3]["tool_call_id"] == "call_2"
@@ -0,0 +1,65 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from model.http_session import LLMHttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/chat"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_connections_and_retries(server_url):
+    client = LLMHttpClient(connect_timeout=1, read_timeout=5, max_retries=2, retry_backoff=0, pool_size=2)
+
+    response, timings = client.post(server_url, data="{}")
+    assert response.json() == {"ok": True}
+    assert timings["new_connections"] == 1
+    assert timings["total_ms"] >= timings["ttfb_ms"] >= 0
+
+    _Handler.statuses = [503, 429]
+    response, timings = client.post(server_url, data="{}")
+    assert response.status_code == 200
+    assert timings["new_connections"] == 0
+
+    _Handler.statuses = [503, 503, 503]
+    response, _ = client.post(server_url, data="{}")
+    assert response.status_code == 503
+
+
+def test_client_times_out():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    client = LLMHttpClient(connect_timeout=1, read_timeout=0.2, max_retries=2, retry_backoff=0, pool_size=1)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post(f"http://127.0.0.1:{listener.getsockname()[1]}/chat", data="{}")
+    listener.close()
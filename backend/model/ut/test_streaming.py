@@ -0,0 +1,54 @@
+import json
+
+from model.streaming import AnswerTextExtractor, ToolCallAccumulator, iter_sse_chunks, iter_sse_deltas
+
+
+def _feed_all(extractor, text, step):
+    return "".join(extractor.feed(text[i:i + step]) for i in range(0, len(text), step))
+
+
+def test_extractor_streams_answer_text():
+    answer = json.dumps({"text": "Hollow Knight, \"Celeste\"\nДиско 🎮 \\ end"})
+    for step in (1, 2, 3, 7, len(answer)):
+        extractor = AnswerTextExtractor()
+        assert _feed_all(extractor, answer, step) == json.loads(answer)["text"]
+        assert extractor.is_answer is True
+        assert extractor.buffer == answer
+
+
+def test_extractor_ignores_tool_calls():
+    call = ' {"function": "steam_search_by_desc_tool", "arguments": {"desc": "text"}}'
+    extractor = AnswerTextExtractor()
+    assert _feed_all(extractor, call, 2) == ""
+    assert extractor.is_answer is False
+
+
+def test_iter_sse_deltas():
+    lines = [
+        ": OPENROUTER PROCESSING",
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        "",
+        'data: {"choices": [{"delta": {"content": "{\\"te"}}]}',
+        'data: {"choices": [{"delta": {"content": "xt\\": \\"ok\\"}"}}]}',
+        "data: [DONE]",
+        'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+    ]
+    assert "".join(iter_sse_deltas(lines)) == '{"text": "ok"}'
+
+
+def test_tool_call_accumulator_joins_streamed_arguments():
+    lines = [
+        'data: {"choices": [{"delta": {"tool_calls": [{"index": 0, "id": "call_1", "type": "function", '
+        '"function": {"name": "steam_similar_by_title_tool", "arguments": ""}}]}}]}',
+        'data: {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": "{\\"title\\": "}}]}}]}',
+        'data: {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": "\\"Celeste\\"}"}}]}}]}',
+        "data: [DONE]",
+    ]
+    accumulator = ToolCallAccumulator()
+    for delta in iter_sse_chunks(lines):
+        accumulator.feed(delta["tool_calls"])
+    assert accumulator.calls == [{
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "steam_similar_by_title_tool", "arguments": '{"title": "Celeste"}'},
+    }]
@@ -0,0 +1,26 @@
+import json
+from pathlib import Path
+
+from model.tool_schemas import FINAL_ANSWER_SCHEMA, PLACEHOLDER_TOOLS, final_answer_format, native_tools, tool_call_or_answer_format
+
+TOOLS_CONFIG = json.loads((Path(__file__).resolve().parents[2] / "tools" / "tools.json").read_text(encoding="utf-8"))
+MODEL_TOOLS = [tool for tool in TOOLS_CONFIG if tool["function"]["name"] not in PLACEHOLDER_TOOLS]
+
+
+def test_native_tools_are_the_tools_json_functions_without_placeholders():
+    tools = native_tools(TOOLS_CONFIG)
+    assert [tool["function"]["name"] for tool in tools] == [tool["function"]["name"] for tool in MODEL_TOOLS]
+    assert "example_tool" not in [tool["function"]["name"] for tool in tools]
+    tools[0]["function"]["name"] = "changed"
+    assert MODEL_TOOLS[0]["function"]["name"] != "changed"
+    assert final_answer_format()["json_schema"]["schema"] == FINAL_ANSWER_SCHEMA
+
+
+def test_tool_call_or_answer_schema_has_one_variant_per_tool():
+    variants = tool_call_or_answer_format(TOOLS_CONFIG)["json_schema"]["schema"]["anyOf"]
+    assert variants[0] == FINAL_ANSWER_SCHEMA
+    assert len(variants) == len(MODEL_TOOLS) + 1
+    for tool, variant in zip(MODEL_TOOLS, variants[1:]):
+        assert variant["properties"]["function"]["enum"] == [tool["function"]["name"]]
+        assert variant["properties"]["arguments"] == tool["function"]["parameters"]
+        assert variant["required"] == ["function", "arguments"]
@@ -1,12 +1,16 @@
+import asyncio
 import json
 import importlib
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Tuple
 from api.config import ServerConfig
+from api.metrics import STAGE_SECONDS, TOOL_CALLS
 
 
 class ToolsDispatcher:
     TOOLS_MODULE = "tools.tools"
+    ASYNC_SUFFIX = "_async"
 
     def __init__(self, server_config: ServerConfig, tools_config_path: Optional[str] = None):
         self.logger = server_config.logger_config.get_logger("ToolsDispatcher")
@@ -21,6 +25,7 @@ class ToolsDispatcher:
 
         self.tools_config = self._load_config()
         self.tools_map = self._load_functions()
+        self.async_tools_map = self._load_async_functions()
 
     def _load_config(self) -> List[Dict]:
         try:
@@ -72,29 +77,98 @@ class ToolsDispatcher:
 
         return tools_map
 
+    def _load_async_functions(self) -> Dict[str, Callable]:
+        module = importlib.import_module(self.TOOLS_MODULE)
+        async_tools_map = {}
+        for func_name in self.tools_map:
+            async_function = getattr(module, f"{func_name}{self.ASYNC_SUFFIX}", None)
+            if async_function is not None and asyncio.iscoroutinefunction(async_function):
+                async_tools_map[func_name] = async_function
+        return async_tools_map
+
+    def _resolve_call(self, llm_response: Dict) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if not isinstance(llm_response, dict):
+            self.logger.error("llm_response is not a dict")
+            return None
+
+        function_name = llm_response.get("function")
+        if not isinstance(function_name, str):
+            self.logger.error("function_name is missing or not a string")
+            return None
+
+        arguments = llm_response.get("arguments", {})
+        if not isinstance(arguments, dict):
+            self.logger.error("arguments is not a dict")
+            return None
+
+        if function_name not in self.tools_map:
+            self.logger.error(f"Function not registered: {function_name}")
+            return None
+        return function_name, arguments
+
     def parse_and_call(self, llm_response: Dict) -> Dict[str, Any]:
+        with STAGE_SECONDS.time(stage="tool_dispatch"):
+            result = self._parse_and_call(llm_response)
+        self._record_call(llm_response, result)
+        return result
+
+    def _record_call(self, llm_response: Dict, result: Dict[str, Any]) -> None:
+        function_name = llm_response.get("function") if isinstance(llm_response, dict) else None
+        if function_name in self.tools_map:
+            TOOL_CALLS.inc(tool=function_name, outcome="ok" if result else "error")
+        else:
+            TOOL_CALLS.inc(tool="unknown", outcome="unknown")
+
+    def _parse_and_call(self, llm_response: Dict) -> Dict[str, Any]:
         try:
-            if not isinstance(llm_response, dict):
-                self.logger.error("llm_response is not a dict")
+            call = self._resolve_call(llm_response)
+            if call is None:
                 return {}
+            function_name, arguments = call
 
-            function_name = llm_response.get("function")
-            if not isinstance(function_name, str):
-                self.logger.error("function_name is missing or not a string")
+            self.logger.info(f"Called tool {function_name}")
+            function = self.tools_map[function_name]
+            try:
+                result = function(**arguments)
+            except TypeError as e:
+                self.logger.error(f"TypeError while calling {function_name}: {e}")
                 return {}
-
-            arguments = llm_response.get("arguments", {})
-            if not isinstance(arguments, dict):
-                self.logger.error("arguments is not a dict")
+            except Exception as e:
+                self.logger.error(f"Error while calling {function_name}: {e}")
                 return {}
+            self.logger.info(f"Get result {result} from tool {function_name}")
+            return {"result": result}
+
+        except Exception as top_e:
+            self.logger.exception(f"Unhandled exception in parse_and_call: {top_e}")
+            return {}
 
-            if function_name not in self.tools_map:
-                self.logger.error(f"Function not registered: {function_name}")
+    async def parse_and_call_async(self, llm_response: Dict, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+            Awaits the <tool>_async variant of a tool when tools module defines one,
+            otherwise runs the blocking tool on executor so the event loop stays free.
+        """
+        with STAGE_SECONDS.time(stage="tool_dispatch"):
+            result = await self._parse_and_call_async(llm_response, executor)
+        self._record_call(llm_response, result)
+        return result
+
+    async def _parse_and_call_async(self, llm_response: Dict, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        try:
+            call = self._resolve_call(llm_response)
+            if call is None:
                 return {}
+            function_name, arguments = call
+
             self.logger.info(f"Called tool {function_name}")
-            function = self.tools_map[function_name]
             try:
-                result = function(**arguments)
+                if function_name in self.async_tools_map:
+                    result = await self.async_tools_map[function_name](**arguments)
+                else:
+                    function = self.tools_map[function_name]
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        executor, lambda: function(**arguments)
+                    )
             except TypeError as e:
                 self.logger.error(f"TypeError while calling {function_name}: {e}")
                 return {}
@@ -105,5 +179,5 @@ class ToolsDispatcher:
             return {"result": result}
 
         except Exception as top_e:
-            self.logger.exception(f"Unhandled exception in parse_and_call: {top_e}")
+            self.logger.exception(f"Unhandled exception in parse_and_call_async: {top_e}")
             return {}
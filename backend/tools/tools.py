@@ -1,5 +1,4 @@
 from typing import Dict, List, Optional
-import requests
 from api.kernel import Server
 def example_tool(
     string_param: str,
@@ -27,15 +26,104 @@ def example_tool(
     return result.strip()
 
 def steam_search_tool(game_name):
-    url = "https://store.steampowered.com/api/storesearch/"
-    params = {
-        "term": game_name,
-        "l": "english",
-        "cc": "US"
+    return Server.steamdb_manager.search_titles(game_name, limit=5)
+
+def _search_filters(
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+) -> Optional[Dict]:
+    filters = {
+        "genres": genres,
+        "tags": tags,
+        "min_owners": min_owners,
+        "max_owners": max_owners,
+        "max_price": max_price,
+    }
+    return {name: value for name, value in filters.items() if value is not None} or None
+
+
+def steam_search_by_desc_tool(
+    desc: str,
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    games = Server.steamdb_manager.find_similar_games(desc, k=50, filters=filters)
+    return Server.steamdb_manager.fit_token_budget(games)
+
+def steam_search_by_desc_batch_tool(
+    descs: List[str],
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    results = Server.steamdb_manager.find_similar_games_batch(descs, k=50, filters=filters)
+    token_budget = Server.steamdb_manager.tool_token_budget // max(1, len(descs))
+    return [Server.steamdb_manager.fit_token_budget(games, token_budget) for games in results]
+
+def _games_like_answer(title: str, result: Optional[Dict]):
+    if result is None:
+        return f"Game '{title}' was not found in the catalog, describe it with steam_search_by_desc_tool instead"
+    return {
+        "game": result["game"]["name"],
+        "similar_games": Server.steamdb_manager.fit_token_budget(result["similar_games"]),
     }
-    response = requests.get(url, params=params)
-    data = response.json()
-    return [game['name'] for game in data['items'][:5]]
 
-def steam_search_by_desc_tool(desc):
-    return Server.steamdb_manager.find_similar_games(desc, k=50)
+def steam_similar_by_title_tool(
+    title: str,
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    result = Server.steamdb_manager.find_games_like(title, k=50, filters=filters)
+    return _games_like_answer(title, result)
+
+
+async def steam_search_by_desc_tool_async(
+    desc: str,
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    results = await Server.steamdb_manager.find_similar_games_batch_async([desc], k=50, filters=filters)
+    return Server.steamdb_manager.fit_token_budget(results[0])
+
+async def steam_search_by_desc_batch_tool_async(
+    descs: List[str],
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    results = await Server.steamdb_manager.find_similar_games_batch_async(descs, k=50, filters=filters)
+    token_budget = Server.steamdb_manager.tool_token_budget // max(1, len(descs))
+    return [Server.steamdb_manager.fit_token_budget(games, token_budget) for games in results]
+
+async def steam_similar_by_title_tool_async(
+    title: str,
+    genres: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    min_owners: Optional[int] = None,
+    max_owners: Optional[int] = None,
+    max_price: Optional[float] = None,
+):
+    filters = _search_filters(genres, tags, min_owners, max_owners, max_price)
+    result = await Server.steamdb_manager.find_games_like_async(title, k=50, filters=filters)
+    return _games_like_answer(title, result)
@@ -1,3 +1,5 @@
+import asyncio
+
 from tools.tool_dispatcher import ToolsDispatcher
 
 
@@ -50,3 +52,17 @@ def test_tools_dispatcher():
 """.strip()
 
     assert result["result"] == expected
+
+
+def test_tools_dispatcher_async():
+    dispatcher = ToolsDispatcher(DummyServerConfig())
+    args = {"function": "example_tool", "arguments": {"string_param": "abc", "number_param": 1}}
+
+    result = asyncio.run(dispatcher.parse_and_call_async(args))
+    assert result == dispatcher.parse_and_call(args)
+    assert asyncio.run(dispatcher.parse_and_call_async({"function": "missing_tool"})) == {}
+    assert set(dispatcher.async_tools_map) == {
+        "steam_search_by_desc_tool",
+        "steam_search_by_desc_batch_tool",
+        "steam_similar_by_title_tool",
+    }